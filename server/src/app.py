@@ -9,7 +9,7 @@ from fastapi.exceptions import RequestValidationError
 from application.tools.notification_manager import start_notification_event_router
 from infrakitchen_mcp import setup_mcp_server
 from sqlalchemy.exc import IntegrityError
-from starlette.responses import JSONResponse, StreamingResponse
+from starlette.responses import JSONResponse
 
 from core.utils.json_encoder import JsonEncoder
 
@@ -25,8 +25,9 @@ from prometheus_fastapi_instrumentator import Instrumentator
 from core.config import Settings, setup_service_environment
 from application.views import main_router
 from application.oidc import oidc_router
-from graphql_api.helpers import mask_sensitive_values
-from core.casbin.enforcer import CasbinEnforcer
+from core.casbin.enforcer import CasbinEnforcer, enforce_calls_per_request, start_enforce_calls_count
+from core.database import replica_engine
+from core.read_replica import monitor_replica_lag
 from core.errors import (
     AccessDenied,
     AccessUnauthorized,
@@ -67,6 +68,7 @@ async def lifespan(app: FastAPI):
     loop = asyncio.get_running_loop()
     rabbitmq_task = loop.create_task(start_rabbitmq_consumer())
     notification_event_router_task = loop.create_task(start_notification_event_router())
+    replica_lag_task = loop.create_task(monitor_replica_lag()) if replica_engine is not None else None
 
     await init_app()
     await CasbinEnforcer().init_enforcer()
@@ -84,6 +86,12 @@ async def lifespan(app: FastAPI):
         await notification_event_router_task
     except (asyncio.CancelledError, Exception):
         pass
+    if replica_lag_task is not None:
+        _ = replica_lag_task.cancel()
+        try:
+            await replica_lag_task
+        except (asyncio.CancelledError, Exception):
+            pass
 
 
 app = FastAPI(
@@ -109,43 +117,12 @@ async def add_process_time_header(request: Request, call_next):
 
 
 @app.middleware("http")
-async def mask_graphql_secrets(request: Request, call_next):
-    """Mask sensitive secrets in GraphQL responses."""
-    if not request.url.path.startswith("/api/graphql"):
-        return await call_next(request)
-
+async def count_enforce_calls(request: Request, call_next):
+    # Track how many authorization decisions the enforcer had to evaluate for the request
+    enforce_calls = start_enforce_calls_count()
     response = await call_next(request)
-
-    def _copy_headers_preserving_cookies(target_response, source_response):
-        # Keep repeated headers (notably Set-Cookie) by copying raw headers.
-        # Skip content-length/content-type so the new response can recalculate them.
-        for key, value in source_response.raw_headers:
-            if key.lower() in {b"content-length", b"content-type"}:
-                continue
-            target_response.raw_headers.append((key, value))
-
-    # Only process JSON responses
-    if response.headers.get("content-type") != "application/json":
-        return response
-
-    # Read and parse response body
-    body = b""
-    async for chunk in response.body_iterator:
-        body += chunk
-
-    try:
-        data = json.loads(body)
-        # Apply masking to response data
-        if isinstance(data, dict) and "data" in data:
-            data["data"] = mask_sensitive_values(data["data"])
-        masked_response = JSONResponse(data, status_code=response.status_code)
-        _copy_headers_preserving_cookies(masked_response, response)
-        return masked_response
-    except (json.JSONDecodeError, ValueError):
-        # If not valid JSON, return original response
-        passthrough_response = StreamingResponse(iter([body]), status_code=response.status_code)
-        _copy_headers_preserving_cookies(passthrough_response, response)
-        return passthrough_response
+    enforce_calls_per_request.observe(enforce_calls[0])
+    return response
 
 
 app.include_router(main_router)
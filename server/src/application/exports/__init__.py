@@ -0,0 +1,3 @@
+from .router import export_router
+
+__all__ = ["export_router"]
@@ -0,0 +1,78 @@
+"""Bulk export endpoints.
+
+``GET /api/{entity}/export`` streams every row of resources, logs, audit logs
+or revisions matching a filter, in the filter syntax of the GraphQL list
+queries. Exports are meant for extracts that would otherwise page through
+GraphQL ``range`` windows.
+"""
+
+import json
+from typing import Any
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Request, Security
+from fastapi.responses import StreamingResponse
+
+from application.resources.functions import resource_access_filter
+from application.resources.model import Resource
+from core.read_replica import read_sessionmaker
+from core.sso.functions import check_api_permission, get_logged_user
+from core.users.model import UserDTO
+
+from .functions import (
+    EXPORT_MEDIA_TYPES,
+    EXPORT_MODELS,
+    ExportEntity,
+    ExportFormat,
+    build_export_statement,
+    stream_export,
+)
+
+export_router = APIRouter(tags=["Export"])
+
+
+def _parse_filter(filter: str | None) -> dict[str, Any] | None:
+    if not filter:
+        return None
+    try:
+        body = json.loads(filter)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail="Filter is not valid JSON") from e
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=400, detail="Filter must be a JSON object")
+    return body
+
+
+@export_router.get("/{entity}/export")
+async def export_entities(
+    request: Request,
+    entity: ExportEntity,
+    format: ExportFormat = "ndjson",
+    filter: str | None = None,
+    after: UUID | None = None,
+    accessible_only: bool = False,
+    user: UserDTO = Security(get_logged_user),
+) -> StreamingResponse:
+    """
+    Stream the entities as NDJSON or CSV, ordered by id.
+    :param filter: JSON object in the syntax of evaluate_sqlalchemy_filters
+    :param after: id of the last row already received, to resume an interrupted export
+    :param accessible_only: resources only, export the resources the user has access to
+    """
+    await check_api_permission(request)
+
+    model = EXPORT_MODELS[entity]
+    access_filter = None
+    if accessible_only and model is Resource:
+        access_filter = await resource_access_filter(user)
+
+    try:
+        statement = build_export_statement(model, _parse_filter(filter), after, access_filter)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    return StreamingResponse(
+        stream_export(read_sessionmaker(request), entity, format, statement),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{entity}.{format}"'},
+    )
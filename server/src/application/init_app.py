@@ -64,7 +64,7 @@ async def init_app():
     await create_super_policy(permission_service)
     await session.commit()
 
-    await enforcer.enforcer.load_policy()
+    await enforcer.reload_policies()
 
 
 async def create_default_roles(permission_service: PermissionService, user: UserDTO):
@@ -1,5 +1,9 @@
+from typing import Any
 from uuid import UUID
-from application.projects.model import Project
+
+from sqlalchemy import ColumnElement, select
+
+from application.projects.model import Project, project_owners
 from core.constants.model import ModelActions, ModelStatus
 from core.users.functions import user_api_permission, user_entity_permissions
 from core.users.functions import user_is_super_admin
@@ -65,3 +69,9 @@ async def requester_is_project_owner(requester: UserDTO, project: Project | None
     if not owner_ids:
         return False
     return _requester_id(requester) in owner_ids
+
+
+def project_owner_filter(requester: UserDTO, project_id_column: Any) -> ColumnElement[bool]:
+    """SQL predicate matching the rows whose project is owned by the requester."""
+    owned_projects = select(project_owners.c.project_id).where(project_owners.c.user_id == _requester_id(requester))
+    return project_id_column.in_(owned_projects)
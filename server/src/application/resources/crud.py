@@ -1,7 +1,7 @@
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import String, case, cast, func, select, text
+from sqlalchemy import ColumnElement, String, case, cast, func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -13,8 +13,10 @@ from core.permissions.model import Permission
 from core.database import (
     FieldSpec,
     evaluate_sqlalchemy_filters,
+    evaluate_sqlalchemy_keyset_pagination,
     evaluate_sqlalchemy_pagination,
     evaluate_sqlalchemy_sorting,
+    keyset_page,
 )
 from core.utils.model_tools import is_valid_uuid
 
@@ -45,11 +47,12 @@ class ResourceCRUD:
         range: tuple[int, int] | None = None,
         sort: tuple[str, str] | None = None,
         fields: FieldSpec | None = None,
+        access_filter: ColumnElement[bool] | None = None,
     ) -> list[Resource]:
         statement = select(Resource)
 
         statement = evaluate_sqlalchemy_sorting(Resource, statement, sort)
-        statement = evaluate_sqlalchemy_filters(Resource, statement, filter)
+        statement = evaluate_sqlalchemy_filters(Resource, statement, filter, access_filter)
         statement = evaluate_sqlalchemy_pagination(statement, range)
 
         statement = statement.options(*build_resource_query_options(fields))
@@ -57,9 +60,29 @@ class ResourceCRUD:
         result = await self.session.execute(statement)
         return list(result.unique().scalars().all())
 
-    async def count(self, filter: dict[str, Any] | None = None) -> int:
+    async def get_page(
+        self,
+        filter: dict[str, Any] | None = None,
+        sort: tuple[str, str] | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+        fields: FieldSpec | None = None,
+        access_filter: ColumnElement[bool] | None = None,
+    ) -> tuple[list[Resource], str | None]:
+        """Return a page of Resource rows after the cursor and the cursor of the next page."""
+        statement = select(Resource)
+        statement = evaluate_sqlalchemy_filters(Resource, statement, filter, access_filter)
+        statement = evaluate_sqlalchemy_keyset_pagination(Resource, statement, sort, cursor, limit)
+        statement = statement.options(*build_resource_query_options(fields))
+
+        result = await self.session.execute(statement)
+        return keyset_page(result.unique().all(), sort, limit)
+
+    async def count(
+        self, filter: dict[str, Any] | None = None, access_filter: ColumnElement[bool] | None = None
+    ) -> int:
         statement = select(func.count()).select_from(Resource)
-        statement = evaluate_sqlalchemy_filters(Resource, statement, filter)
+        statement = evaluate_sqlalchemy_filters(Resource, statement, filter, access_filter)
         result = await self.session.execute(statement)
         return result.scalar_one() or 0
 
@@ -5,9 +5,11 @@ import re
 from typing import Any, cast
 from uuid import UUID
 
+from sqlalchemy import ColumnElement, or_
 
-from application.projects.functions import requester_is_project_owner
+from application.projects.functions import project_owner_filter, requester_is_project_owner
 from application.projects.model import Project
+from application.resources.model import Resource
 from application.resources.schema import (
     DependencyType,
     ResourceCreate,
@@ -24,9 +26,10 @@ from application.source_code_versions.schema import (
 from core.constants.model import ModelActions, ModelState, ModelStatus
 from core.errors import EntityExistsError
 from core.notifications.service import SubscriptionService
+from core.permissions.functions import build_access_filter
 from core.permissions.schema import ActionLiteral, EntityPolicyCreate
 from core.permissions.service import PermissionService
-from core.users.functions import user_entity_permissions
+from core.users.functions import user_entity_permissions, user_is_super_admin
 from core.users.model import UserDTO
 from application.validation_rules.model import ValidationRuleTargetType
 from application.validation_rules.schema import ValidationRuleResponse
@@ -35,6 +38,16 @@ from application.validation_rules.validators import validate_number_rule, valida
 logger = logging.getLogger(__name__)
 
 
+async def resource_access_filter(requester: UserDTO | None) -> ColumnElement[bool] | None:
+    """Resources the requester can read: entity or project policies and owned projects."""
+    if requester is None or await user_is_super_admin(requester):
+        return None
+    return or_(
+        await build_access_filter(requester, "resource", Resource.id, Resource.project_id),
+        project_owner_filter(requester, Resource.project_id),
+    )
+
+
 async def get_resource_actions(
     requester: UserDTO,
     resource_id: str | UUID,
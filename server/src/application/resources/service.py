@@ -17,6 +17,7 @@ from application.resources.functions import (
     delete_resource_policies,
     get_resource_actions,
     get_resource_variable_schema,
+    resource_access_filter,
     validate_resource_variables_on_create,
     update_resource_variables_on_patch,
 )
@@ -136,8 +137,12 @@ class ResourceService:
         resources = await self.crud.get_all(**kwargs)
         return [ResourceResponse.model_validate(resource) for resource in resources]
 
-    async def count(self, filter: dict[str, Any] | None = None) -> int:
-        return await self.crud.count(filter=filter)
+    async def count(self, filter: dict[str, Any] | None = None, requester: UserDTO | None = None) -> int:
+        """Count resources, restricted to the ones the requester can read when a requester is given."""
+        access_filter = await resource_access_filter(requester)
+        if access_filter is None:
+            return await self.crud.count(filter=filter)
+        return await self.crud.count(filter=filter, access_filter=access_filter)
 
     async def query_by_id(self, resource_id: str | UUID, fields: FieldSpec | None = None) -> Resource | None:
         """Return the ORM model directly, with optimized loading based on requested fields."""
@@ -149,9 +154,34 @@ class ResourceService:
         range: tuple[int, int] | None = None,
         sort: tuple[str, str] | None = None,
         fields: FieldSpec | None = None,
+        requester: UserDTO | None = None,
     ) -> list[Resource]:
-        """Return ORM models directly, with optimized loading based on requested fields."""
-        return await self.crud.get_all(filter=filter, range=range, sort=sort, fields=fields)
+        """
+        Return ORM models directly, with optimized loading based on requested fields.
+        When a requester is given only the resources they can read are returned, filtered in SQL.
+        """
+        return await self.crud.get_all(
+            filter=filter, range=range, sort=sort, fields=fields, access_filter=await resource_access_filter(requester)
+        )
+
+    async def query_page(
+        self,
+        filter: dict[str, Any] | None = None,
+        sort: tuple[str, str] | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+        fields: FieldSpec | None = None,
+        requester: UserDTO | None = None,
+    ) -> tuple[list[Resource], str | None]:
+        """Keyset paginated query_all, returns the page and the cursor of the next page."""
+        return await self.crud.get_page(
+            filter=filter,
+            sort=sort,
+            cursor=cursor,
+            limit=limit,
+            fields=fields,
+            access_filter=await resource_access_filter(requester),
+        )
 
     async def get_actions(self, resource_id: str | UUID, requester: UserDTO) -> list[str]:
         resource = await self.crud.get_by_id(
@@ -45,6 +45,8 @@ class SourceCode(BaseRevision):
 class RefFolders(BaseModel):
     ref: str
     folders: list[str]
+    # Root tree of the ref when its folders were listed, unchanged trees are not listed again
+    tree_sha: str | None = None
 
 
 class SourceCodeDTO(BaseModel):
@@ -15,6 +15,8 @@ from core.users.schema import UserShort
 class RefFolders(BaseModel):
     ref: str
     folders: list[str]
+    # Root tree of the ref when its folders were listed, unchanged trees are not listed again
+    tree_sha: str | None = None
 
 
 class SourceCodeResponse(BaseModel):
@@ -1,7 +1,8 @@
+import asyncio
 import logging
-from glob import glob
 import os
 import tempfile
+from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -104,7 +105,8 @@ class SourceCodeTask:
         if not self.git_client:
             raise CannotProceed("Git client is not initialized. Cannot fetch source code data.")
 
-        await self.git_client.clone()
+        # Folders are read from the object database, the working tree is never checked out
+        await self.git_client.clone(no_checkout=True)
         git_tags = await self.git_client.get_repo_tags()
         git_tag_messages = await self.git_client.get_repo_tag_messages()
         git_branches = await self.git_client.get_repo_branches()
@@ -114,24 +116,52 @@ class SourceCodeTask:
         self.source_code_instance.git_tag_messages = git_tag_messages
         self.source_code_instance.git_branches = git_branches
         self.source_code_instance.git_branch_messages = git_branch_messages
-        self.source_code_instance.git_folders_map = []
-        working_tree_dir = self.git_client.destination_dir
-        for ref in self.source_code_instance.git_tags + self.source_code_instance.git_branches:
-            await self.git_client.checkout(ref)
-            res = glob(f"{working_tree_dir}/**/", recursive=True)
-            self.logger.info(f"Found repository folders for {ref}: {len(res)}")
-            folders = []
-            for folder in res:
-                branch_folder = folder.replace(f"{working_tree_dir}/", "")
-                if branch_folder != "":
-                    folders.append(branch_folder)
-                else:
-                    folders.append("/")
-
-            ref_folders = RefFolders(ref=ref, folders=folders).model_dump()
-            self.source_code_instance.git_folders_map.append(ref_folders)
+        self.source_code_instance.git_folders_map = await self.get_git_folders_map(git_tags + git_branches)
         await self.git_client.delete_workspace()
 
+    async def get_git_folders_map(self, refs: list[str], concurrency: int = 8) -> list[dict[str, Any]]:
+        """
+        List the folders of every ref from the object database, as "dir/sub/" with "/" for the root.
+        Refs whose root tree did not change since the last sync keep their folders, refs sharing a tree
+        are listed once and at most ``concurrency`` trees are listed at the same time.
+        """
+        assert self.git_client is not None, "Git client is not initialized"
+        git_client = self.git_client
+        previous = {
+            ref_folders.ref: ref_folders
+            for ref_folders in map(RefFolders.model_validate, self.source_code_instance.git_folders_map or [])
+            if ref_folders.tree_sha
+        }
+        trees = await git_client.get_ref_trees(refs)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def list_folders(tree: str) -> list[str]:
+            async with semaphore:
+                directories = await git_client.list_tree_directories(tree)
+            # Hidden folders are left out, like glob("**/") on a checkout did
+            return ["/"] + [
+                f"{directory}/"
+                for directory in directories
+                if not any(part.startswith(".") for part in directory.split("/"))
+            ]
+
+        changed_trees = sorted(
+            {tree for ref, tree in trees.items() if ref not in previous or previous[ref].tree_sha != tree}
+        )
+        folders_by_tree = dict(zip(changed_trees, await asyncio.gather(*map(list_folders, changed_trees)), strict=True))
+        self.logger.info(f"Listed the folders of {len(changed_trees)} trees for {len(refs)} refs")
+
+        git_folders_map: list[dict[str, Any]] = []
+        for ref in refs:
+            tree = trees.get(ref)
+            if tree is None:
+                self.logger.warning(f"Cannot resolve {ref}, skipping its folders")
+            elif tree in folders_by_tree:
+                git_folders_map.append(RefFolders(ref=ref, folders=folders_by_tree[tree], tree_sha=tree).model_dump())
+            else:
+                git_folders_map.append(previous[ref].model_dump())
+        return git_folders_map
+
     # change entity state depends on task state
     async def change_entity_status(self, new_state: ModelStatus) -> None:
         self.source_code_instance.status = new_state
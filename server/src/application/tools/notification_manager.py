@@ -54,6 +54,11 @@ async def send_message(message: MessageModel) -> None:
     await RabbitMQConnection.send_message(message)
 
 
+async def send_messages(messages: list[MessageModel]) -> None:
+    logger.debug(f"Sending {len(messages)} notification messages")
+    await RabbitMQConnection.publish_many(messages)
+
+
 async def _get_provider_integration(provider: str) -> Integration | None:
     """Resolve the integration configuration for an external notification provider."""
 
@@ -162,6 +167,8 @@ async def _route_notification_event(event: NotificationEvent, session: AsyncSess
         fields=pref_fields,
     )
 
+    # In-app notifications are published together once all preferences are resolved
+    in_app_messages: list[MessageModel] = []
     for preference in all_preferences:
         user_id = preference.user_id
         for channel in [NotificationChannel(c) for c in preference.channels]:
@@ -185,12 +192,25 @@ async def _route_notification_event(event: NotificationEvent, session: AsyncSess
                     continue
                 body["channel"] = slack_id
 
+            if channel == NotificationChannel.IN_APP:
+                in_app_messages.append(create_in_app_message(body))
+                continue
+
             try:
                 await _dispatch_notification(body)
                 logger.info(f"Notification dispatched to user {user_id} via {channel.value}")
             except Exception as e:
                 logger.error(f"Failed to notify user {user_id} via {channel.value}: {e}", exc_info=True)
 
+    if not in_app_messages:
+        return
+
+    try:
+        await send_messages(in_app_messages)
+        logger.info(f"{len(in_app_messages)} notifications dispatched via {NotificationChannel.IN_APP.value}")
+    except Exception as e:
+        logger.error(f"Failed to notify users via {NotificationChannel.IN_APP.value}: {e}", exc_info=True)
+
 
 async def notification_event_router() -> None:
     """RabbitMQ consumer that routes raw notification events to per-user-per-channel messages.
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import os
@@ -9,6 +10,13 @@ from core.custom_entity_log_controller import EntityLogger
 from core.errors import ShellExecutionError
 
 from core.tools.shell_client import ShellScriptClient
+from core.tools.tf_cache import (
+    plugin_cache_lock,
+    report_cache_size,
+    restore_warm_workspace,
+    save_warm_workspace,
+    warm_workspace_key,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -88,9 +96,24 @@ class OtfClient:
 
         This method initializes Terraform with the specified backend bucket.
         If no backend bucket is specified, Terraform is initialized without a backend.
+        Providers come from the worker's plugin cache and init is replaced by a module install
+        when a workspace with the same lock file, backend and configuration was initialized before.
+        Only the provider installation holds the plugin cache lock, modules and backend are initialized outside it.
         """
+        key = await asyncio.to_thread(warm_workspace_key, self.workspace_path, self.backend_storage_config)
+        if key and await asyncio.to_thread(restore_warm_workspace, key, self.workspace_path):
+            self.logger.info("Reusing an initialized Tofu workspace, installing modules only")
+            await self._run_command("get")
+            return
+
         self.logger.info("Initializing Tofu...")
-        await self._run_command("init -force-copy -reconfigure -backend-config=backend.tfvars")
+        await self._run_command("get")
+        async with plugin_cache_lock():
+            await self._run_command("init -backend=false -get=false")
+        await self._run_command("init -force-copy -reconfigure -backend-config=backend.tfvars -get=false")
+        if key:
+            await asyncio.to_thread(save_warm_workspace, key, self.workspace_path)
+        await asyncio.to_thread(report_cache_size)
 
     async def apply(self, command_args: str = "-auto-approve=true"):
         """
@@ -1,15 +1,29 @@
+import asyncio
+import copy
+import hashlib
 import logging
+import multiprocessing
 import os
 import posixpath
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Any, NamedTuple
 
 import aiofiles
 import hcl2
 from aiofiles.os import listdir, path
+from prometheus_client import Counter
+
+from core.config import Settings
+from core.tools.git_mirror_cache import normalize_repo_id
 
 logger = logging.getLogger(__name__)
 
+hcl_parse_counter = Counter("hcl_parse_total", "Parsed .tf files by where they were parsed", ["mode"])
+
 
 class ModuleRef(NamedTuple):
     source: str
@@ -107,6 +121,139 @@ class HclVariableParser:
         return "\n".join(result)
 
 
+class TfFile(NamedTuple):
+    display: str
+    # Directory the module sources of the file are relative to
+    subpath: str
+    content: str
+    # Parse cache key, the git blob SHA of files read from git
+    key: str | None = None
+
+
+class ParsedHcl(NamedTuple):
+    data: dict[str, Any]
+    variable_types: dict[str, str]
+
+
+def parse_hcl(tf_data: str) -> ParsedHcl:
+    """Parse HCL and extract its original variable types. Runs in the parse processes, keep it a plain function."""
+    data: dict[str, Any] = hcl2.loads(
+        tf_data,
+        serialization_options=hcl2.SerializationOptions(strip_string_quotes=True, explicit_blocks=False),
+    )
+    variable_types = HclVariableParser.extract_variable_types(tf_data) if data.get("variable") else {}
+    return ParsedHcl(data, variable_types)
+
+
+class HclParseCache:
+    """
+    Parsed .tf files shared by the tasks of a worker, keyed by a hash of their content or by their git blob SHA.
+    Modules used by many resources are parsed once, callers get copies of the entries they are free to modify.
+    """
+
+    # Cold files are sent to the parse processes from this total size, smaller sets are parsed in a thread
+    PROCESS_POOL_MIN_BYTES = 256 * 1024
+
+    def __init__(self, max_entries: int, processes: int):
+        self.max_entries: int = max_entries
+        self.processes: int = processes
+        self._entries: OrderedDict[str, ParsedHcl] = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+
+    @staticmethod
+    def content_key(tf_data: str) -> str:
+        return hashlib.sha256(tf_data.encode()).hexdigest()
+
+    def _get(self, key: str) -> ParsedHcl | None:
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is not None:
+                self._entries.move_to_end(key)
+            return parsed
+
+    def _put(self, key: str, parsed: ParsedHcl) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = parsed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                _ = self._entries.popitem(last=False)
+
+    def parse(self, tf_data: str, key: str | None = None) -> ParsedHcl:
+        """Parse a file, from the cache when its content was seen before. Raises on invalid HCL like hcl2.loads."""
+        key = key or self.content_key(tf_data)
+        parsed = self._get(key)
+        if parsed is None:
+            parsed = parse_hcl(tf_data)
+            self._put(key, parsed)
+            hcl_parse_counter.labels("inline").inc()
+        else:
+            hcl_parse_counter.labels("cached").inc()
+        return copy.deepcopy(parsed)
+
+    async def warm(self, files: list[str], keys: list[str] | None = None) -> None:
+        """
+        Parse the files missing from the cache off the event loop, in the parse processes when they are large.
+        Invalid files are not cached, `parse` raises their error.
+        """
+        keys = keys or [self.content_key(tf_data) for tf_data in files]
+        cold = {key: tf_data for key, tf_data in zip(keys, files, strict=True) if self._get(key) is None}
+        if not cold:
+            return
+
+        results: list[ParsedHcl | BaseException]
+        if self.processes > 0 and sum(len(tf_data) for tf_data in cold.values()) >= self.PROCESS_POOL_MIN_BYTES:
+            loop = asyncio.get_running_loop()
+            pool = self._get_pool()
+            results = await asyncio.gather(
+                *(loop.run_in_executor(pool, parse_hcl, tf_data) for tf_data in cold.values()),
+                return_exceptions=True,
+            )
+            if any(isinstance(result, BrokenProcessPool) for result in results):
+                logger.warning("HCL parse processes died, the next cold files start a new pool")
+                self._pool = None
+            hcl_parse_counter.labels("process").inc(len(cold))
+        else:
+            results = await asyncio.to_thread(self._parse_all, list(cold.values()))
+            hcl_parse_counter.labels("thread").inc(len(cold))
+
+        for key, result in zip(cold, results, strict=True):
+            if isinstance(result, ParsedHcl):
+                self._put(key, result)
+
+    @staticmethod
+    def _parse_all(files: list[str]) -> list[ParsedHcl | BaseException]:
+        results: list[ParsedHcl | BaseException] = []
+        for tf_data in files:
+            try:
+                results.append(parse_hcl(tf_data))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Forking a worker running an event loop and open connections is unsafe, start clean processes
+            context = multiprocessing.get_context("spawn")
+            self._pool = ProcessPoolExecutor(max_workers=self.processes, mp_context=context)
+        return self._pool
+
+
+_hcl_parse_cache: HclParseCache | None = None
+
+
+def get_hcl_parse_cache() -> HclParseCache:
+    global _hcl_parse_cache
+    if _hcl_parse_cache is None:
+        settings = Settings()
+        _hcl_parse_cache = HclParseCache(
+            max_entries=settings.HCL_PARSE_CACHE_MAX_ENTRIES, processes=settings.HCL_PARSE_PROCESSES
+        )
+    return _hcl_parse_cache
+
+
 class OtfProvider:
     """Main class for handling OpenTofu/Terraform operations."""
 
@@ -118,14 +265,6 @@ class OtfProvider:
     # the file's display name.
     _FILE_DIVIDER = f"\n# {'-' * 30} FILE: {{}} {'-' * 30} \n"
 
-    # Matches a git repo URL in any of the common shapes:
-    #   https://github.com/foo/bar.git, ssh://git@github.com/foo/bar.git,
-    #   git@github.com:foo/bar.git, github.com/foo/bar
-    _REPO_URL_RE = re.compile(
-        r"^(?:[a-z][a-z0-9+.-]*://)?(?:[^@/]+@)?([^/:?#]+)[:/]([^?#]+?)(?:\.git)?/?$",
-        re.IGNORECASE,
-    )
-
     def __init__(
         self,
         workspace,
@@ -145,37 +284,41 @@ class OtfProvider:
         # SourceCodeVersions want to follow the modules in the terraform files
         # while Resources and Executors only care about the current directory.
         self.follow_modules: bool = follow_modules
+        # Pinned refs and local modules read at the same time when following modules
+        self.module_concurrency: int = 8
         self.depth: int = 1  # Depth of the directory tree when adding files
         self.directory: str | None = None
         self.tf_string_data: str = ""
+        # Contents of the files in tf_string_data, parsed one by one through the parse cache
+        self.tf_files: list[str] = []
 
     @classmethod
     def _normalize_repo_id(cls, url: str) -> str | None:
         """Reduce a git URL to a "host/owner/repo" identifier, stripping
         scheme, user, .git suffix, trailing slash. Returns None if it doesn't
         look like a git repo URL."""
-        if not url:
-            return None
-        s = url.strip().removeprefix("git::")
-        s = s.split("?", 1)[0]
-        match = cls._REPO_URL_RE.match(s)
-        if not match:
-            return None
-        host, path = match.group(1), match.group(2)
-        return f"{host.lower()}/{path}"
+        return normalize_repo_id(url)
 
     def parse_tf_to_json(self, tf_data: str) -> dict[str, Any]:
-        dict_data: dict[str, Any] = hcl2.loads(
-            tf_data,
-            serialization_options=hcl2.SerializationOptions(strip_string_quotes=True, explicit_blocks=False),
-        )
+        return self.merge_tf_json([get_hcl_parse_cache().parse(tf_data)])
+
+    @staticmethod
+    def merge_tf_json(parsed_files: list[ParsedHcl]) -> dict[str, Any]:
+        """Merge parsed files into the dict hcl2 returns for their concatenation, without the file dividers."""
+        dict_data: dict[str, Any] = {}
+        original_types: dict[str, str] = {}
+        for parsed in parsed_files:
+            for key, value in parsed.data.items():
+                if isinstance(value, list) and isinstance(dict_data.get(key), list):
+                    dict_data[key].extend(value)
+                else:
+                    dict_data[key] = value
+            original_types.update(parsed.variable_types)
 
         variables = dict_data.get("variable", [])
         if not variables:
             return dict_data
 
-        original_types = HclVariableParser.extract_variable_types(tf_data)
-
         for variable in variables:
             for var_name, var_config in variable.items():
                 if var_name in original_types:
@@ -262,12 +405,11 @@ class OtfProvider:
 
         return subpath.strip("/"), ref
 
-    def _extract_module_refs(self, tf_data: str, parent_subpath: str, parent_ref: str | None) -> list[ModuleRef]:
+    def _extract_module_refs(
+        self, tf_data: str, parent_subpath: str, parent_ref: str | None, key: str | None = None
+    ) -> list[ModuleRef]:
         try:
-            dict_data: dict[str, Any] = hcl2.loads(
-                tf_data,
-                serialization_options=hcl2.SerializationOptions(strip_string_quotes=True, explicit_blocks=False),
-            )
+            dict_data = get_hcl_parse_cache().parse(tf_data, key).data
         except Exception:
             return []
 
@@ -301,13 +443,102 @@ class OtfProvider:
             return []
         return [os.path.join(directory, name) for name in await listdir(directory) if name.endswith(".tf")]
 
+    def _add_files(self, files: list[TfFile], ref: str | None, parts: list[str]) -> list[ModuleRef]:
+        """Append the files to the snapshot parts and return the modules they use."""
+        modules: list[ModuleRef] = []
+        for file in files:
+            parts.append(self._FILE_DIVIDER.format(file.display))
+            parts.append(file.content + "\n")
+            self.tf_files.append(file.content)
+            if self.follow_modules:
+                modules.extend(self._extract_module_refs(file.content, file.subpath, ref, file.key))
+        return modules
+
+    async def _read_local_module(self, mod: ModuleRef) -> list[TfFile]:
+        abs_dir = os.path.join(self.repo_root, mod.subpath)
+        tf_files = await self._list_tf_files(abs_dir)
+        logger.info(f"[tf_parser] including module '{mod.source}' -> {mod.subpath} ({len(tf_files)} .tf files)")
+        files: list[TfFile] = []
+        for tf_file in tf_files:
+            content = await self.read_file_to_string(tf_file)
+            rel = os.path.relpath(tf_file, self.repo_root).replace(os.sep, "/")
+            display = f"{rel}@{mod.ref}" if mod.ref else rel
+            files.append(TfFile(display, mod.subpath, content))
+        return files
+
+    async def _read_pinned_modules(self, ref: str, sha: str, modules: list[ModuleRef]) -> dict[str, list[TfFile]]:
+        """Read the files of the modules pinned to a ref, with one `git cat-file --batch` for all of them."""
+        paths_by_subpath: dict[str, list[str]] = {}
+        for mod in modules:
+            file_paths = await self.git_client.list_files_at_ref(sha, mod.subpath)
+            paths_by_subpath[mod.subpath] = [p for p in file_paths if p.endswith(".tf")]
+            logger.info(
+                f"[tf_parser] including pinned module '{mod.source}' -> {mod.subpath}@{ref} "
+                f"({len(paths_by_subpath[mod.subpath])} .tf files)"
+            )
+
+        paths = list(dict.fromkeys(p for module_paths in paths_by_subpath.values() for p in module_paths))
+        blobs = await self.git_client.read_blobs_at_ref(sha, paths)
+        files_by_subpath: dict[str, list[TfFile]] = {}
+        for subpath, module_paths in paths_by_subpath.items():
+            files_by_subpath[subpath] = [
+                # The text `git show` gave through the shell client, snapshots taken before stay comparable
+                TfFile(
+                    f"{p}@{ref}",
+                    posixpath.dirname(p),
+                    "\n".join(line.rstrip() for line in blobs[p].content.split("\n")).strip(),
+                    blobs[p].sha,
+                )
+                for p in module_paths
+            ]
+        return files_by_subpath
+
+    async def _read_modules(self, modules: list[ModuleRef]) -> list[list[TfFile]]:
+        """
+        Read the files of the modules, in order. Refs are fetched together and at most
+        ``module_concurrency`` refs or local modules are read at the same time.
+        """
+        pinned: dict[str, list[ModuleRef]] = {}
+        for mod in modules:
+            if mod.ref != self.source_code_ref:
+                pinned.setdefault(mod.ref or "HEAD", []).append(mod)
+        if pinned and self.git_client is None:
+            mod = next(iter(pinned.values()))[0]
+            raise RuntimeError(
+                f"Module '{mod.source}' pins ref={mod.ref!r} which differs from the "
+                f"snapshot ref {self.source_code_ref!r}, but OtfProvider was constructed without a "
+                f"git_client to fetch it. Cannot build a correct snapshot."
+            )
+
+        shas = await self.git_client.fetch_refs(list(pinned)) if pinned else {}
+        semaphore = asyncio.Semaphore(self.module_concurrency)
+
+        async def read_ref(ref: str) -> dict[str, list[TfFile]]:
+            async with semaphore:
+                return await self._read_pinned_modules(ref, shas[ref], pinned[ref])
+
+        async def read_local(mod: ModuleRef) -> list[TfFile]:
+            async with semaphore:
+                return await self._read_local_module(mod)
+
+        local_modules = [mod for mod in modules if mod.ref == self.source_code_ref]
+        pinned_files, local_files = await asyncio.gather(
+            asyncio.gather(*map(read_ref, pinned)), asyncio.gather(*map(read_local, local_modules))
+        )
+        files_by_module = {(mod.ref, mod.subpath): files for mod, files in zip(local_modules, local_files, strict=True)}
+        for ref, files_by_subpath in zip(pinned, pinned_files, strict=True):
+            for subpath, files in files_by_subpath.items():
+                files_by_module[(ref, subpath)] = files
+        return [files_by_module[(mod.ref, mod.subpath)] for mod in modules]
+
     async def read_files_to_string(self) -> None:
         initial_files: list[str] = []
         await self.traverse_directories(initial_files, self.workspace)
 
         visited: set[tuple[str | None, str]] = set()
-        queue: list[ModuleRef] = []
+        parts: list[str] = []
 
+        files: list[TfFile] = []
         for f in initial_files:
             if not f.endswith(".tf"):
                 continue
@@ -316,55 +547,42 @@ class OtfProvider:
             visited.add((self.source_code_ref, parent_subpath))
             content = await self.read_file_to_string(f)
             display = f"{rel}@{self.source_code_ref}" if self.source_code_ref else rel
-            self.tf_string_data += self._FILE_DIVIDER.format(display)
-            self.tf_string_data += content + "\n"
-            if self.follow_modules:
-                queue.extend(self._extract_module_refs(content, parent_subpath, self.source_code_ref))
+            files.append(TfFile(display, parent_subpath, content))
+        await self._warm_parse_cache(files)
+        queue = self._add_files(files, self.source_code_ref, parts)
 
+        # Modules are resolved a level at a time: the modules of a level are read concurrently and
+        # added in queue order, which is the order of resolving them one by one
         while queue:
-            mod = queue.pop(0)
-            key = (mod.ref, mod.subpath)
-            if key in visited:
-                continue
-            visited.add(key)
-
-            if mod.ref == self.source_code_ref:
-                abs_dir = os.path.join(self.repo_root, mod.subpath)
-                tf_files = await self._list_tf_files(abs_dir)
-                logger.info(f"[tf_parser] including module '{mod.source}' -> {mod.subpath} ({len(tf_files)} .tf files)")
-                for tf_file in tf_files:
-                    content = await self.read_file_to_string(tf_file)
-                    rel = os.path.relpath(tf_file, self.repo_root).replace(os.sep, "/")
-                    display = f"{rel}@{mod.ref}" if mod.ref else rel
-                    self.tf_string_data += self._FILE_DIVIDER.format(display)
-                    self.tf_string_data += content + "\n"
-                    queue.extend(self._extract_module_refs(content, mod.subpath, mod.ref))
-                continue
-
-            if self.git_client is None:
-                raise RuntimeError(
-                    f"Module '{mod.source}' pins ref={mod.ref!r} which differs from the "
-                    f"snapshot ref {self.source_code_ref!r}, but OtfProvider was constructed without a "
-                    f"git_client to fetch it. Cannot build a correct snapshot."
-                )
-            sha = await self.git_client.fetch_ref(mod.ref)
-            file_paths = await self.git_client.list_files_at_ref(sha, mod.subpath)
-            tf_files = [p for p in file_paths if p.endswith(".tf")]
-            logger.info(
-                f"[tf_parser] including pinned module '{mod.source}' -> {mod.subpath}@{mod.ref} "
-                f"({len(tf_files)} .tf files)"
+            level: list[ModuleRef] = []
+            for mod in queue:
+                key = (mod.ref, mod.subpath)
+                if key not in visited:
+                    visited.add(key)
+                    level.append(mod)
+
+            level_files = await self._read_modules(level)
+            await self._warm_parse_cache([file for files in level_files for file in files])
+            queue = []
+            for mod, files in zip(level, level_files, strict=True):
+                queue.extend(self._add_files(files, mod.ref, parts))
+
+        self.tf_string_data += "".join(parts)
+
+    async def _warm_parse_cache(self, files: list[TfFile]) -> None:
+        # Parse the files as one batch off the event loop, _extract_module_refs then reads them from the cache
+        if self.follow_modules and files:
+            await get_hcl_parse_cache().warm(
+                [file.content for file in files],
+                [file.key or HclParseCache.content_key(file.content) for file in files],
             )
-            for repo_path in tf_files:
-                content = await self.git_client.read_file_at_ref(sha, repo_path)
-                display = f"{repo_path}@{mod.ref}"
-                self.tf_string_data += self._FILE_DIVIDER.format(display)
-                self.tf_string_data += content + "\n"
-                queue.extend(self._extract_module_refs(content, posixpath.dirname(repo_path), mod.ref))
 
     async def parse_tf_directory_to_json(self):
         """Parse all Terraform files in a given folder to JSON."""
         await self.read_files_to_string()
-        return self.parse_tf_to_json(self.tf_string_data)
+        cache = get_hcl_parse_cache()
+        await cache.warm(self.tf_files)
+        return self.merge_tf_json([cache.parse(tf_data) for tf_data in self.tf_files])
 
     async def setup_tf_backend(self, tf_data: dict[str, Any], integration_provider: str) -> None:
         terraform_config = self.list_to_dict(tf_data.get("terraform", []))
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from application.exports import export_router
 from core.sso import auth_router
 
 from graphql_api.endpoint import graphql_app
@@ -8,3 +9,4 @@ from graphql_api.endpoint import graphql_app
 main_router = APIRouter(prefix="/api")
 main_router.include_router(auth_router)
 main_router.include_router(graphql_app, prefix="/graphql")
+main_router.include_router(export_router)
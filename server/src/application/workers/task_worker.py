@@ -1,10 +1,10 @@
-import asyncio
 import logging
 from datetime import datetime, UTC
 from typing import override
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from aio_pika import ExchangeType
+from aio_pika.abc import AbstractChannel, AbstractExchange, AbstractQueue
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
@@ -38,6 +38,14 @@ from core.errors import (
 from core.scheduler.executor import SchedulerExecutor
 from core.users.dependencies import get_user_service
 from core.users.model import UserDTO
+from core.utils.task_lanes import (
+    LEGACY_TASKS_QUEUE,
+    LEGACY_TASKS_ROUTING_KEY,
+    MAX_TASK_PRIORITY,
+    TASKS_EXCHANGE,
+    all_task_routing_keys,
+    resolve_task_routing_keys,
+)
 from prometheus_client import Counter
 
 logger = logging.getLogger("TaskWorker")
@@ -47,16 +55,23 @@ prometheus_counter = Counter("tasks_total", "Total executed tasks", ["job_type",
 
 
 class TaskWorker(BaseMessagesWorker):
-    def __init__(self, session: AsyncSession, name: str, lock: asyncio.Lock) -> None:
-        exchange_name = "ik_tasks"
+    def __init__(
+        self,
+        session: AsyncSession,
+        name: str,
+        concurrency: int = 1,
+        lanes: list[str] | None = None,
+    ) -> None:
+        exchange_name = TASKS_EXCHANGE
         exchange_type = ExchangeType.DIRECT
 
-        self.user_service = get_user_service(session=session)
+        # Lane routing keys this worker consumes, every lane when no patterns are given
+        self.lane_routing_keys: list[str] = resolve_task_routing_keys(lanes)
 
         super().__init__(
             session,
             name,
-            lock=lock,
+            concurrency=concurrency,
             exchange_name=exchange_name,
             exchange_type=exchange_type,
             logger=logger,
@@ -67,11 +82,37 @@ class TaskWorker(BaseMessagesWorker):
         )
 
     @override
-    async def process_message(self, message: MessageHandler) -> None:
+    async def declare_queues(
+        self, channel: AbstractChannel, exchange: AbstractExchange, routing_key: str
+    ) -> list[AbstractQueue]:
+        queues: list[AbstractQueue] = []
+        for lane_routing_key in self.lane_routing_keys:
+            # One durable priority queue per lane, shared by every worker subscribed to it
+            queue = await channel.declare_queue(
+                lane_routing_key,
+                durable=True,
+                auto_delete=False,
+                arguments={"x-max-priority": MAX_TASK_PRIORITY},
+            )
+            _ = await queue.bind(exchange, routing_key=lane_routing_key)
+            queues.append(queue)
+
+        if set(self.lane_routing_keys) == set(all_task_routing_keys()):
+            # Keep draining messages published with the pre-lanes routing key
+            legacy_queue = await channel.declare_queue(LEGACY_TASKS_QUEUE, durable=True, auto_delete=False)
+            _ = await legacy_queue.bind(exchange, routing_key=LEGACY_TASKS_ROUTING_KEY)
+            queues.append(legacy_queue)
+
+        return queues
+
+    @override
+    async def process_message(self, message: MessageHandler, session: AsyncSession | None = None) -> None:
+        # Every in-flight task gets its own session, the worker session is only used as a fallback
+        session = session or self.session
         msg = MessageModel.load_from_bytes(message.raw_body)
 
         if msg.message_type == "scheduler_job":
-            await self.process_scheduler_job(msg)
+            await self.process_scheduler_job(msg, session=session)
             return
 
         action = msg.metadata.get("action")
@@ -92,7 +133,7 @@ class TaskWorker(BaseMessagesWorker):
 
         obj_uuid = UUID(str(obj_id))
 
-        user = await self.user_service.get_dto_by_id(user_id)
+        user = await get_user_service(session=session).get_dto_by_id(user_id)
         if not user:
             raise CannotProceed(f"User {user_id} not found")
 
@@ -102,6 +143,7 @@ class TaskWorker(BaseMessagesWorker):
         resource_id = msg.metadata.get("resource_id")
 
         task_controller = await self.get_task_controller(
+            session=session,
             entity_controller=entity_controller,
             obj_id=obj_uuid,
             user=user,
@@ -120,7 +162,8 @@ class TaskWorker(BaseMessagesWorker):
             "user": user.identifier,
             "started_at": datetime.now(UTC).isoformat(),
         }
-        await self.worker_service.set_current_task(self.worker.id, task_info)
+        task_id = uuid4().hex
+        await self.track_task_started(task_id, task_info)
 
         # Main task flow
         try:
@@ -131,9 +174,9 @@ class TaskWorker(BaseMessagesWorker):
             prometheus_counter.labels(entity_controller, "error").inc()
             await self.handle_exception(e, message, task_controller, action)
         finally:
-            await self.worker_service.increment_tasks_completed(self.worker.id)
+            await self.track_task_finished(task_id)
 
-    async def process_scheduler_job(self, msg: MessageModel):
+    async def process_scheduler_job(self, msg: MessageModel, session: AsyncSession | None = None):
         job_id = msg.body.get("job_id")
         if not job_id:
             raise CannotProceed("Scheduler job_id is not defined in message")
@@ -146,12 +189,13 @@ class TaskWorker(BaseMessagesWorker):
         if not job_script:
             raise CannotProceed("Scheduler job_script is not defined in message")
 
-        job_executor = SchedulerExecutor(self.session)
+        job_executor = SchedulerExecutor(session or self.session)
 
         await job_executor.execute(job_type=job_type, script=job_script)
 
     async def get_task_controller(
         self,
+        session: AsyncSession,
         entity_controller: str,
         obj_id: UUID,
         user: UserDTO,
@@ -172,7 +216,7 @@ class TaskWorker(BaseMessagesWorker):
         match entity_controller:
             case "source_code":
                 return await get_source_code_task(
-                    session=self.session,
+                    session=session,
                     obj_id=obj_id,
                     user=user,
                     action=action,
@@ -181,7 +225,7 @@ class TaskWorker(BaseMessagesWorker):
                 )
             case "source_code_version":
                 return await get_source_code_version_task(
-                    session=self.session,
+                    session=session,
                     obj_id=obj_id,
                     user=user,
                     action=action,
@@ -190,7 +234,7 @@ class TaskWorker(BaseMessagesWorker):
                 )
             case "storage":
                 return await get_storage_task(
-                    session=self.session,
+                    session=session,
                     obj_id=obj_id,
                     user=user,
                     action=action,
@@ -199,7 +243,7 @@ class TaskWorker(BaseMessagesWorker):
                 )
             case "resource":
                 return await get_resource_task(
-                    session=self.session,
+                    session=session,
                     obj_id=obj_id,
                     user=user,
                     action=action,
@@ -208,7 +252,7 @@ class TaskWorker(BaseMessagesWorker):
                 )
             case "workspace":
                 return await get_workspace_task(
-                    session=self.session,
+                    session=session,
                     obj_id=obj_id,
                     user=user,
                     action=action,
@@ -217,7 +261,7 @@ class TaskWorker(BaseMessagesWorker):
                 )
             case "executor":
                 return await get_executor_task(
-                    session=self.session,
+                    session=session,
                     obj_id=obj_id,
                     user=user,
                     action=action,
@@ -226,7 +270,7 @@ class TaskWorker(BaseMessagesWorker):
                 )
             case "workflow":
                 return await get_workflow_task(
-                    session=self.session,
+                    session=session,
                     obj_id=obj_id,
                     user=user,
                     action=action,
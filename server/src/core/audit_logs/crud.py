@@ -6,9 +6,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import (
     FieldSpec,
+    approximate_count,
     evaluate_sqlalchemy_filters,
+    evaluate_sqlalchemy_keyset_pagination,
     evaluate_sqlalchemy_pagination,
     evaluate_sqlalchemy_sorting,
+    keyset_page,
 )
 from core.utils.model_tools import is_valid_uuid
 
@@ -48,12 +51,32 @@ class AuditLogCRUD:
         result = await self.session.execute(statement)
         return list(result.scalars().all())
 
+    async def get_page(
+        self,
+        filter: dict[str, Any] | None = None,
+        sort: tuple[str, str] | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+        fields: FieldSpec | None = None,
+    ) -> tuple[list[AuditLog], str | None]:
+        """Return a page of AuditLog rows after the cursor and the cursor of the next page."""
+        statement = select(AuditLog)
+        statement = evaluate_sqlalchemy_filters(AuditLog, statement, filter)
+        statement = evaluate_sqlalchemy_keyset_pagination(AuditLog, statement, sort, cursor, limit)
+        statement = statement.options(*build_audit_log_query_options(fields))
+
+        result = await self.session.execute(statement)
+        return keyset_page(result.all(), sort, limit)
+
     async def count(self, filter: dict[str, Any] | None = None) -> int:
         statement = select(func.count()).select_from(AuditLog)
         statement = evaluate_sqlalchemy_filters(AuditLog, statement, filter)
         result = await self.session.execute(statement)
         return result.scalar_one() or 0
 
+    async def approximate_count(self, filter: dict[str, Any] | None = None) -> tuple[int, bool]:
+        return await approximate_count(self.session, AuditLog, filter)
+
     async def get_actions(self) -> list[str]:
         stmt = select(AuditLog.action).distinct().order_by(AuditLog.action)
         result = await self.session.execute(stmt)
@@ -28,6 +28,10 @@ class AuditLogService:
     async def count(self, filter: dict[str, Any] | None = None) -> int:
         return await self.crud.count(filter=filter)
 
+    async def approximate_count(self, filter: dict[str, Any] | None = None) -> tuple[int, bool]:
+        """Estimated count for large tables, returns the count and whether it is exact."""
+        return await self.crud.approximate_count(filter=filter)
+
     async def query_by_id(self, entity_id: str | UUID, fields: FieldSpec | None = None) -> AuditLog | None:
         """Return the ORM model directly, with optimized loading based on requested fields."""
         return await self.crud.get_by_id(entity_id, fields=fields)
@@ -42,5 +46,16 @@ class AuditLogService:
         """Return ORM models directly, with optimized loading based on requested fields."""
         return await self.crud.get_all(filter=filter, range=range, sort=sort, fields=fields)
 
+    async def query_page(
+        self,
+        filter: dict[str, Any] | None = None,
+        sort: tuple[str, str] | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+        fields: FieldSpec | None = None,
+    ) -> tuple[list[AuditLog], str | None]:
+        """Keyset paginated query_all, returns the page and the cursor of the next page."""
+        return await self.crud.get_page(filter=filter, sort=sort, cursor=cursor, limit=limit, fields=fields)
+
     async def get_actions(self) -> list[str]:
         return await self.crud.get_actions()
@@ -71,6 +71,7 @@ class MessageModel(PydanticBaseModel):
     exchange: str = Field(default="ik_tasks")
     exchange_type: ExchangeType = Field(default=ExchangeType.DIRECT)
     routing_key: str | None = Field(default="")
+    priority: int | None = Field(default=None)
     metadata: dict[str, Any] = Field(default_factory=dict)
 
     def to_bytes(self) -> bytes:
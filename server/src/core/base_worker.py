@@ -1,12 +1,14 @@
 import asyncio
 import logging
 import socket
+from typing import Any
 
 from aio_pika import ExchangeType
-from aio_pika.abc import AbstractChannel, AbstractIncomingMessage
+from aio_pika.abc import AbstractChannel, AbstractExchange, AbstractIncomingMessage, AbstractQueue
 from pamqp import commands as spec
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.dependencies import get_async_session
 from core.workers.crud import WorkerCRUD
 from core.workers.functions import get_host_metadata
 from core.workers.service import WorkerService
@@ -23,7 +25,7 @@ class BaseMessagesWorker:
         self,
         session: AsyncSession,
         name: str,
-        lock: asyncio.Lock,
+        concurrency: int = 1,
         logger: logging.Logger = logger,
         exchange_name: str | None = None,
         exchange_type: ExchangeType = ExchangeType.TOPIC,
@@ -34,7 +36,13 @@ class BaseMessagesWorker:
     ) -> None:
         self.session: AsyncSession = session
         self.name: str = name
-        self.lock: asyncio.Lock = lock
+        if concurrency < 1:
+            raise ValueError("Worker concurrency must be at least 1")
+        self.concurrency: int = concurrency
+        # Bounds the number of in-flight messages; each one runs in its own session
+        self.slots: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        # Serializes updates of the worker row, which all in-flight tasks share
+        self.status_lock: asyncio.Lock = asyncio.Lock()
         self.logger: logging.Logger = logger
         self.exchange_name: str | None = exchange_name
         self.exchange_type: ExchangeType = exchange_type
@@ -46,7 +54,7 @@ class BaseMessagesWorker:
             raise ValueError("Exchange name is required")
 
         self.auto_delete: bool = auto_delete
-        self.worker: WorkerDTO = WorkerDTO(name=self.name, host=socket.gethostname())
+        self.worker: WorkerDTO = WorkerDTO(name=self.name, host=socket.gethostname(), concurrency=concurrency)
 
     async def on_failure(self, message: MessageHandler) -> None:
         if message.retries >= message.max_retries:
@@ -63,12 +71,13 @@ class BaseMessagesWorker:
                 headers=message.headers,
                 delivery_mode=message.delivery_mode,
                 content_type=message.content_type,
+                priority=message.priority,
             ),
         )
 
         await message.message_original.reject(requeue=False)
 
-    async def process_message(self, message: MessageHandler) -> None:
+    async def process_message(self, message: MessageHandler, session: AsyncSession | None = None) -> None:
         MessageModel.load_from_bytes(message.raw_body)
 
     async def on_message(self, msg: AbstractIncomingMessage):
@@ -76,20 +85,40 @@ class BaseMessagesWorker:
             raise ValueError("Worker ID is not set. Make sure to register the worker before processing messages.")
 
         async with msg.process(ignore_processed=True):
-            async with self.lock:
-                if self.commit_worker_status:
-                    await self.worker_service.change_worker_status(self.worker.id, "busy")
-                    self.worker.status = "busy"
+            async with self.slots:
                 message = MessageHandler(msg)
-                try:
-                    await self.process_message(message)
-                except Exception as e:
-                    logger.error(f"Task failed: {e}")
-                    await self.session.rollback()
-                finally:
-                    if self.commit_worker_status:
-                        await self.worker_service.change_worker_status(self.worker.id, "free")
-                        self.worker.status = "free"
+                async with get_async_session() as session:
+                    try:
+                        await self.process_message(message, session=session)
+                    except Exception as e:
+                        logger.error(f"Task failed: {e}")
+                        await session.rollback()
+
+    async def track_task_started(self, task_id: str, task_info: dict[str, Any]) -> None:
+        """Add a task to the set of tasks currently running on this worker."""
+        async with self.status_lock:
+            self.worker.current_tasks = [*self.worker.current_tasks, {**task_info, "task_id": task_id}]
+            self.worker.current_task = task_info
+            await self._save_task_state()
+
+    async def track_task_finished(self, task_id: str) -> None:
+        """Remove a task from the set of tasks currently running on this worker."""
+        async with self.status_lock:
+            self.worker.current_tasks = [t for t in self.worker.current_tasks if t.get("task_id") != task_id]
+            self.worker.tasks_completed = (self.worker.tasks_completed or 0) + 1
+            await self._save_task_state()
+
+    async def _save_task_state(self) -> None:
+        self.worker.status = "busy" if len(self.worker.current_tasks) >= self.concurrency else "free"
+        if not self.commit_worker_status or self.worker.id is None:
+            return
+        await self.worker_service.update_task_state(
+            self.worker.id,
+            status=self.worker.status,
+            current_tasks=self.worker.current_tasks,
+            current_task=self.worker.current_task,
+            tasks_completed=self.worker.tasks_completed,
+        )
 
     async def start(self, rabbitmq_connection, routing_key="broadcast") -> None:
         self.logger.info(f"Perform {self.name} worker connection")
@@ -98,10 +127,9 @@ class BaseMessagesWorker:
             # Creating a channel
             channel: AbstractChannel = await connection.get_channel()
 
-            # Setting prefetch count to 1 to process one message at a time
-            await channel.set_qos(prefetch_count=1)
-
-            worker = self
+            # Prefetch as many messages as the worker is allowed to process at once,
+            # shared by every queue the worker consumes from
+            await channel.set_qos(prefetch_count=self.concurrency, global_=True)
 
             if not self.exchange_name:
                 raise ValueError("Exchange name is required")
@@ -110,20 +138,10 @@ class BaseMessagesWorker:
                 self.exchange_name, self.exchange_type, durable=self.durable, auto_delete=self.auto_delete
             )
 
-            # Declaring queue
-            queue = await channel.declare_queue(
-                worker.name,
-                exclusive=self.exclusive,
-                durable=self.durable,
-                auto_delete=self.auto_delete,
-            )
-
-            # Binding the queue to the exchange
-            _ = await queue.bind(
-                tasks_exchange,
-                routing_key=routing_key,
-            )
-            consumer_tag = await queue.consume(worker.on_message)
+            queues = await self.declare_queues(channel, tasks_exchange, routing_key)
+            consumers: list[tuple[AbstractQueue, str]] = []
+            for queue in queues:
+                consumers.append((queue, await queue.consume(self.on_message)))
             try:
                 # This is the line that keeps the worker alive and is the cancellation point
                 await asyncio.Future()
@@ -131,15 +149,30 @@ class BaseMessagesWorker:
                 self.logger.info(f"Worker {self.name} received cancellation signal.")
 
                 # Cleanly stop consuming messages
-                if consumer_tag:
-                    await queue.cancel(consumer_tag)
+                for queue, consumer_tag in consumers:
+                    if consumer_tag:
+                        await queue.cancel(consumer_tag)
 
                 raise
 
+    async def declare_queues(
+        self, channel: AbstractChannel, exchange: AbstractExchange, routing_key: str
+    ) -> list[AbstractQueue]:
+        """Declare and bind the queues the worker consumes from."""
+        queue = await channel.declare_queue(
+            self.name,
+            exclusive=self.exclusive,
+            durable=self.durable,
+            auto_delete=self.auto_delete,
+        )
+        _ = await queue.bind(exchange, routing_key=routing_key)
+        return [queue]
+
     async def register(self):
-        self.worker.host_metadata = await get_host_metadata()
-        self.worker = await self.worker_service.save_worker(self.worker)
-        await self.session.commit()
+        async with self.status_lock:
+            self.worker.host_metadata = await get_host_metadata()
+            self.worker = await self.worker_service.save_worker(self.worker)
+            await self.session.commit()
 
     async def run(self, rabbitmq_connection, routing_key="broadcast") -> None:
         await self.register()
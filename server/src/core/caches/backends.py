@@ -0,0 +1,161 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Protocol
+
+from prometheus_client import Counter
+
+from core.caches.crud import CacheCRUD
+from core.caches.schema import CacheCreate
+from core.caches.service import CacheService
+from core.config import Settings
+from core.dependencies import get_async_session
+
+logger = logging.getLogger(__name__)
+
+cache_requests_counter = Counter("cache_requests_total", "Cache lookups by backend and result", ["backend", "result"])
+cache_evictions_counter = Counter("cache_evictions_total", "Entries evicted from the in-process cache", ["reason"])
+
+
+@dataclass
+class CacheEntry:
+    value: bytes
+    expire_at: float  # unix timestamp
+
+    @property
+    def ttl(self) -> float:
+        return self.expire_at - time.time()
+
+
+class CacheBackend(Protocol):
+    name: str
+
+    async def get(self, module: str, key: str) -> CacheEntry | None: ...
+    async def set(self, module: str, key: str, value: bytes, ttl: float) -> None: ...
+    async def delete(self, module: str, key: str) -> None: ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache, entries expire after their TTL."""
+
+    name: str = "memory"
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries: int = max_entries
+        self._entries: OrderedDict[tuple[str, str], CacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, module: str, key: str) -> CacheEntry | None:
+        entry = self._entries.get((module, key))
+        if entry is None:
+            cache_requests_counter.labels(self.name, "miss").inc()
+            return None
+
+        if entry.expire_at <= time.time():
+            del self._entries[(module, key)]
+            cache_evictions_counter.labels("expired").inc()
+            cache_requests_counter.labels(self.name, "miss").inc()
+            return None
+
+        self._entries.move_to_end((module, key))
+        cache_requests_counter.labels(self.name, "hit").inc()
+        return entry
+
+    async def set(self, module: str, key: str, value: bytes, ttl: float) -> None:
+        self._entries[(module, key)] = CacheEntry(value=value, expire_at=time.time() + ttl)
+        self._entries.move_to_end((module, key))
+        while len(self._entries) > self.max_entries:
+            _ = self._entries.popitem(last=False)
+            cache_evictions_counter.labels("capacity").inc()
+
+    async def delete(self, module: str, key: str) -> None:
+        _ = self._entries.pop((module, key), None)
+
+
+class DatabaseCacheBackend:
+    """Shared cache stored in the ``caches`` table."""
+
+    name: str = "database"
+
+    async def get(self, module: str, key: str) -> CacheEntry | None:
+        async with get_async_session() as session:
+            cached_item = await CacheService(crud=CacheCRUD(session=session)).get_cache(module=module, key=key)
+            if cached_item is None:
+                cache_requests_counter.labels(self.name, "miss").inc()
+                return None
+
+            cache_requests_counter.labels(self.name, "hit").inc()
+            return CacheEntry(value=cached_item.value, expire_at=cached_item.expire_at.timestamp())
+
+    async def set(self, module: str, key: str, value: bytes, ttl: float) -> None:
+        async with get_async_session() as session:
+            _ = await CacheService(crud=CacheCRUD(session=session)).set_cache(
+                CacheCreate(module=module, key=key, value=value), ttl=max(int(ttl), 1)
+            )
+
+    async def delete(self, module: str, key: str) -> None:
+        async with get_async_session() as session:
+            await CacheService(crud=CacheCRUD(session=session)).delete_cache(module=module, key=key)
+
+
+class TieredCacheBackend:
+    """Looks up the in-process cache first and falls back to a shared backend."""
+
+    name: str = "tiered"
+
+    def __init__(self, local: CacheBackend, shared: CacheBackend):
+        self.local: CacheBackend = local
+        self.shared: CacheBackend = shared
+
+    async def get(self, module: str, key: str) -> CacheEntry | None:
+        entry = await self.local.get(module, key)
+        if entry is not None:
+            return entry
+
+        entry = await self.shared.get(module, key)
+        if entry is not None and entry.ttl > 0:
+            # Keep the shared expiry so replicas do not serve the value longer than the shared cache
+            await self.local.set(module, key, entry.value, entry.ttl)
+        return entry
+
+    async def set(self, module: str, key: str, value: bytes, ttl: float) -> None:
+        await self.local.set(module, key, value, ttl)
+        await self.shared.set(module, key, value, ttl)
+
+    async def delete(self, module: str, key: str) -> None:
+        await self.local.delete(module, key)
+        await self.shared.delete(module, key)
+
+
+_cache_backend: CacheBackend | None = None
+
+
+def create_cache_backend(backend_name: str, max_entries: int = 1024) -> CacheBackend:
+    match backend_name:
+        case "memory":
+            return MemoryCacheBackend(max_entries=max_entries)
+        case "database":
+            return DatabaseCacheBackend()
+        case "tiered":
+            return TieredCacheBackend(MemoryCacheBackend(max_entries=max_entries), DatabaseCacheBackend())
+        case _:
+            raise ValueError(f"Unknown cache backend {backend_name}, expected memory, database or tiered")
+
+
+def get_cache_backend() -> CacheBackend:
+    """Return the process wide cache backend configured by ``CACHE_BACKEND``."""
+    global _cache_backend
+    if _cache_backend is None:
+        settings = Settings()
+        _cache_backend = create_cache_backend(settings.CACHE_BACKEND, settings.CACHE_MEMORY_MAX_ENTRIES)
+        logger.debug(f"Using {_cache_backend.name} cache backend")
+    return _cache_backend
+
+
+def set_cache_backend(backend: CacheBackend | None) -> None:
+    """Replace the process wide cache backend, ``None`` rebuilds it from the settings on next use."""
+    global _cache_backend
+    _cache_backend = backend
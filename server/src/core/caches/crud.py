@@ -1,6 +1,9 @@
 from typing import Any
 
-from sqlalchemy import select
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -36,5 +39,19 @@ class CacheCRUD:
         await self.session.flush()
         return db_cache
 
+    async def upsert(self, body: dict[str, Any]) -> Cache:
+        statement = insert(Cache).values(**body)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Cache.module, Cache.key],
+            set_={"value": statement.excluded.value, "expire_at": statement.excluded.expire_at},
+        ).returning(Cache)
+        result = await self.session.execute(statement)
+        return result.scalar_one()
+
     async def delete(self, cache: Cache) -> None:
         await self.session.delete(cache)
+
+    async def delete_expired(self, limit: int) -> int:
+        expired = select(Cache.id).where(Cache.expire_at < datetime.now(UTC)).limit(limit)
+        result = await self.session.execute(delete(Cache).where(Cache.id.in_(expired)))
+        return result.rowcount  # pyright: ignore[reportAttributeAccessIssue]
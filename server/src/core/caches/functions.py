@@ -1,4 +1,6 @@
+import asyncio
 import functools
+import hashlib
 import inspect
 import logging
 from collections.abc import Callable
@@ -6,15 +8,20 @@ import pickle
 from typing import Any
 from collections.abc import Awaitable
 
-from core.caches.crud import CacheCRUD
-from core.caches.schema import CacheCreate
-from core.caches.service import CacheService
+from core.caches.backends import get_cache_backend
 from core.config import Settings
-from core.dependencies import get_async_session
 
 
 logger = logging.getLogger(__name__)
 
+# Calls currently fetching a value, concurrent misses for the same key wait for them
+_inflight: dict[tuple[str, str], asyncio.Future[Any]] = {}
+
+
+def make_cache_key(qualname: str, key_args: str, key_kwargs: str) -> str:
+    """Hash the call signature to a fixed length key."""
+    return hashlib.sha256(f"{qualname}:{key_args}:{key_kwargs}".encode()).hexdigest()
+
 
 def cache_decorator(avoid_args: bool = False, ttl: int = 60):
     """
@@ -45,44 +52,62 @@ def cache_decorator(avoid_args: bool = False, ttl: int = 60):
                 logger.warning(f"Could not repr args/kwargs for cache key: {e}. Skipping cache for this call.")
                 return await func(*args, **kwargs)
 
-            result = {}
-
-            async with get_async_session() as session:
-                cache_service = CacheService(
-                    crud=CacheCRUD(session=session),
-                )
-
-                module = func.__module__
-                key = f"{func.__qualname__}:{key_args}:{key_kwargs}"
-                # Check if the result is already cached
-                cached_item = await cache_service.get_cache(module=module, key=key)
-
-                if cached_item:
-                    try:
-                        # Deserialize the binary data back to the original Python object
-                        deserialized_value = pickle.loads(cached_item.value)
-                        logger.debug(f"Cache hit for {key} in module {module}. Returning cached result.")
-                        return deserialized_value
-                    except pickle.UnpicklingError as e:
-                        logger.error(f"Error unpickling cached data for key {key}: {e}. Fetching fresh data.")
-                        # If unpickling fails, treat as a cache miss
-                else:
-                    logger.debug(f"Cache miss for {key} in module {module}. Fetching fresh data.")
+            backend = get_cache_backend()
+            module = func.__module__
+            key = make_cache_key(func.__qualname__, key_args, key_kwargs)
+
+            # Check if the result is already cached
+            try:
+                cached_item = await backend.get(module, key)
+            except Exception as e:
+                logger.error(f"Error reading cache for {func.__qualname__} in module {module}: {e}")
+                cached_item = None
 
+            if cached_item:
+                try:
+                    # Deserialize the binary data back to the original Python object
+                    deserialized_value = pickle.loads(cached_item.value)
+                    logger.debug(f"Cache hit for {func.__qualname__} in module {module}. Returning cached result.")
+                    return deserialized_value
+                except pickle.UnpicklingError as e:
+                    logger.error(f"Error unpickling cached data for key {key}: {e}. Fetching fresh data.")
+                    # If unpickling fails, treat as a cache miss
+            else:
+                logger.debug(f"Cache miss for {func.__qualname__} in module {module}. Fetching fresh data.")
+
+            inflight = _inflight.get((module, key))
+            if inflight is not None:
+                # Another call is already fetching this value
+                return await asyncio.shield(inflight)
+
+            future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+            _inflight[(module, key)] = future
+            try:
                 # Call the actual function
                 result = await func(*args, **kwargs)
+                future.set_result(result)
+            except asyncio.CancelledError:
+                _ = future.cancel()
+                _ = _inflight.pop((module, key), None)
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                _ = future.exception()  # the error is raised to the caller, do not report it as unretrieved
+                _ = _inflight.pop((module, key), None)
+                raise
 
-                try:
-                    # Serialize the result to binary using pickle.dumps()
-                    # This handles Pydantic models, lists of models, dicts, etc.
-                    pickled_result = pickle.dumps(result)
-                    _ = await cache_service.set_cache(
-                        CacheCreate(module=module, key=key, value=pickled_result), ttl=ttl
-                    )
-                    logger.debug(f"Successfully cached result for {key} in module {module}.")
-                except Exception as e:
-                    # Do not raise exception if cache is not saved, just log it
-                    logger.error(f"Error saving cache for {key} in module {module}: {e}")
+            try:
+                # Serialize the result to binary using pickle.dumps()
+                # This handles Pydantic models, lists of models, dicts, etc.
+                pickled_result = pickle.dumps(result)
+                await backend.set(module, key, pickled_result, ttl)
+                logger.debug(f"Successfully cached result for {func.__qualname__} in module {module}.")
+            except Exception as e:
+                # Do not raise exception if cache is not saved, just log it
+                logger.error(f"Error saving cache for {func.__qualname__} in module {module}: {e}")
+            finally:
+                # Until the value is stored, later callers wait for the in-flight result instead of fetching it again
+                _ = _inflight.pop((module, key), None)
             return result
 
         return wrapper
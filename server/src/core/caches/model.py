@@ -6,11 +6,15 @@ from sqlalchemy.orm import Mapped, mapped_column
 
 from core.base_models import Base
 
-from sqlalchemy import UUID, DateTime, LargeBinary, func
+from sqlalchemy import UUID, DateTime, Index, LargeBinary, func
 
 
 class Cache(Base):
     __tablename__: str = "caches"
+    __table_args__ = (
+        Index("unique_cache_module_key", "module", "key", unique=True),
+        Index("ix_caches_expire_at", "expire_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     module: Mapped[str] = mapped_column(index=True)
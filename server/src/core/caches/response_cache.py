@@ -0,0 +1,100 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from prometheus_client import Counter
+
+from core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Entity tag of responses that any entity event invalidates
+ANY_ENTITY = "*"
+
+response_cache_counter = Counter(
+    "graphql_response_cache_total", "GraphQL response cache lookups and invalidated entries", ["result"]
+)
+
+
+@dataclass
+class ResponseCacheEntry:
+    data: Any
+    entities: frozenset[str]
+    expire_at: float  # monotonic time
+
+
+class ResponseCache:
+    """
+    In-process LRU of GraphQL response data.
+    Entries are tagged with the entities they were read from and dropped when an event of one of them is received.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries: int = max_entries
+        self._entries: OrderedDict[str, ResponseCacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None or entry.expire_at <= time.monotonic():
+            _ = self._entries.pop(key, None)
+            response_cache_counter.labels("miss").inc()
+            return None
+
+        self._entries.move_to_end(key)
+        response_cache_counter.labels("hit").inc()
+        return entry.data
+
+    def set(self, key: str, data: Any, entities: frozenset[str], ttl: float) -> None:
+        self._entries[key] = ResponseCacheEntry(data=data, entities=entities, expire_at=time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            _ = self._entries.popitem(last=False)
+
+    def invalidate(self, entity: str | None = None) -> int:
+        """Drop the entries read from the entity, every entry when it is None. Returns the number of dropped entries."""
+        if entity is None:
+            keys = list(self._entries)
+        else:
+            keys = [
+                key for key, entry in self._entries.items() if entity in entry.entities or ANY_ENTITY in entry.entities
+            ]
+        for key in keys:
+            del self._entries[key]
+        if keys:
+            response_cache_counter.labels("invalidated").inc(len(keys))
+        return len(keys)
+
+
+_response_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(max_entries=Settings().GRAPHQL_RESPONSE_CACHE_MAX_ENTRIES)
+    return _response_cache
+
+
+def invalidate_response_cache(message: dict[str, Any]) -> None:
+    """
+    Drop the cached responses affected by a message of the ``ik_event_messages`` fanout.
+    Events name their entity in the metadata or in the ``events.<entity>.<id>`` routing key,
+    events without one may change anything and clear the whole cache.
+    """
+    if _response_cache is None:
+        return
+
+    metadata: dict[str, Any] = message.get("_metadata", {})
+    entity = metadata.get("entity")
+    routing_key = metadata.get("_routing_key") or ""
+    if entity is None and routing_key.startswith("events."):
+        entity = routing_key.split(".")[1] or None
+
+    dropped = _response_cache.invalidate(entity)
+    if dropped:
+        logger.debug(f"Dropped {dropped} cached GraphQL responses on {entity or 'an'} event")
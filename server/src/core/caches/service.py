@@ -24,11 +24,10 @@ class CacheService:
 
     async def set_cache(self, cache: CacheCreate, ttl: int | None = None) -> CacheDTO:
         if ttl:
-            cache.expire_at = datetime.now() + timedelta(seconds=ttl)
+            cache.expire_at = datetime.now(UTC) + timedelta(seconds=ttl)
 
-        result = await self.crud.create(model_db_dump(cache))
+        result = await self.crud.upsert(model_db_dump(cache))
         await self.crud.commit()
-        await self.crud.refresh(result)
         return CacheDTO.model_validate(result)
 
     async def delete_cache(self, module: str, key: str) -> None:
@@ -36,3 +35,14 @@ class CacheService:
         if cache:
             await self.crud.delete(cache)
             await self.crud.commit()
+
+    async def delete_expired(self, batch_size: int = 1000, max_batches: int = 100) -> int:
+        """Delete expired entries in batches, each batch in its own transaction."""
+        deleted = 0
+        for _ in range(max_batches):
+            count = await self.crud.delete_expired(limit=batch_size)
+            await self.crud.commit()
+            deleted += count
+            if count < batch_size:
+                break
+        return deleted
@@ -1,11 +1,19 @@
+import hashlib
+import json
 import logging
 import os
 import uuid
+from collections import defaultdict
+from contextvars import ContextVar
 from typing import Any
 
 import casbin
 import casbin_async_sqlalchemy_adapter
+from casbin.util import key_match
+from prometheus_client import Counter, Histogram
+from sqlalchemy import select
 
+from core.dependencies import get_async_session
 from core.permissions.model import Permission
 from core.singleton_meta import SingletonMeta
 from core.utils.event_sender import EventSender
@@ -16,6 +24,54 @@ from ..rabbitmq import RabbitMQConnection
 
 logger = logging.getLogger(__name__)
 
+# Actions from the highest to the lowest, a higher action implies the lower ones
+ACTION_LEVELS = ("admin", "write", "read")
+# Decisions are dropped all at once when the cache grows over this size
+DECISION_CACHE_SIZE = 100_000
+
+enforce_calls_counter = Counter("casbin_enforce_total", "Authorization decisions by cache result", ["cache"])
+enforce_calls_per_request = Histogram(
+    "casbin_enforce_calls_per_request",
+    "Authorization decisions evaluated by the enforcer per request",
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+
+policy_reloads_counter = Counter("casbin_policy_reloads_total", "Policy change events applied by kind", ["kind"])
+
+# Request-scoped number of enforcer evaluations, see start_enforce_calls_count
+_enforce_calls: ContextVar[list[int] | None] = ContextVar("_enforce_calls", default=None)
+# Request-scoped policy rules changed in the database, sent with the next reload event
+_policy_changes: ContextVar[set[tuple[str, ...]] | None] = ContextVar("_policy_changes", default=None)
+
+# Identifies policy events of this process, receivers track a version per origin to detect missed events
+POLICY_EVENTS_ORIGIN = uuid.uuid4().hex
+
+
+def start_enforce_calls_count() -> list[int]:
+    """Start counting enforcer evaluations in the current context and return the counter."""
+    calls = [0]
+    _ = _enforce_calls.set(calls)
+    return calls
+
+
+def permission_rule(permission: Permission) -> tuple[str, ...]:
+    """Casbin rule of a permission row, e.g. ``("p", "role", "api:resource", "read")``."""
+    rule = [permission.ptype]
+    for value in (permission.v0, permission.v1, permission.v2, permission.v3, permission.v4, permission.v5):
+        if value is None:
+            break
+        rule.append(value)
+    return tuple(rule)
+
+
+def record_policy_change(permission: Permission) -> None:
+    """Remember a created or deleted permission row for the next policy change event."""
+    changes = _policy_changes.get()
+    if changes is None:
+        changes = set()
+        _ = _policy_changes.set(changes)
+    changes.add(permission_rule(permission))
+
 
 class CasbinEnforcer(metaclass=SingletonMeta):
     enforcer: casbin.AsyncEnforcer | None
@@ -26,12 +82,121 @@ class CasbinEnforcer(metaclass=SingletonMeta):
         self.enforcer = None
         self.db_adapter = adapter or sql_adapter
         self.rabbitmq: RabbitMQConnection = rabbitmq or RabbitMQConnection()
+        self._decisions: dict[tuple[str, str, str], bool] = {}
+        self._highest_actions: dict[tuple[str, str], str | None] = {}
+        self._fingerprints: dict[str, str] = {}
+        self._policy_version: int = 0
+        self._origin_versions: dict[str, int] = {}
 
     async def init_enforcer(self):
         model_path = os.path.join(os.path.dirname(__file__), "model.conf")
 
         self.enforcer = casbin.AsyncEnforcer(model_path, self.db_adapter, enable_log=os.getenv("LOG_LEVEL") == "DEBUG")
+        # Policies are written through PermissionCRUD, the enforcer only mirrors them
+        self.enforcer.enable_auto_save(False)
         await self.enforcer.load_policy()
+        self.clear_decision_cache()
+
+    async def reload_policies(self):
+        enforcer = await self.get_enforcer()
+        await enforcer.load_policy()
+        self.clear_decision_cache()
+
+    def clear_decision_cache(self):
+        self._decisions.clear()
+        self._highest_actions.clear()
+        self._fingerprints.clear()
+
+    def enforce(self, sub: str, obj: str, act: str) -> bool:
+        """Cached ``enforcer.enforce``, the cache lives until the policies are reloaded."""
+        if self.enforcer is None:
+            raise RuntimeError("Casbin enforcer is not initialized")
+
+        key = (sub, obj, act)
+        decision = self._decisions.get(key)
+        if decision is not None:
+            enforce_calls_counter.labels("hit").inc()
+            return decision
+
+        enforce_calls_counter.labels("miss").inc()
+        calls = _enforce_calls.get()
+        if calls is not None:
+            calls[0] += 1
+
+        decision = self.enforcer.enforce(sub, obj, act) is True
+        if len(self._decisions) >= DECISION_CACHE_SIZE:
+            self._decisions.clear()
+        self._decisions[key] = decision
+        return decision
+
+    def get_highest_action(self, sub: str, obj: str) -> str | None:
+        """Return the highest action of ``ACTION_LEVELS`` allowed to the subject, or None."""
+        key = (sub, obj)
+        if key in self._highest_actions:
+            return self._highest_actions[key]
+
+        highest = next((act for act in ACTION_LEVELS if self.enforce(sub, obj, act)), None)
+        if len(self._highest_actions) >= DECISION_CACHE_SIZE:
+            self._highest_actions.clear()
+        self._highest_actions[key] = highest
+        return highest
+
+    async def get_highest_actions(self, sub: str, objs: list[str]) -> list[str | None]:
+        """Batch version of get_highest_action.
+
+        The subject's implicit roles and policies are resolved once and matched
+        against every object, instead of enforcing each (object, action) pair.
+        """
+        highest_actions = {
+            obj: self._highest_actions[(sub, obj)] for obj in objs if (sub, obj) in self._highest_actions
+        }
+        missing = [obj for obj in dict.fromkeys(objs) if obj not in highest_actions]
+        if missing:
+            enforcer = await self.get_enforcer()
+            policies: list[list[str]] = await enforcer.get_implicit_permissions_for_user(sub)
+
+            exact_actions: dict[str, set[str]] = defaultdict(set)
+            pattern_actions: list[tuple[str, str]] = []
+            for policy in policies:
+                if "*" in policy[1]:
+                    pattern_actions.append((policy[1], policy[2]))
+                else:
+                    exact_actions[policy[1]].add(policy[2])
+
+            if len(self._highest_actions) + len(missing) >= DECISION_CACHE_SIZE:
+                self._highest_actions.clear()
+            for obj in missing:
+                actions = exact_actions.get(obj, set()) | {
+                    act for pattern, act in pattern_actions if key_match(obj, pattern)
+                }
+                highest_actions[obj] = next((act for act in ACTION_LEVELS if act in actions), None)
+                self._highest_actions[(sub, obj)] = highest_actions[obj]
+
+        return [highest_actions[obj] for obj in objs]
+
+    async def get_permission_fingerprint(self, sub: str) -> str:
+        """Hash of the subject's implicit roles and policies, equal for subjects allowed the same things."""
+        fingerprint = self._fingerprints.get(sub)
+        if fingerprint is not None:
+            return fingerprint
+
+        enforcer = await self.get_enforcer()
+        roles: list[str] = await enforcer.get_implicit_roles_for_user(sub)
+        policies: list[list[str]] = await enforcer.get_implicit_permissions_for_user(sub)
+        # The policies name the subject or one of its roles, only the objects and actions tell what it may do
+        rules = sorted({tuple(policy[1:]) for policy in policies})
+        fingerprint = hashlib.sha256(json.dumps([sorted(roles), rules]).encode()).hexdigest()
+        if len(self._fingerprints) >= DECISION_CACHE_SIZE:
+            self._fingerprints.clear()
+        self._fingerprints[sub] = fingerprint
+        return fingerprint
+
+    def has_access(self, sub: str, obj: str, action: str) -> bool:
+        """Check the action against the highest allowed action, so admin implies write and read."""
+        highest = self.get_highest_action(sub, obj)
+        if highest is None:
+            return False
+        return ACTION_LEVELS.index(highest) <= ACTION_LEVELS.index(action)
 
     async def get_enforcer(self) -> casbin.AsyncEnforcer:
         if not self.enforcer:
@@ -41,14 +206,87 @@ class CasbinEnforcer(metaclass=SingletonMeta):
         return self.enforcer
 
     async def send_reload_event(self):
+        """Broadcast the policy rules changed in the current context.
+
+        Receivers re-read only these rules, a full reload is requested when no
+        change was recorded in this context.
+        """
+        changes = _policy_changes.get()
+        self._policy_version += 1
+
         event_sender = EventSender(entity_name="enforcer")
         event_message = MessageModel()
         event_message.message_type = "event"
         event_message.metadata["event"] = "reload_policies"
         event_message.exchange = "ik_event_messages"
         event_message.exchange_type = ExchangeType.FANOUT
+        event_message.body = {"origin": POLICY_EVENTS_ORIGIN, "version": self._policy_version}
+        if changes:
+            event_message.body["rules"] = [list(rule) for rule in sorted(changes)]
+            changes.clear()
         await event_sender.send_message(event_message)
 
+    async def apply_policy_event(self, body: dict[str, Any]):
+        """Apply a ``reload_policies`` event, falling back to a full reload when an event was missed."""
+        origin: str | None = body.get("origin")
+        version: int | None = body.get("version")
+        rules: list[list[str]] | None = body.get("rules")
+        if origin is None or version is None:
+            policy_reloads_counter.labels("full").inc()
+            await self.reload_policies()
+            return
+
+        last_version = self._origin_versions.get(origin)
+        self._origin_versions[origin] = max(version, last_version or 0)
+        if not rules or (last_version is not None and version > last_version + 1):
+            policy_reloads_counter.labels("full").inc()
+            await self.reload_policies()
+            return
+
+        policy_reloads_counter.labels("incremental").inc()
+        await self.apply_policy_changes([tuple(rule) for rule in rules])
+
+    async def apply_policy_changes(self, rules: list[tuple[str, ...]]):
+        """Sync the given rules with the database.
+
+        Rules found in the database are added to the enforcer, the others are
+        removed, so events applied late or after a rollback leave the enforcer
+        consistent.
+        """
+        enforcer = await self.get_enforcer()
+        stored = await self._get_stored_rules(rules)
+
+        for ptype in sorted({rule[0] for rule in rules}):
+            grouping = ptype.startswith("g")
+            has_rule = enforcer.has_named_grouping_policy if grouping else enforcer.has_named_policy
+            group = [list(rule[1:]) for rule in rules if rule[0] == ptype]
+
+            to_add = [rule for rule in group if (ptype, *rule) in stored and not has_rule(ptype, rule)]
+            to_remove = [rule for rule in group if (ptype, *rule) not in stored and has_rule(ptype, rule)]
+            if grouping:
+                if to_add:
+                    _ = await enforcer.add_named_grouping_policies(ptype, to_add)
+                if to_remove:
+                    _ = await enforcer.remove_named_grouping_policies(ptype, to_remove)
+            else:
+                if to_add:
+                    _ = await enforcer.add_named_policies(ptype, to_add)
+                if to_remove:
+                    _ = await enforcer.remove_named_policies(ptype, to_remove)
+
+        self.clear_decision_cache()
+
+    async def _get_stored_rules(self, rules: list[tuple[str, ...]]) -> set[tuple[str, ...]]:
+        statement = select(Permission).where(
+            Permission.ptype.in_({rule[0] for rule in rules}),
+            Permission.v0.in_({rule[1] for rule in rules if len(rule) > 1}),
+            Permission.v1.in_({rule[2] for rule in rules if len(rule) > 2}),
+        )
+        async with get_async_session() as session:
+            result = await session.execute(statement)
+            permissions = result.scalars().all()
+        return {permission_rule(permission) for permission in permissions} & set(rules)
+
     async def get_user_roles(self, user_id: str | uuid.UUID) -> list[str]:
         if is_valid_uuid(user_id) is False:
             raise ValueError("User ID must be a valid UUID")
@@ -1,10 +1,13 @@
 import asyncio
 import datetime
 import logging
+from collections import deque
 from typing import Any, Literal, Protocol
 from uuid import UUID
 
 from aio_pika import ExchangeType
+from prometheus_client import Counter
+from sqlalchemy import insert
 
 from core.dependencies import get_async_session
 from core.logs.model import Log
@@ -14,6 +17,14 @@ from .rabbitmq import RabbitMQConnection
 
 logger = logging.getLogger("entity_logger")
 
+# Buffered lines are flushed when either limit is reached first
+LOG_FLUSH_LINES = 200
+LOG_FLUSH_INTERVAL_MS = 500
+# Upper bound of lines kept in memory, the oldest lines are dropped when the database can not keep up
+LOG_BUFFER_SIZE = 20_000
+
+log_lines_counter = Counter("entity_logger_lines_total", "Log lines handled by EntityLogger", ["state"])
+
 
 class LoggerProtocol(Protocol):
     def info(self, data: str) -> None: ...
@@ -31,9 +42,17 @@ class EntityLogger:
         audit_log_id: str | UUID | None = None,
         should_be_expired: bool = False,
         trace_id: str | None = None,
+        flush_lines: int = LOG_FLUSH_LINES,
+        flush_interval_ms: int = LOG_FLUSH_INTERVAL_MS,
+        buffer_size: int = LOG_BUFFER_SIZE,
     ):
-        self.bulk_logs_operations: list[Log] = []
-        self.messages: list[MessageModel] = []
+        # Ring buffers of log rows waiting to be inserted and lines waiting to be streamed
+        self.bulk_logs_operations: deque[dict[str, Any]] = deque(maxlen=buffer_size)
+        self.messages: deque[MessageModel] = deque(maxlen=buffer_size)
+        self.flush_lines: int = flush_lines
+        self.flush_interval_ms: int = flush_interval_ms
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task[None] | None = None
         self.entity_name: str | None = entity_name
         self.entity_id: str | UUID = entity_id
         self.revision_number: int = revision_number
@@ -49,21 +68,28 @@ class EntityLogger:
     def make_expired(self):
         self.expire_at = datetime.datetime.now() + datetime.timedelta(days=5)
 
-    def add_log_header(self, data: str):
-        log = Log(
-            entity=self.entity_name,
-            entity_id=self.entity_id,
-            revision=self.revision_number,
-            data=data,
-            level="header",
-            created_at=datetime.datetime.now(datetime.UTC),
-            execution_start=self.execution_start,
-            audit_log_id=self.audit_log_id,
-            expire_at=self.expire_at,
-            trace_id=self.trace_id,
-        )
+    def _create_row(self, data: str, level: str) -> dict[str, Any]:
+        return {
+            "entity": self.entity_name,
+            "entity_id": self.entity_id,
+            "revision": self.revision_number,
+            "data": data,
+            "level": level,
+            "created_at": datetime.datetime.now(datetime.UTC),
+            "execution_start": self.execution_start,
+            "audit_log_id": self.audit_log_id,
+            "expire_at": self.expire_at,
+            "trace_id": self.trace_id,
+        }
+
+    def _buffer_row(self, row: dict[str, Any]):
+        if len(self.bulk_logs_operations) == self.bulk_logs_operations.maxlen:
+            log_lines_counter.labels("dropped").inc()
+        self.bulk_logs_operations.append(row)
+        log_lines_counter.labels("buffered").inc()
 
-        self.bulk_logs_operations.append(log)
+    def add_log_header(self, data: str):
+        self._buffer_row(self._create_row(data, "header"))
 
     def create_message(self, body: dict[str, Any]) -> MessageModel:
         message = MessageModel(
@@ -78,19 +104,7 @@ class EntityLogger:
     def append_log(self, data: str, level: Literal["info", "warn", "error", "debug"] = "info"):
         if data == "":
             return
-        log = Log(
-            entity=self.entity_name,
-            entity_id=self.entity_id,
-            revision=self.revision_number,
-            data=data,
-            level=level,
-            created_at=datetime.datetime.now(datetime.UTC),
-            execution_start=self.execution_start,
-            audit_log_id=self.audit_log_id,
-            expire_at=self.expire_at,
-            trace_id=self.trace_id,
-        )
-        self.bulk_logs_operations.append(log)
+        self._buffer_row(self._create_row(data, level))
         message = self.create_message(
             {
                 "entity": self.entity_name,
@@ -100,28 +114,80 @@ class EntityLogger:
             }
         )
         self.messages.append(message)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Flush in the background after flush_lines lines or flush_interval_ms, whichever comes first."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not running inside an event loop, lines stay buffered until save_log is awaited
+            return
 
-    async def save_if_more_than(self, count: int):
-        # Return early if already saving to avoid creating unnecessary lock contention
-        if self._save_lock.locked():
+        if len(self.bulk_logs_operations) >= self.flush_lines:
+            self._start_flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.flush_interval_ms / 1000, self._start_flush)
+
+    def _start_flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        # A running flush drains everything buffered in the meantime
+        if self._flush_task is not None and not self._flush_task.done():
             return
-        if len(self.bulk_logs_operations) > count:
-            await self.save_log()
+        self._flush_task = asyncio.create_task(self.save_log())
+        self._flush_task.add_done_callback(self._on_flush_done)
+
+    @staticmethod
+    def _on_flush_done(task: asyncio.Task[None]):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Failed to flush logs: {task.exception()}")
 
     async def save_log(self):
         async with self._save_lock:
-            if self.bulk_logs_operations:
+            while self.bulk_logs_operations:
+                rows = list(self.bulk_logs_operations)
+                self.bulk_logs_operations.clear()
                 async with get_async_session() as session:
-                    session.add_all(self.bulk_logs_operations)
-                    self.bulk_logs_operations = []
+                    # multi-row INSERT instead of one ORM object per line
+                    _ = await session.execute(insert(Log), rows)
                     await session.commit()
+                log_lines_counter.labels("flushed").inc(len(rows))
 
             await self.send_messages()
 
     async def send_messages(self):
-        for message in self.messages:
-            await RabbitMQConnection.send_message(message)
-        self.messages = []
+        messages = list(self.messages)
+        self.messages.clear()
+        await RabbitMQConnection.publish_many(self.merge_messages(messages))
+
+    def merge_messages(self, messages: list[MessageModel]) -> list[MessageModel]:
+        """Merge consecutive lines of the same level into one broker message."""
+        merged: list[MessageModel] = []
+        lines: list[str] = []
+        level: str | None = None
+        for message in messages:
+            if level is not None and message.body.get("level") != level:
+                merged.append(self._create_lines_message(lines, level))
+                lines = []
+            level = message.body.get("level")
+            lines.append(message.body.get("data", ""))
+
+        if level is not None:
+            merged.append(self._create_lines_message(lines, level))
+        return merged
+
+    def _create_lines_message(self, lines: list[str], level: str) -> MessageModel:
+        return self.create_message(
+            {
+                "entity": self.entity_name,
+                "entity_id": str(self.entity_id),
+                "data": "\n".join(lines),
+                "lines": lines,
+                "level": level,
+            }
+        )
 
     def add_divider(self):
         self.append_log("\n" + "=" * 100 + "\n")
@@ -1,12 +1,21 @@
+import base64
+import binascii
 import json
 import re
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime
 from typing import Any, TypeVar
 
-from sqlalchemy import BinaryExpression, ColumnElement, and_, cast
+from sqlalchemy import BinaryExpression, ColumnElement, and_, cast, event, func, literal_column, or_, select, text
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import RelationshipProperty, aliased, load_only
 from sqlalchemy.orm.query import inspect
+from sqlalchemy.sql.expression import ClauseElement, Executable
 from sqlalchemy.sql.selectable import Select
 
 from core.base_models import Base
@@ -21,12 +30,41 @@ setup_service_environment()
 from core.config import Settings  # noqa: E402
 
 
-engine = create_async_engine(
-    str(Settings().db_url),
-    pool_size=20,
-    max_overflow=40,
-    json_serializer=lambda obj: json.dumps(obj, cls=JsonEncoder),
-)
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        pool_size=20,
+        max_overflow=40,
+        json_serializer=lambda obj: json.dumps(obj, cls=JsonEncoder),
+    )
+
+
+# Statement counters of the current context, nested scopes all count the statements
+_statement_counters: ContextVar[tuple[list[int], ...]] = ContextVar("statement_counters", default=())
+
+
+@contextmanager
+def count_statements() -> Iterator[list[int]]:
+    """Count the SQL statements executed in the block, the count is the first item of the yielded list."""
+    counter = [0]
+    token = _statement_counters.set((*_statement_counters.get(), counter))
+    try:
+        yield counter
+    finally:
+        _statement_counters.reset(token)
+
+
+def _count_statement(*_: Any) -> None:
+    for counter in _statement_counters.get():
+        counter[0] += 1
+
+
+engine = _create_engine(str(Settings().db_url))
+# Read-only engine for GraphQL queries, None when no replica is configured
+replica_engine = _create_engine(str(Settings().replica_db_url)) if Settings().replica_db_url else None
+for _engine in (engine, replica_engine):
+    if _engine is not None:
+        event.listen(_engine.sync_engine, "before_cursor_execute", _count_statement)
 
 
 class EventFlushingSession(AsyncSession):
@@ -39,6 +77,7 @@ class EventFlushingSession(AsyncSession):
 
 
 SessionLocal = async_sessionmaker(engine, class_=EventFlushingSession, expire_on_commit=False)
+ReplicaSessionLocal = async_sessionmaker(replica_engine, expire_on_commit=False) if replica_engine else None
 
 T = TypeVar("T", bound=Base)
 
@@ -64,6 +103,44 @@ def is_column_relationship(model: type, attr_name: str) -> bool:
     return is_relationship
 
 
+def _resolve_sort_column(model: type, statement: Select[Any], field_name: str) -> tuple[Select[Any], Any | None]:
+    """
+    Return the column to sort by, joining the relationship for dot-notation fields (e.g. "template.name").
+    The column is None when the field does not exist.
+    """
+    field_name = _camel_to_snake(field_name)
+
+    # Handle dot-notation for relationship sorting (e.g. "template.name")
+    if "." in field_name:
+        rel_name, rel_field = field_name.split(".", 1)
+        if not is_column_relationship(model, rel_name):
+            return statement, None
+        rel_prop = model.__mapper__.get_property(rel_name)
+        related_model = rel_prop.mapper.class_
+        if related_model is model:
+            # Self-referential relationships need an explicit alias,
+            # otherwise SQLAlchemy cannot construct model -> same model joins.
+            related_alias = aliased(related_model)
+            relationship_attr = getattr(model, rel_name).of_type(related_alias)
+            related_column = getattr(related_alias, rel_field, None)
+            if related_column is None:
+                return statement, None
+            return statement.outerjoin(relationship_attr), related_column
+
+        related_column = getattr(related_model, rel_field, None)
+        if related_column is None:
+            return statement, None
+        return statement.outerjoin(getattr(model, rel_name)), related_column
+
+    column = getattr(model, field_name, None)
+    if column is None:
+        return statement, None
+
+    if is_column_relationship(model, field_name) is True:
+        raise ValueError(f"Cannot sort by relationship field: {field_name}")
+    return statement, column
+
+
 def evaluate_sqlalchemy_sorting(
     model: type,
     statement: Select[Any],
@@ -83,38 +160,9 @@ def evaluate_sqlalchemy_sorting(
     if direction.lower() not in ["asc", "desc"]:
         raise ValueError(f"Unsupported sorting direction: {direction}")
 
-    field_name = _camel_to_snake(field_name)
-
-    # Handle dot-notation for relationship sorting (e.g. "template.name")
-    if "." in field_name:
-        rel_name, rel_field = field_name.split(".", 1)
-        if not is_column_relationship(model, rel_name):
-            return statement
-        rel_prop = model.__mapper__.get_property(rel_name)
-        related_model = rel_prop.mapper.class_
-        if related_model is model:
-            # Self-referential relationships need an explicit alias,
-            # otherwise SQLAlchemy cannot construct model -> same model joins.
-            related_alias = aliased(related_model)
-            relationship_attr = getattr(model, rel_name).of_type(related_alias)
-            related_column = getattr(related_alias, rel_field, None)
-            if related_column is None:
-                return statement
-            statement = statement.outerjoin(relationship_attr)
-            column = related_column
-        else:
-            related_column = getattr(related_model, rel_field, None)
-            if related_column is None:
-                return statement
-            statement = statement.outerjoin(getattr(model, rel_name))
-            column = related_column
-    else:
-        column = getattr(model, field_name, None)
-        if column is None:
-            return statement
-
-        if is_column_relationship(model, field_name) is True:
-            raise ValueError(f"Cannot sort by relationship field: {field_name}")
+    statement, column = _resolve_sort_column(model, statement, field_name)
+    if column is None:
+        return statement
 
     match direction.lower():
         case "asc" | "ASC":
@@ -144,14 +192,144 @@ def evaluate_sqlalchemy_pagination(statement: Select[Any], range: tuple[int, int
     return statement
 
 
-def evaluate_sqlalchemy_filters(model: type, statement: Select[Any], body: dict[str, Any] | None) -> Select[Any]:
+def encode_cursor(values: list[Any]) -> str:
+    """Encode the position of a row as an opaque keyset pagination cursor."""
+    return base64.urlsafe_b64encode(json.dumps(values, cls=JsonEncoder).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, binascii.Error) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != 3:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _cursor_value(column: Any, value: Any) -> Any:
+    # The cursor went through JSON, convert the value back to the column type for the driver
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if isinstance(value, python_type):
+        return value
+    try:
+        if python_type in (datetime, date):
+            return python_type.fromisoformat(value)
+        return python_type(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _seek_predicate(column: Any, id_column: Any, direction: str, value: Any, last_id: Any) -> ColumnElement[bool]:
+    # Rows after (value, last_id) in "column direction, id direction" order,
+    # postgres puts NULLs last in ascending order and first in descending order
+    if column is id_column:
+        return id_column > last_id if direction == "asc" else id_column < last_id
+
+    if direction == "asc":
+        if value is None:
+            return and_(column.is_(None), id_column > last_id)
+        return or_(column > value, and_(column == value, id_column > last_id), column.is_(None))
+
+    if value is None:
+        return or_(and_(column.is_(None), id_column < last_id), column.is_not(None))
+    return or_(column < value, and_(column == value, id_column < last_id))
+
+
+# Largest keyset page, larger limits are clamped to it
+KEYSET_MAX_PAGE_SIZE = 1000
+
+
+def _keyset_limit(limit: int) -> int:
+    if limit < 1:
+        raise ValueError("Page size must be at least 1")
+    return min(limit, KEYSET_MAX_PAGE_SIZE)
+
+
+def evaluate_sqlalchemy_keyset_pagination(
+    model: type,
+    statement: Select[Any],
+    sort: tuple[str, str] | None = None,
+    cursor: str | None = None,
+    limit: int = 100,
+) -> Select[Any]:
+    """
+    Applies cursor based pagination, the keyset alternative to evaluate_sqlalchemy_pagination.
+    Rows are ordered by the sort field (dot-notation supported) and the primary key, the cursor of
+    the previous page turns into a seek predicate so every page costs the same regardless of its depth.
+    The sort value is added as the last column and one extra row is selected, see keyset_page.
+    The limit must be positive and is clamped to KEYSET_MAX_PAGE_SIZE.
+    """
+    limit = _keyset_limit(limit)
+    id_column = inspect(model).primary_key[0]
+    field_name, direction = sort if sort else ("id", "asc")
+    field_name = _camel_to_snake(field_name)
+    direction = direction.lower()
+    if direction not in ["asc", "desc"]:
+        raise ValueError(f"Unsupported sorting direction: {direction}")
+
+    statement, column = _resolve_sort_column(model, statement, field_name)
+    if column is None:
+        # Unknown fields are ignored like in evaluate_sqlalchemy_sorting
+        column = id_column
+
+    if cursor:
+        cursor_field, value, last_id = decode_cursor(cursor)
+        if cursor_field != field_name:
+            raise ValueError("Cursor does not match the sort field")
+        statement = statement.where(
+            _seek_predicate(
+                column, id_column, direction, _cursor_value(column, value), _cursor_value(id_column, last_id)
+            )
+        )
+
+    if direction == "asc":
+        statement = statement.order_by(column.asc(), id_column.asc())
+    else:
+        statement = statement.order_by(column.desc(), id_column.desc())
+
+    return statement.add_columns(column.label("keyset_value")).limit(limit + 1)
+
+
+def keyset_page(
+    rows: Sequence[Any], sort: tuple[str, str] | None = None, limit: int = 100
+) -> tuple[list[Any], str | None]:
+    """
+    Split the rows of a statement built by evaluate_sqlalchemy_keyset_pagination into the page
+    entities and the cursor of the next page, None on the last page.
+    """
+    limit = _keyset_limit(limit)
+    entities = [row[0] for row in rows[:limit]]
+    if len(rows) <= limit:
+        return entities, None
+
+    last_row = rows[limit - 1]
+    field_name = _camel_to_snake(sort[0]) if sort else "id"
+    return entities, encode_cursor([field_name, last_row[-1], inspect(last_row[0]).identity[0]])
+
+
+def evaluate_sqlalchemy_filters(
+    model: type,
+    statement: Select[Any],
+    body: dict[str, Any] | None,
+    access_filter: ColumnElement[bool] | None = None,
+) -> Select[Any]:
     """
     Converts a generic API filter dict with operators into SQLAlchemy filters.
     Supports nested relationship filtering using double underscore notation.
     Example: template__name__in will filter by the template's name field using has() for relationships.
+    access_filter restricts the rows to the ones visible to a user, see core.permissions.functions.build_access_filter.
     """
     filters: list[BinaryExpression[Any] | ColumnElement[Any]] = []
 
+    if access_filter is not None:
+        statement = statement.where(access_filter)
+
     if body is None:
         return statement
 
@@ -305,6 +483,65 @@ def evaluate_sqlalchemy_filters(model: type, statement: Select[Any], body: dict[
     return statement
 
 
+# Approximate counts below this many rows are replaced by an exact count
+APPROXIMATE_COUNT_EXACT_THRESHOLD = 10_000
+
+
+def _plan_rows(plan: Any) -> int:
+    # EXPLAIN (FORMAT JSON) returns a one element list, drivers may hand it over as text
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, its parameters stay bound and are sent by the driver."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select[Any]) -> None:
+        self.statement: Select[Any] = statement
+
+
+@compiles(_Explain)
+def _compile_explain(element: _Explain, compiler: Any, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def approximate_count(
+    session: AsyncSession,
+    model: type,
+    filter: dict[str, Any] | None = None,
+    exact_threshold: int = APPROXIMATE_COUNT_EXACT_THRESHOLD,
+) -> tuple[int, bool]:
+    """
+    Estimate the number of rows matching the filter without scanning them.
+    Uses pg_class.reltuples without a filter and the planner estimate with one. Small estimates,
+    tables never analyzed and filters that cannot be explained fall back to an exact count.
+    :return: the count and whether it is exact
+    """
+    estimate: int | None = None
+    if not filter:
+        reltuples = await session.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+            {"table": model.__table__.fullname},
+        )
+        # -1 until the table is vacuumed or analyzed for the first time
+        estimate = reltuples if reltuples is not None and reltuples >= 0 else None
+    else:
+        statement = evaluate_sqlalchemy_filters(model, select(literal_column("1")).select_from(model), filter)
+        try:
+            estimate = _plan_rows(await session.scalar(_Explain(statement)))
+        except CompileError:
+            estimate = None
+
+    if estimate is not None and estimate >= exact_threshold:
+        return estimate, False
+
+    statement = evaluate_sqlalchemy_filters(model, select(func.count()).select_from(model), filter)
+    return await session.scalar(statement) or 0, True
+
+
 _CAMEL_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
 
 # Recursive field specification: keys are field names, values are nested specs or None for leaf fields.
@@ -321,14 +558,21 @@ def build_load_only(model: type, fields: set[str]) -> list[Any]:
     """Build load_only() option to SELECT only the SQL columns matching requested fields.
 
     Accepts both camelCase (GraphQL) and snake_case (Python) field names.
+    Requested relationships also load their foreign key columns, so they can be loaded by key later.
     """
     mapper = inspect(model)
     column_keys = {c.key for c in mapper.column_attrs}
+    relationships = mapper.relationships
+    column_names = {column: key for key, column in mapper.columns.items()}
     requested = set()
     for field in fields:
         snake = _camel_to_snake(field)
         if snake in column_keys:
             requested.add(snake)
+        elif snake in relationships:
+            for column in relationships[snake].local_columns:
+                if column_names.get(column) in column_keys:
+                    requested.add(column_names[column])
     if not requested or len(requested) >= len(column_keys) - 1:
         return []
     return [load_only(*[getattr(model, c) for c in requested])]
@@ -1,5 +1,5 @@
 import asyncio
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager, suppress
 from starlette.requests import HTTPConnection
 from sqlalchemy.exc import DBAPIError
@@ -17,6 +17,11 @@ def _get_graphql_session_lock(connection: HTTPConnection) -> asyncio.Lock | None
     return None
 
 
+def get_db_session_factory() -> Callable[[], AsyncSession]:
+    """Factory of the request sessions, GraphQL query reads open their pooled sessions from it."""
+    return SessionLocal
+
+
 async def get_db_session(connection: HTTPConnection) -> AsyncGenerator[AsyncSession]:
     """Yield a DB session that auto-commits, then flushes pending events.
     This guarantees RabbitMQ consumers always see committed data.
@@ -6,9 +6,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import (
     FieldSpec,
+    approximate_count,
     evaluate_sqlalchemy_filters,
+    evaluate_sqlalchemy_keyset_pagination,
     evaluate_sqlalchemy_pagination,
     evaluate_sqlalchemy_sorting,
+    keyset_page,
 )
 from core.utils.model_tools import is_valid_uuid
 
@@ -49,12 +52,32 @@ class LogCRUD:
         result = await self.session.execute(statement)
         return list(result.scalars().all())
 
+    async def get_page(
+        self,
+        filter: dict[str, Any] | None = None,
+        sort: tuple[str, str] | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+        fields: FieldSpec | None = None,
+    ) -> tuple[list[Log], str | None]:
+        """Return a page of Log rows after the cursor and the cursor of the next page."""
+        statement = select(Log)
+        statement = evaluate_sqlalchemy_filters(Log, statement, filter)
+        statement = evaluate_sqlalchemy_keyset_pagination(Log, statement, sort, cursor, limit)
+        statement = statement.options(*build_log_query_options(fields))
+
+        result = await self.session.execute(statement)
+        return keyset_page(result.all(), sort, limit)
+
     async def count(self, filter: dict[str, Any] | None = None) -> int:
         statement = select(func.count()).select_from(Log)
         statement = evaluate_sqlalchemy_filters(Log, statement, filter)
         result = await self.session.execute(statement)
         return result.scalar_one() or 0
 
+    async def approximate_count(self, filter: dict[str, Any] | None = None) -> tuple[int, bool]:
+        return await approximate_count(self.session, Log, filter)
+
     async def delete_by_entity_id(self, entity_id: str) -> None:
         statement = select(Log).where(Log.entity_id == entity_id)
         result = await self.session.execute(statement)
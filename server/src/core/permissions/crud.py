@@ -4,6 +4,7 @@ from uuid import UUID
 from sqlalchemy import ColumnElement, func, select, cast, String
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.casbin.enforcer import record_policy_change
 from core.users.model import User
 from core.utils.model_tools import is_valid_uuid
 from core.database import (
@@ -71,6 +72,7 @@ class PermissionCRUD:
         permission = Permission(**body)
         self.session.add(permission)
         await self.session.flush()
+        record_policy_change(permission)
         return permission
 
     async def delete_entity_permissions(self, entity_name: str, entity_id: str | UUID) -> None:
@@ -85,9 +87,11 @@ class PermissionCRUD:
 
         for permission in permissions:
             await self.session.delete(permission)
+            record_policy_change(permission)
 
     async def delete(self, permission: Permission) -> None:
         await self.session.delete(permission)
+        record_policy_change(permission)
 
     async def get_all_roles(
         self,
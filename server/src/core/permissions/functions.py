@@ -1,7 +1,22 @@
+from typing import Any
+
+from sqlalchemy import ColumnElement, String, and_, cast, exists, func, literal, or_
+
+from core.casbin.enforcer import CasbinEnforcer
 from core.constants.model import ModelActions
+from core.errors import AccessDenied
 from core.users.functions import user_api_permission
 from core.users.model import UserDTO
 
+from .model import Permission
+
+# Policy actions that grant the requested access level
+ACCESS_ACTIONS = {
+    "read": ["read", "write", "admin"],
+    "write": ["write", "admin"],
+    "admin": ["admin"],
+}
+
 
 async def get_permission_actions(requester: UserDTO) -> list[str]:
     apis = await user_api_permission(requester, "permission")
@@ -13,3 +28,51 @@ async def get_permission_actions(requester: UserDTO) -> list[str]:
         return []
 
     return [ModelActions.EDIT, ModelActions.DELETE]
+
+
+def _policy_object_matches(obj: ColumnElement[Any]) -> ColumnElement[bool]:
+    # SQL version of casbin keyMatch: exact object or prefix before the first "*"
+    return or_(
+        Permission.v1 == obj,
+        and_(Permission.v1.contains("*"), func.starts_with(obj, func.split_part(Permission.v1, "*", 1))),
+    )
+
+
+async def build_access_filter(
+    user: UserDTO,
+    entity_name: str,
+    id_column: Any,
+    project_id_column: Any | None = None,
+    action: str = "read",
+) -> ColumnElement[bool]:
+    """
+    Build an EXISTS predicate on the permissions table selecting the rows the user has access to.
+    The user's implicit roles are resolved once, policies on the entity itself or on its project
+    (when project_id_column is given) grant access.
+    :param id_column: column with the entity id, e.g. Resource.id
+    :param project_id_column: column with the project id of the entity, e.g. Resource.project_id
+    :return: predicate for evaluate_sqlalchemy_filters
+    """
+    user_id = user.id
+    if user.primary_account:
+        user_id = user.primary_account[0].id if user.primary_account else user.id
+    if user.deactivated is True:
+        raise AccessDenied("User account is deactivated")
+    if user.primary_account:
+        if user.primary_account[0].deactivated is True:
+            raise AccessDenied("Primary account is deactivated")
+
+    enforcer = await CasbinEnforcer().get_enforcer()
+    subject = f"user:{user_id}"
+    subjects = [subject, *await enforcer.get_implicit_roles_for_user(subject)]
+
+    objects = [literal(f"{entity_name}:") + cast(id_column, String)]
+    if project_id_column is not None:
+        objects.append(literal("project:") + cast(project_id_column, String))
+
+    return exists().where(
+        Permission.ptype == "p",
+        Permission.v0.in_(subjects),
+        Permission.v2.in_(ACCESS_ACTIONS[action]),
+        or_(*[_policy_object_matches(obj) for obj in objects]),
+    )
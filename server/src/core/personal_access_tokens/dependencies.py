@@ -2,6 +2,7 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.dependencies import get_db_session
+from core.utils.event_sender import EventSender
 
 from .crud import PersonalAccessTokenCRUD
 from .service import PersonalAccessTokenService
@@ -10,4 +11,7 @@ from .service import PersonalAccessTokenService
 def get_personal_access_token_service(
     session: AsyncSession = Depends(get_db_session),
 ) -> PersonalAccessTokenService:
-    return PersonalAccessTokenService(crud=PersonalAccessTokenCRUD(session=session))
+    return PersonalAccessTokenService(
+        crud=PersonalAccessTokenCRUD(session=session),
+        event_sender=EventSender(entity_name="personal_access_token"),
+    )
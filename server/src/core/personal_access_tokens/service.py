@@ -4,6 +4,7 @@ import uuid
 from uuid import UUID
 
 from core.models.encrypted_secret import EncryptedSecretStr
+from core.utils.event_sender import EventSender
 from core.utils.password_manager import hash_new_password, is_correct_password
 
 from .crud import PersonalAccessTokenCRUD
@@ -16,8 +17,9 @@ from .schema import (
 
 
 class PersonalAccessTokenService:
-    def __init__(self, crud: PersonalAccessTokenCRUD):
+    def __init__(self, crud: PersonalAccessTokenCRUD, event_sender: EventSender):
         self.crud = crud
+        self.event_sender: EventSender = event_sender
 
     async def list_tokens(self, user_id: str | UUID) -> list[PersonalAccessToken]:
         tokens = await self.crud.get_all(filter={"user_id": user_id}, sort=("created_at", "desc"))
@@ -54,6 +56,8 @@ class PersonalAccessTokenService:
             raise ValueError("Personal access token not found")
 
         await self.crud.delete(token)
+        # Every process drops the token from its authentication cache, see core.sso.token_cache
+        await self.event_sender.send_reload_event("reload_personal_access_tokens", {"token_id": str(token.id)})
 
     async def get_valid_token(self, raw_token: str) -> PersonalAccessTokenDTO | None:
         token_id = get_token_lookup_id(raw_token)
@@ -1,15 +1,28 @@
+import asyncio
 import logging
 import os
+import time
+from collections.abc import Callable, Sequence
 from typing import Self
 
-from aio_pika import DeliveryMode, Message, connect_robust
+from aio_pika import DeliveryMode, ExchangeType, Message, connect_robust
 from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractExchange
 from pamqp.commands import Basic
+from prometheus_client import Histogram
 
 from .base_models import MessageModel
 
 logger = logging.getLogger("rabbitmq_core")
 
+# Number of channels used for publishing, separate from the consumer channel
+PUBLISHER_CHANNELS = 4
+
+publish_latency = Histogram(
+    "rabbitmq_publish_latency_seconds",
+    "Time from publishing a message until the broker confirmed it",
+    ["exchange"],
+)
+
 
 class RabbitMQConnection:
     """
@@ -30,12 +43,21 @@ class RabbitMQConnection:
         is_connected(): Checks if the RabbitMQ connection is established.
         close(): Closes the RabbitMQ connection.
         get_channel(): Returns a channel from the RabbitMQ connection.
+        get_publisher_channel(): Returns a publisher channel from the pool.
+        publish_many(): Publishes messages and awaits their confirms together.
 
     """
 
     _instance: Self | None = None
     connection: AbstractConnection | None = None
     channel: AbstractChannel | None = None
+    # Publisher channels by pool slot
+    publisher_channels: dict[int, AbstractChannel] = {}
+    _next_publisher_channel: int = 0
+    # Serializes opening and replacing publisher channels
+    _publisher_channel_lock: asyncio.Lock = asyncio.Lock()
+    # Declared exchanges by id of the publisher channel and name, so a publish does not re-declare them
+    _exchanges: dict[tuple[int, str], AbstractExchange] = {}
 
     def __new__(cls):
         if not cls._instance:
@@ -80,6 +102,9 @@ class RabbitMQConnection:
             assert self.connection is not None
             await self.connection.close()
             self.connection = None
+            self.channel = None
+            self.publisher_channels = {}
+            self._exchanges = {}
 
     async def get_channel(self):
         """
@@ -100,12 +125,19 @@ class RabbitMQConnection:
         return None
 
     @staticmethod
-    async def publish_and_handle_confirm(exchange: AbstractExchange, routing_key, message_body, confirm: bool = False):
+    async def publish_and_handle_confirm(
+        exchange: AbstractExchange,
+        routing_key,
+        message_body,
+        confirm: bool = False,
+        priority: int | None = None,
+    ):
         confirmation = await exchange.publish(
             Message(
                 message_body,
                 content_type="json",
                 delivery_mode=DeliveryMode.PERSISTENT,
+                priority=priority,
             ),
             routing_key=routing_key,
         )
@@ -113,25 +145,85 @@ class RabbitMQConnection:
         if confirm and not isinstance(confirmation, Basic.Ack):
             logger.error(f"Message to '{routing_key}' was not acknowledged by broker!")
 
+    async def get_publisher_channel(self) -> AbstractChannel:
+        """
+        Returns a channel with publisher confirms from a small round-robin pool.
+
+        Returns:
+            Channel: A publisher channel of the RabbitMQ connection.
+
+        """
+        if not self.is_connected():
+            raise RuntimeError("Failed to get a valid RabbitMQ channel")
+        assert self.connection is not None
+        connection = self.connection
+
+        index = self._next_publisher_channel % PUBLISHER_CHANNELS
+        self._next_publisher_channel = index + 1
+        channel = self.publisher_channels.get(index)
+        if channel is not None and not channel.is_closed:
+            return channel
+
+        async with self._publisher_channel_lock:
+            # Opened by a concurrent call while waiting for the lock
+            channel = self.publisher_channels.get(index)
+            if channel is not None and not channel.is_closed:
+                return channel
+            if channel is not None:
+                self._exchanges = {key: value for key, value in self._exchanges.items() if key[0] != id(channel)}
+
+            channel = await connection.channel(publisher_confirms=True)
+            self.publisher_channels[index] = channel
+            return channel
+
+    async def get_exchange(self, channel: AbstractChannel, name: str, exchange_type: ExchangeType) -> AbstractExchange:
+        """
+        Returns the exchange declared on the given publisher channel, declaring it on first use.
+
+        """
+        key = (id(channel), name)
+        exchange = self._exchanges.get(key)
+        if exchange is None:
+            exchange = await channel.declare_exchange(name, exchange_type, durable=True, auto_delete=False)
+            self._exchanges[key] = exchange
+        return exchange
+
     @staticmethod
     async def send_message(message: MessageModel, confirm: bool = False):
+        await RabbitMQConnection.publish_many([message], confirm=confirm)
+
+    @staticmethod
+    async def publish_many(messages: Sequence[MessageModel], confirm: bool | Callable[[MessageModel], bool] = False):
+        """
+        Publishes messages on one publisher channel without waiting for each confirm in turn.
+
+        Messages are written to the channel in order and all broker confirms are awaited together.
+        ``confirm`` applies to every message, or is called with each message to decide.
+
+        """
+        if not messages:
+            return
+
         async with RabbitMQConnection() as connection:
-            channel = await connection.get_channel()
-            if channel is None:
-                raise RuntimeError("Failed to get a valid RabbitMQ channel")
-            if not message.exchange:
-                raise ValueError("Exchange is required")
-
-            exchange = await channel.declare_exchange(
-                message.exchange,
-                message.exchange_type,
-                durable=True,
-                auto_delete=False,
-            )
-
-            await RabbitMQConnection.publish_and_handle_confirm(
-                exchange,
-                message.routing_key,
-                message.to_bytes(),
-                confirm=confirm,
-            )
+            channel = await connection.get_publisher_channel()
+            publishes = []
+            for message in messages:
+                if not message.exchange:
+                    raise ValueError("Exchange is required")
+                exchange = await connection.get_exchange(channel, message.exchange, message.exchange_type)
+                message_confirm = confirm(message) if callable(confirm) else confirm
+                publishes.append(RabbitMQConnection._timed_publish(exchange, message, message_confirm))
+
+            await asyncio.gather(*publishes)
+
+    @staticmethod
+    async def _timed_publish(exchange: AbstractExchange, message: MessageModel, confirm: bool):
+        started = time.perf_counter()
+        await RabbitMQConnection.publish_and_handle_confirm(
+            exchange,
+            message.routing_key,
+            message.to_bytes(),
+            confirm=confirm,
+            priority=message.priority,
+        )
+        publish_latency.labels(exchange.name).observe(time.perf_counter() - started)
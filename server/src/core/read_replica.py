@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import HTTPConnection
+from starlette.responses import Response
+
+from core.config import Settings
+from core.database import ReplicaSessionLocal, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+REPLICA_LAG_CHECK_INTERVAL = 15  # seconds
+
+replica_lag_gauge = Gauge("database_replica_lag_seconds", "Replication lag of the read replica")
+read_routing_counter = Counter("database_read_routing_total", "GraphQL query reads by database", ["target"])
+
+# No lag while the replica has replayed everything it received, otherwise the age of the last replayed transaction
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+# Last known replica lag, None until it is measured
+_replica_lag: float | None = None
+
+# Unix time of the client's last mutation, sent back with its next requests to whichever process serves them
+READ_YOUR_WRITES_COOKIE = "ik_last_write"
+
+
+def record_write(response: Response) -> None:
+    """Remember a mutation on the client so its next reads see it, see READ_YOUR_WRITES_SECONDS."""
+    window = Settings().READ_YOUR_WRITES_SECONDS
+    if window <= 0 or ReplicaSessionLocal is None:
+        return
+
+    response.set_cookie(READ_YOUR_WRITES_COOKIE, str(time.time()), max_age=window, httponly=True, samesite="lax")
+
+
+def _wrote_recently(connection: HTTPConnection | None) -> bool:
+    if connection is None:
+        return False
+    try:
+        written_at = float(connection.cookies.get(READ_YOUR_WRITES_COOKIE, ""))
+    except ValueError:
+        return False
+    return time.time() - written_at <= Settings().READ_YOUR_WRITES_SECONDS
+
+
+def read_sessionmaker(connection: HTTPConnection | None = None) -> Callable[[], AsyncSession]:
+    """
+    Session factory for the reads of a GraphQL query.
+    Uses the replica unless none is configured, it lags too much or the client has just written.
+    """
+    if (
+        ReplicaSessionLocal is None
+        or _replica_lag is None
+        or _replica_lag > Settings().REPLICA_MAX_LAG_SECONDS
+        or _wrote_recently(connection)
+    ):
+        read_routing_counter.labels("primary").inc()
+        return SessionLocal
+
+    read_routing_counter.labels("replica").inc()
+    return ReplicaSessionLocal
+
+
+async def measure_replica_lag() -> float | None:
+    global _replica_lag
+    if ReplicaSessionLocal is None:
+        return None
+
+    try:
+        async with ReplicaSessionLocal() as session:
+            lag = await session.scalar(REPLICA_LAG_QUERY)
+    except Exception as e:
+        logger.warning(f"Could not measure replica lag: {e}")
+        lag = None
+
+    # Not in recovery or unreachable, keep the reads on the primary
+    _replica_lag = float(lag) if lag is not None else None
+    if _replica_lag is not None:
+        replica_lag_gauge.set(_replica_lag)
+    return _replica_lag
+
+
+async def monitor_replica_lag(interval: float = REPLICA_LAG_CHECK_INTERVAL) -> None:
+    """Refresh the replica lag until cancelled, reads stay on the primary until the first check succeeds."""
+    while True:
+        _ = await measure_replica_lag()
+        await asyncio.sleep(interval)
@@ -2,13 +2,13 @@ from datetime import datetime
 import json
 import logging
 import re
+import time
 from typing import Any
 
 import httpx
 import jwt
 from fastapi import Depends, HTTPException, Request, Security
 from fastapi.security import APIKeyCookie, HTTPAuthorizationCredentials, HTTPBearer
-from jwt.algorithms import ECAlgorithm
 from sqlalchemy.exc import IntegrityError
 
 from core.casbin.enforcer import CasbinEnforcer
@@ -18,6 +18,7 @@ from core.errors import AccessUnauthorized, EntityExistsError
 from core.permissions.dependencies import get_permission_service
 from core.sso.dependencies import get_sso_service
 from core.sso.service import SSOService
+from core.sso.token_cache import JwksCache, auth_duration, personal_access_token_cache
 from core.users.dependencies import get_user_service
 from core.users.functions import user_has_access_to_api
 from core.users.schema import UserCreateWithProvider, UserResponse
@@ -112,6 +113,9 @@ async def get_jwks(jwks_url) -> list[dict[str, Any]]:
         return []
 
 
+jwks_cache = JwksCache(get_jwks)
+
+
 def validate_token(token: str, alg: str, audience: str) -> dict[str, Any]:
     JWT_KEY = Settings().JWT_KEY
     assert JWT_KEY is not None, "JWT_KEY is not set"
@@ -159,17 +163,14 @@ async def get_decoded_token(
         if not isinstance(backstage_provider.configuration, BackstageProviderConfig):
             raise AccessUnauthorized("Backstage authentication provider configuration is invalid")
         jwks_url = backstage_provider.configuration.backstage_jwks_url
-        jwks_keys = await get_jwks(jwks_url)
         header = jwt.get_unverified_header(token)
         kid = header.get("kid")
         if not kid:
             raise jwt.exceptions.InvalidKeyError("JWKS can not be applied while key does not have kid")
 
-        public_keys = {}
-        for jwk in jwks_keys:
-            jkid = jwk["kid"]
-            public_keys[jkid] = ECAlgorithm(ECAlgorithm.SHA256).from_jwk(jwk)
-        key = public_keys[kid]
+        key = await jwks_cache.get_key(jwks_url, kid) if jwks_url else None
+        if key is None:
+            raise jwt.exceptions.InvalidKeyError(f"Key {kid} not found in JWKS")
         try:
             return jwt.decode(token, algorithms=[alg], key=key, audience=audience)  # type: ignore [arg-type]
         except Exception as error:
@@ -205,17 +206,45 @@ async def get_user_from_token(service: SSOService, token: str | None = Security(
     if token is None:
         raise AccessUnauthorized("Invalid authentication credentials")
 
+    start = time.perf_counter()
+    try:
+        return await _get_user_from_token(service, token)
+    finally:
+        auth_duration.labels(_token_type_label(token)).observe(time.perf_counter() - start)
+
+
+def _token_type_label(token: str) -> str:
     if token.startswith("ik_"):
-        personal_token = await service.personal_access_token_service.get_valid_token(token)
-        if personal_token is None:
-            raise AccessUnauthorized("Invalid authentication credentials")
+        return "personal_access_token"
+    try:
+        token_type = jwt.get_unverified_header(token).get("typ")
+    except Exception:
+        token_type = None
+    # Keep the label values bounded whatever the header says
+    return token_type if token_type in ("infrakitchen.auth.token", "vnd.backstage.user") else "invalid"
 
-        user = await service.user_service.get_dto_by_id(personal_token.user_id)
-        if user is None:
-            raise AccessUnauthorized("Invalid authentication credentials")
 
+async def get_user_from_personal_access_token(service: SSOService, token: str) -> UserDTO:
+    user = personal_access_token_cache.get(token)
+    if user is not None:
         return user
 
+    personal_token = await service.personal_access_token_service.get_valid_token(token)
+    if personal_token is None:
+        raise AccessUnauthorized("Invalid authentication credentials")
+
+    user = await service.user_service.get_dto_by_id(personal_token.user_id)
+    if user is None:
+        raise AccessUnauthorized("Invalid authentication credentials")
+
+    personal_access_token_cache.set(token, personal_token.id, user, personal_token.expires_at)
+    return user
+
+
+async def _get_user_from_token(service: SSOService, token: str) -> UserDTO:
+    if token.startswith("ik_"):
+        return await get_user_from_personal_access_token(service, token)
+
     try:
         # get audience of token to choose the right validation
         token_headers = jwt.get_unverified_header(token)
@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from jwt.algorithms import ECAlgorithm
+from prometheus_client import Counter, Histogram
+
+from core.config import Settings
+from core.users.model import UserDTO
+
+logger = logging.getLogger(__name__)
+
+auth_duration = Histogram("auth_token_verification_seconds", "Time to authenticate a request token", ["token_type"])
+auth_cache_counter = Counter("auth_cache_total", "Authentication cache lookups", ["cache", "result"])
+
+
+@dataclass
+class _JwksEntry:
+    keys: dict[str, Any] = field(default_factory=dict)
+    fetched_at: float = float("-inf")  # monotonic time
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class JwksCache:
+    """
+    Public keys of JWKS endpoints by URL and key id.
+    Keys are fetched again after JWKS_CACHE_TTL seconds, or earlier when a token names an unknown key id,
+    at most once every JWKS_MIN_REFRESH_SECONDS so tokens with made-up key ids cannot hammer the endpoint.
+    """
+
+    def __init__(self, fetch: Callable[[str], Awaitable[list[dict[str, Any]]]]):
+        self._fetch: Callable[[str], Awaitable[list[dict[str, Any]]]] = fetch
+        self._entries: dict[str, _JwksEntry] = {}
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_key(self, jwks_url: str, kid: str) -> Any | None:
+        entry = self._entries.setdefault(jwks_url, _JwksEntry())
+        settings = Settings()
+        age = time.monotonic() - entry.fetched_at
+        if kid in entry.keys and age < settings.JWKS_CACHE_TTL:
+            auth_cache_counter.labels("jwks", "hit").inc()
+            return entry.keys[kid]
+
+        auth_cache_counter.labels("jwks", "miss").inc()
+        async with entry.lock:
+            # Another request may have refreshed the keys while this one waited
+            age = time.monotonic() - entry.fetched_at
+            if kid not in entry.keys or age >= settings.JWKS_CACHE_TTL:
+                if age >= settings.JWKS_MIN_REFRESH_SECONDS:
+                    await self._refresh(jwks_url, entry)
+                else:
+                    logger.debug(f"Not refreshing JWKS of {jwks_url} for key {kid}, refreshed {age:.0f}s ago")
+        return entry.keys.get(kid)
+
+    async def _refresh(self, jwks_url: str, entry: _JwksEntry) -> None:
+        entry.fetched_at = time.monotonic()
+        jwks_keys = await self._fetch(jwks_url)
+        if not jwks_keys and entry.keys:
+            # Keep serving the known keys while the endpoint is failing
+            logger.warning(f"JWKS endpoint {jwks_url} returned no keys, keeping the cached ones")
+            return
+
+        entry.keys = {jwk["kid"]: ECAlgorithm(ECAlgorithm.SHA256).from_jwk(jwk) for jwk in jwks_keys if "kid" in jwk}
+
+
+@dataclass
+class _PersonalAccessTokenEntry:
+    token_id: UUID
+    user: UserDTO
+    expire_at: float  # monotonic time
+
+
+class PersonalAccessTokenCache:
+    """
+    Users of recently verified personal access tokens, by hash of the raw token.
+    Entries live PERSONAL_ACCESS_TOKEN_CACHE_TTL seconds at most and are dropped when the token is deleted
+    or its user changes.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries: int = max_entries
+        self._entries: OrderedDict[str, _PersonalAccessTokenEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(raw_token: str) -> str:
+        return hashlib.sha256(raw_token.encode()).hexdigest()
+
+    def get(self, raw_token: str) -> UserDTO | None:
+        key = self._key(raw_token)
+        entry = self._entries.get(key)
+        if entry is None or entry.expire_at <= time.monotonic():
+            _ = self._entries.pop(key, None)
+            auth_cache_counter.labels("personal_access_token", "miss").inc()
+            return None
+
+        self._entries.move_to_end(key)
+        auth_cache_counter.labels("personal_access_token", "hit").inc()
+        return entry.user
+
+    def set(self, raw_token: str, token_id: UUID, user: UserDTO, expires_at: datetime | None = None) -> None:
+        ttl = Settings().PERSONAL_ACCESS_TOKEN_CACHE_TTL
+        if ttl <= 0:
+            return
+        if expires_at is not None:
+            # Do not accept the token after it expires
+            ttl = min(ttl, expires_at.timestamp() - time.time())
+
+        key = self._key(raw_token)
+        self._entries[key] = _PersonalAccessTokenEntry(token_id=token_id, user=user, expire_at=time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            _ = self._entries.popitem(last=False)
+
+    def invalidate(self, token_id: UUID | str) -> None:
+        for key, entry in list(self._entries.items()):
+            if str(entry.token_id) == str(token_id):
+                del self._entries[key]
+
+    def invalidate_user(self, user_id: UUID | str) -> None:
+        """Drop the tokens of the user, and of its secondary accounts which act as the user."""
+        for key, entry in list(self._entries.items()):
+            user_ids = {str(entry.user.id)} | {str(account.id) for account in entry.user.primary_account}
+            if str(user_id) in user_ids:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+personal_access_token_cache = PersonalAccessTokenCache()
+
+
+def invalidate_personal_access_token(message: dict[str, Any]) -> None:
+    """
+    Apply a ``reload_personal_access_tokens`` event of the ``ik_event_messages`` fanout.
+    The event carries no body, only the id of the deleted token or of the changed user in its metadata.
+    """
+    metadata = message.get("_metadata", {})
+    if metadata.get("event") != "reload_personal_access_tokens":
+        return
+
+    if metadata.get("token_id") is not None:
+        personal_access_token_cache.invalidate(metadata["token_id"])
+    elif metadata.get("user_id") is not None:
+        personal_access_token_cache.invalidate_user(metadata["user_id"])
+    else:
+        personal_access_token_cache.clear()
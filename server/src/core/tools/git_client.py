@@ -1,8 +1,12 @@
+import asyncio
 import logging
+import os
 import re
 import shutil
-from typing import Any
+from typing import Any, NamedTuple
 
+from core.errors import ShellExecutionError
+from core.tools.git_mirror_cache import get_git_mirror_cache
 from core.tools.shell_client import ShellScriptClient
 
 logger = logging.getLogger(__name__)
@@ -15,6 +19,15 @@ _GIT_REF_RE = re.compile(r"^[A-Za-z0-9_./\-]+$")
 _GIT_PATH_RE = re.compile(r"^[A-Za-z0-9_./\-]+$")
 
 
+# Local refs the refs fetched by `fetch_refs` are stored under
+_FETCHED_REFS_PREFIX = "refs/infrakitchen/fetched/"
+
+
+class GitBlob(NamedTuple):
+    sha: str
+    content: str
+
+
 def _validate_git_ref(ref: str) -> None:
     if not ref or ref.startswith("-") or ".." in ref.split("/") or not _GIT_REF_RE.match(ref):
         raise ValueError(f"invalid git ref: {ref!r}")
@@ -47,12 +60,60 @@ class GitClient:
         shell_client.logger = self.logger
         return await shell_client.run_shell_command()
 
-    async def clone(self):
+    async def _clone_from_mirror(self, clone_args: list[str]) -> bool:
+        """
+        Clone the repository from the worker's mirror, see core.tools.git_mirror_cache.
+        origin still points to the remote. Returns False when the mirror cannot be used.
+        """
+        mirror_cache = get_git_mirror_cache()
+        if mirror_cache is None:
+            return False
+
+        try:
+            async with mirror_cache.mirror(self.git_url, self._run_git_command) as mirror_path:
+                _ = await self._run_git_command(
+                    ["clone", "-q", *clone_args, mirror_path, self.destination_dir], self.workspace_path
+                )
+            _ = await self._run_git_command(["remote", "set-url", "origin", self.git_url], self.destination_dir)
+        except Exception as e:
+            self.logger.warning(f"Cannot clone from the git mirror cache, cloning from the remote: {e}")
+            shutil.rmtree(self.destination_dir, ignore_errors=True)
+            return False
+        return True
+
+    async def _read_git_output(self, command_args: list[str], input: str | None = None) -> str:
+        """
+        Run a local git command and return its output without logging it line by line,
+        for commands listing whole trees. ``input`` is written to the command's stdin.
+        """
+        return (await self._read_git_bytes(command_args, input)).decode()
+
+    async def _read_git_bytes(self, command_args: list[str], input: str | None = None) -> bytes:
+        process = await asyncio.create_subprocess_exec(
+            "git",
+            *command_args,
+            stdin=asyncio.subprocess.PIPE if input is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.destination_dir,
+            env={**self.environment_variables, "PATH": os.getenv("PATH", "")},
+        )
+        stdout, stderr = await process.communicate(input.encode() if input is not None else None)
+        if process.returncode != 0:
+            self.logger.error(stderr.decode().strip())
+            raise ShellExecutionError(f"Command 'git {command_args[0]}' failed with exit code {process.returncode}.")
+        return stdout
+
+    async def clone(self, no_checkout: bool = False):
         """
         Clone the whole repository to the destination directory.
+        :param no_checkout: Do not write the working tree, when refs are only read from the object database.
         """
         self.logger.info(f"Cloning repository to {self.destination_dir}")
-        _ = await self._run_git_command(f"clone {self.git_url} {self.destination_dir}", self.workspace_path)
+        clone_args = ["--no-checkout"] if no_checkout else []
+        if await self._clone_from_mirror(clone_args):
+            return
+        _ = await self._run_git_command(["clone", *clone_args, self.git_url, self.destination_dir], self.workspace_path)
 
     async def clone_branch(self, branch: str):
         """
@@ -67,6 +128,8 @@ class GitClient:
         elif branch.startswith("refs/tags/"):
             branch = branch.removeprefix("refs/tags/")
 
+        if await self._clone_from_mirror(["--single-branch", "--branch", branch]):
+            return
         command_args = f"clone -q --depth 1 --single-branch --branch {branch} {self.git_url} {self.destination_dir}"
         _ = await self._run_git_command(command_args, self.workspace_path)
 
@@ -83,6 +146,28 @@ class GitClient:
         sha = await self._run_git_command(["rev-parse", "FETCH_HEAD"], self.destination_dir)
         return sha.strip()
 
+    async def fetch_refs(self, refs: list[str]) -> dict[str, str]:
+        """Fetch refs into the existing (shallow) clone with a single `git fetch` and return their commit SHAs.
+
+        Concurrent fetches into one clone race on its shallow file and
+        FETCH_HEAD, every ref is fetched to its own local ref in one
+        negotiation with the remote instead.
+
+        Raises if any of the refs can't be fetched (missing, no auth, etc.).
+        """
+        refs = list(dict.fromkeys(refs))
+        for ref in refs:
+            _validate_git_ref(ref)
+        if not refs:
+            return {}
+
+        self.logger.info(f"Fetching refs {', '.join(refs)} into {self.destination_dir}")
+        local_refs = [f"{_FETCHED_REFS_PREFIX}{i}" for i in range(len(refs))]
+        refspecs = [f"+{ref}:{local_ref}" for ref, local_ref in zip(refs, local_refs, strict=True)]
+        _ = await self._run_git_command(["fetch", "--depth", "1", "origin", *refspecs], self.destination_dir)
+        output = await self._read_git_output(["rev-parse", *(f"{local_ref}^{{commit}}" for local_ref in local_refs)])
+        return dict(zip(refs, output.split(), strict=True))
+
     async def list_files_at_ref(self, ref: str, subpath: str) -> list[str]:
         """List file paths at <ref>:<subpath>, returned as paths from repo root."""
         _validate_git_ref(ref)
@@ -96,6 +181,48 @@ class GitClient:
         _validate_git_path(path)
         return await self._run_git_command(["show", f"{ref}:{path}"], self.destination_dir)
 
+    async def read_blobs_at_ref(self, ref: str, paths: list[str]) -> dict[str, GitBlob]:
+        """Return the files at <ref>:<path> read through a single `git cat-file --batch`, by path."""
+        _validate_git_ref(ref)
+        for path in paths:
+            _validate_git_path(path)
+        if not paths:
+            return {}
+
+        output = await self._read_git_bytes(["cat-file", "--batch"], input="".join(f"{ref}:{path}\n" for path in paths))
+        blobs: dict[str, GitBlob] = {}
+        offset = 0
+        for path in paths:
+            # Every object is "<sha> <type> <size>\n<content>\n", or "<object> missing\n"
+            header_end = output.index(b"\n", offset)
+            header = output[offset:header_end].decode().split()
+            if len(header) != 3 or header[1] != "blob":
+                raise ShellExecutionError(f"Cannot read {ref}:{path}: {' '.join(header)}")
+            sha, _, size = header
+            offset = header_end + 1
+            blobs[path] = GitBlob(sha, output[offset : offset + int(size)].decode("utf-8"))
+            offset += int(size) + 1
+        return blobs
+
+    async def get_ref_trees(self, refs: list[str]) -> dict[str, str]:
+        """Resolve the root tree of each ref with a single `git cat-file --batch-check`, unknown refs are skipped."""
+        if not refs:
+            return {}
+        output = await self._read_git_output(
+            ["cat-file", "--batch-check"], input="".join(f"{ref}^{{tree}}\n" for ref in refs)
+        )
+        trees: dict[str, str] = {}
+        for ref, line in zip(refs, output.splitlines(), strict=False):
+            sha, _, object_type = line.partition(" ")
+            if object_type.startswith("tree"):
+                trees[ref] = sha
+        return trees
+
+    async def list_tree_directories(self, tree: str) -> list[str]:
+        """List the directories of a tree recursively with `git ls-tree`, without checking it out."""
+        output = await self._read_git_output(["ls-tree", "-d", "-r", "-z", "--name-only", tree])
+        return [path for path in output.split("\0") if path]
+
     async def delete_workspace(self):
         shutil.rmtree(self.destination_dir, ignore_errors=True)
         logger.info(f"Workspace {self.destination_dir} is cleaned up")
@@ -0,0 +1,188 @@
+"""Worker-local cache of bare git mirrors.
+
+Tasks clone the same repositories over and over, each into a fresh temporary
+workspace. Mirrors are kept by normalized repository URL under
+GIT_MIRROR_CACHE_DIR and every clone first fetches the remote into its
+mirror, with the task's own URL and credentials: access is still checked by
+the remote, only new objects cross the network and the credentials are never
+stored in the mirror. The workspace is then cloned from the mirror, hard
+linking its objects when both are on the same filesystem. Least recently used
+mirrors are removed once the cache grows over GIT_MIRROR_CACHE_MAX_BYTES.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+from collections import defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+from prometheus_client import Counter, Gauge
+
+from core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Matches a git repo URL in any of the common shapes:
+#   https://github.com/foo/bar.git, ssh://git@github.com/foo/bar.git,
+#   git@github.com:foo/bar.git, github.com/foo/bar
+_REPO_URL_RE = re.compile(
+    r"^(?:[a-z][a-z0-9+.-]*://)?(?:[^@/]+@)?([^/:?#]+)[:/]([^?#]+?)(?:\.git)?/?$",
+    re.IGNORECASE,
+)
+
+# First line of `git ls-remote --symref <url> HEAD`, e.g. "ref: refs/heads/main\tHEAD"
+_SYMREF_RE = re.compile(r"^ref: (refs/heads/\S+)\s+HEAD$", re.MULTILINE)
+
+git_mirror_counter = Counter("git_mirror_cache_total", "Git mirror cache lookups and evictions", ["result"])
+git_mirror_bytes = Gauge("git_mirror_cache_bytes", "Disk space used by the git mirror cache")
+
+# Runs git with the arguments in the working directory, e.g. GitClient._run_git_command
+type GitRunner = Callable[[list[str], str], Awaitable[str]]
+
+
+def normalize_repo_id(url: str) -> str | None:
+    """Reduce a git URL to a "host/owner/repo" identifier, stripping
+    scheme, user, .git suffix, trailing slash. Returns None if it doesn't
+    look like a git repo URL."""
+    if not url:
+        return None
+    s = url.strip().removeprefix("git::")
+    s = s.split("?", 1)[0]
+    match = _REPO_URL_RE.match(s)
+    if not match:
+        return None
+    host, path = match.group(1), match.group(2)
+    return f"{host.lower()}/{path}"
+
+
+def _directory_size(path: str) -> int:
+    size = 0
+    for directory, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.lstat(os.path.join(directory, name)).st_size
+            except OSError:
+                continue
+    return size
+
+
+class GitMirrorCache:
+    def __init__(self, root: str, max_bytes: int):
+        self.root: str = root
+        self.max_bytes: int = max_bytes
+        self._locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    def mirror_path(self, git_url: str) -> str:
+        # Local repositories, e.g. file:// URLs, are not host/owner/repo shaped and are kept by path
+        key = normalize_repo_id(git_url) or git_url.removeprefix("file://").rstrip("/")
+        return os.path.join(self.root, f"{hashlib.sha256(key.encode()).hexdigest()[:32]}.git")
+
+    @asynccontextmanager
+    async def _locked(self, path: str) -> AsyncIterator[None]:
+        """Lock a mirror against the tasks of this process and of the other workers sharing the cache."""
+        async with self._locks[path]:
+            lock_fd = os.open(f"{path}.lock", os.O_CREAT | os.O_RDWR)
+            try:
+                await asyncio.to_thread(fcntl.flock, lock_fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(lock_fd)
+
+    @asynccontextmanager
+    async def mirror(self, git_url: str, run_git: GitRunner) -> AsyncIterator[str]:
+        """
+        Fetch the remote into its mirror, creating it on first use, and yield the mirror path.
+        The mirror is locked until the context exits, clone from it within the context.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        path = self.mirror_path(git_url)
+        async with self._locked(path):
+            exists = os.path.isdir(path)
+            git_mirror_counter.labels("hit" if exists else "miss").inc()
+            try:
+                if not exists:
+                    _ = await run_git(["init", "-q", "--bare", path], self.root)
+                _ = await run_git(
+                    ["fetch", "-q", "--prune", git_url, "+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*"],
+                    path,
+                )
+                await self._update_head(git_url, path, run_git)
+            except Exception:
+                git_mirror_counter.labels("error").inc()
+                if not exists:
+                    shutil.rmtree(path, ignore_errors=True)
+                raise
+
+            os.utime(path)
+            yield path
+
+        await self.evict()
+
+    @staticmethod
+    async def _update_head(git_url: str, path: str, run_git: GitRunner) -> None:
+        """
+        Point the mirror's HEAD to the remote's default branch. `git init` sets it to the local
+        init.defaultBranch, clones of the mirror would then check out nothing.
+        """
+        remote_head = await run_git(["ls-remote", "--symref", git_url, "HEAD"], path)
+        match = _SYMREF_RE.search(remote_head)
+        if match:
+            _ = await run_git(["symbolic-ref", "HEAD", match.group(1)], path)
+
+    async def evict(self) -> None:
+        """Remove the least recently used mirrors until the cache fits in max_bytes, skipping the ones in use."""
+        mirrors = await asyncio.to_thread(self._mirror_usage)
+        total = sum(size for _, size, _ in mirrors)
+        for _, size, path in sorted(mirrors):
+            if total <= self.max_bytes:
+                break
+            if self._locks[path].locked():
+                continue
+
+            lock_fd = os.open(f"{path}.lock", os.O_CREAT | os.O_RDWR)
+            try:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(lock_fd)
+                continue
+            try:
+                await asyncio.to_thread(shutil.rmtree, path, True)
+            finally:
+                os.close(lock_fd)
+
+            total -= size
+            git_mirror_counter.labels("evicted").inc()
+            logger.info(f"Evicted git mirror {path} ({size} bytes)")
+        git_mirror_bytes.set(total)
+
+    def _mirror_usage(self) -> list[tuple[float, int, str]]:
+        """Last use time, size and path of every mirror."""
+        if not os.path.isdir(self.root):
+            return []
+
+        mirrors: list[tuple[float, int, str]] = []
+        for entry in os.scandir(self.root):
+            if entry.is_dir() and entry.name.endswith(".git"):
+                mirrors.append((entry.stat().st_mtime, _directory_size(entry.path), entry.path))
+        return mirrors
+
+
+_git_mirror_cache: GitMirrorCache | None = None
+
+
+def get_git_mirror_cache() -> GitMirrorCache | None:
+    """The worker's mirror cache, None when GIT_MIRROR_CACHE_MAX_BYTES disables it."""
+    global _git_mirror_cache
+    settings = Settings()
+    if settings.GIT_MIRROR_CACHE_MAX_BYTES <= 0:
+        return None
+    if _git_mirror_cache is None:
+        root = settings.GIT_MIRROR_CACHE_DIR or os.path.join(tempfile.gettempdir(), "infrakitchen-git-mirrors")
+        _git_mirror_cache = GitMirrorCache(root=root, max_bytes=settings.GIT_MIRROR_CACHE_MAX_BYTES)
+    return _git_mirror_cache
@@ -5,6 +5,7 @@ import os
 
 from core.custom_entity_log_controller import EntityLogger
 from core.errors import ShellExecutionError
+from core.tools.tf_cache import plugin_cache_environment
 
 log = logging.getLogger("sh_client")
 
@@ -111,26 +112,15 @@ class ShellScriptClient:
         captured_stderr_lines: list[str] = []
         environment_variables: dict[str, str] = {**self._default_env(), **self.environment_variables}
 
-        # Track pending save tasks to avoid duplication
-        pending_save_task: asyncio.Task[None] | None = None
-
-        async def trigger_save_if_needed():
-            nonlocal pending_save_task
-            if isinstance(self.logger, EntityLogger):
-                # Only create new save task if one isn't already running
-                if pending_save_task is None or pending_save_task.done():
-                    pending_save_task = asyncio.create_task(self.logger.save_if_more_than(5))
-
+        # EntityLogger flushes buffered lines on its own once enough lines or time have accumulated
         def stdout_callback(line: str):
             captured_stdout_lines.append(line)
             self.logger.info(line)
-            _ = asyncio.create_task(trigger_save_if_needed())
 
         def stderr_callback(line: str):
             # Capture stderr lines, but defer logging until we know the exit code
             # Many tools (like git) write informational messages to stderr even on success
             captured_stderr_lines.append(line)
-            _ = asyncio.create_task(trigger_save_if_needed())
 
         _, return_code = await _stream_subprocess(
             cmd=self._command_parts,
@@ -160,5 +150,8 @@ class ShellScriptClient:
         return "\n".join(captured_stdout_lines).strip()
 
     def _default_env(self) -> dict[str, str]:
-        """Return forced environment variables such as PATH & proxy variables."""
-        return {key: os.getenv(key, "") for key in {"PATH", "HTTPS_PROXY", "HTTP_PROXY", "NO_PROXY"}}
+        """Return forced environment variables such as PATH & proxy variables, and the plugin cache of tofu."""
+        environment = {key: os.getenv(key, "") for key in {"PATH", "HTTPS_PROXY", "HTTP_PROXY", "NO_PROXY"}}
+        if self.command == "tofu":
+            environment.update(plugin_cache_environment())
+        return environment
@@ -0,0 +1,171 @@
+"""Provider plugin cache and warm workspaces for OpenTofu.
+
+Every task runs ``tofu init`` in a brand-new workspace. The providers are
+downloaded once per worker into a shared plugin cache (TF_PLUGIN_CACHE_DIR),
+which OpenTofu only uses for providers pinned with checksums in the
+workspace's ``.terraform.lock.hcl`` unless
+OTF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE is set. ShellScriptClient
+points every ``tofu`` command to it. Writes to the cache are not safe for
+concurrent inits, so the providers are installed on their own under a
+host-wide lock, while modules and the backend are initialized outside it.
+
+The ``.terraform`` directory of an initialized workspace is kept as a warm
+workspace, keyed by the hash of the lock file, the backend config and the
+``.tf`` files. A later task with the same key, e.g. the apply after a dry
+run, gets a copy of it and skips provider installation. Installed modules
+are not kept: a remote module source such as a git branch or a registry
+version range may resolve to new code without any ``.tf`` change, so they
+are installed again with ``tofu get``.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from prometheus_client import Counter, Gauge
+
+from core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+LOCK_FILE = ".terraform.lock.hcl"
+DATA_DIR = ".terraform"
+MODULES_DIR = "modules"
+
+otf_init_counter = Counter("otf_init_total", "OpenTofu inits by warm workspace lookup", ["result"])
+otf_cache_bytes = Gauge("otf_cache_bytes", "Disk space used by the OpenTofu caches", ["cache"])
+
+_init_lock = asyncio.Lock()
+
+
+def _cache_root() -> str:
+    return Settings().OTF_CACHE_DIR or os.path.join(tempfile.gettempdir(), "infrakitchen-tofu")
+
+
+def plugin_cache_dir() -> str:
+    return os.path.join(_cache_root(), "plugins")
+
+
+def warm_workspaces_dir() -> str:
+    return os.path.join(_cache_root(), "workspaces")
+
+
+def _directory_size(path: str) -> int:
+    return sum(
+        os.lstat(os.path.join(directory, name)).st_size for directory, _, files in os.walk(path) for name in files
+    )
+
+
+def plugin_cache_environment() -> dict[str, str]:
+    """Environment variables pointing OpenTofu to the worker's plugin cache."""
+    directory = plugin_cache_dir()
+    os.makedirs(directory, exist_ok=True)
+    environment = {"TF_PLUGIN_CACHE_DIR": directory}
+    if Settings().OTF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE:
+        environment["TF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE"] = "true"
+    return environment
+
+
+@asynccontextmanager
+async def plugin_cache_lock() -> AsyncIterator[None]:
+    """Provider installs into the plugin cache are not safe concurrently, serialize them across the tasks of a host."""
+    async with _init_lock:
+        os.makedirs(_cache_root(), exist_ok=True)
+        lock_fd = os.open(os.path.join(_cache_root(), "init.lock"), os.O_CREAT | os.O_RDWR)
+        try:
+            await asyncio.to_thread(fcntl.flock, lock_fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(lock_fd)
+
+
+def warm_workspace_key(workspace_path: str, backend_config: str) -> str | None:
+    """
+    Hash of everything init depends on: the lock file, the backend config and the configuration files.
+    None when the workspace has no lock file, its providers are not pinned.
+    """
+    lock_file = os.path.join(workspace_path, LOCK_FILE)
+    if Settings().OTF_WARM_WORKSPACES <= 0 or not os.path.isfile(lock_file):
+        return None
+
+    digest = hashlib.sha256(backend_config.encode())
+    for directory, directories, files in os.walk(workspace_path):
+        directories[:] = sorted(name for name in directories if name not in (DATA_DIR, ".git"))
+        for name in sorted(files):
+            if name == LOCK_FILE or name.endswith((".tf", ".tf.json")):
+                path = os.path.join(directory, name)
+                digest.update(os.path.relpath(path, workspace_path).encode())
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+def restore_warm_workspace(key: str, workspace_path: str) -> bool:
+    """Copy the initialized ``.terraform`` directory and lock file of the key into the workspace."""
+    warm_path = os.path.join(warm_workspaces_dir(), key)
+    if not os.path.isdir(warm_path):
+        otf_init_counter.labels("cold").inc()
+        return False
+
+    try:
+        shutil.copytree(os.path.join(warm_path, DATA_DIR), os.path.join(workspace_path, DATA_DIR), symlinks=True)
+        shutil.copy2(os.path.join(warm_path, LOCK_FILE), os.path.join(workspace_path, LOCK_FILE))
+        os.utime(warm_path)
+    except OSError as e:
+        # Evicted by another worker while being copied
+        logger.warning(f"Cannot restore warm OpenTofu workspace {key}: {e}")
+        shutil.rmtree(os.path.join(workspace_path, DATA_DIR), ignore_errors=True)
+        otf_init_counter.labels("cold").inc()
+        return False
+
+    otf_init_counter.labels("warm").inc()
+    return True
+
+
+def save_warm_workspace(key: str, workspace_path: str) -> None:
+    """
+    Keep the initialized workspace, without its modules, under the key.
+    The least recently used ones over OTF_WARM_WORKSPACES are evicted.
+    """
+    directory = warm_workspaces_dir()
+    warm_path = os.path.join(directory, key)
+    if os.path.isdir(warm_path):
+        return
+
+    os.makedirs(directory, exist_ok=True)
+    staging_path = tempfile.mkdtemp(dir=directory, prefix=".staging-")
+    data_dir = os.path.join(workspace_path, DATA_DIR)
+    try:
+        shutil.copytree(
+            data_dir,
+            os.path.join(staging_path, DATA_DIR),
+            symlinks=True,
+            ignore=lambda path, names: [MODULES_DIR] if path == data_dir else [],
+        )
+        shutil.copy2(os.path.join(workspace_path, LOCK_FILE), os.path.join(staging_path, LOCK_FILE))
+        os.rename(staging_path, warm_path)
+    except OSError as e:
+        # Another worker saved the same workspace first, or the disk is full
+        logger.warning(f"Cannot save warm OpenTofu workspace {key}: {e}")
+        shutil.rmtree(staging_path, ignore_errors=True)
+
+    warm_paths = sorted(
+        (entry for entry in os.scandir(directory) if entry.is_dir() and not entry.name.startswith(".")),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in warm_paths[: max(len(warm_paths) - Settings().OTF_WARM_WORKSPACES, 0)]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def report_cache_size() -> None:
+    try:
+        otf_cache_bytes.labels("plugins").set(_directory_size(plugin_cache_dir()))
+        otf_cache_bytes.labels("workspaces").set(_directory_size(warm_workspaces_dir()))
+    except OSError as e:
+        logger.debug(f"Cannot measure the OpenTofu caches: {e}")
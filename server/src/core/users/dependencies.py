@@ -2,6 +2,7 @@ from fastapi import Depends
 
 from core.audit_logs.handler import AuditLogHandler
 from core.dependencies import get_db_session
+from core.utils.event_sender import EventSender
 
 from .crud import UserCRUD
 from .service import UserService
@@ -16,4 +17,5 @@ def get_user_service(
     return UserService(
         crud=UserCRUD(session=session),
         audit_log_handler=audit_log_handler,
+        event_sender=EventSender(entity_name="user"),
     )
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from uuid import UUID
 
 from core.casbin.enforcer import CasbinEnforcer
@@ -30,17 +31,7 @@ async def user_has_access_to_entity(
     if casbin_enforcer.enforcer is None:
         raise RuntimeError("Casbin enforcer is not initialized")
 
-    act_mapping = {
-        "write": ["write", "admin"],
-        "read": ["read", "write", "admin"],
-        "admin": ["admin"],
-    }
-
-    for act in act_mapping[action]:
-        if casbin_enforcer.enforcer.enforce(f"user:{user_id}", f"{entity_name}:{entity_id}", act) is True:
-            return True
-
-    return False
+    return casbin_enforcer.has_access(f"user:{user_id}", f"{entity_name}:{entity_id}", action)
 
 
 async def user_has_access_to_api(user: UserDTO | None, api: str, action: str) -> bool:
@@ -63,17 +54,7 @@ async def user_has_access_to_api(user: UserDTO | None, api: str, action: str) ->
     if casbin_enforcer.enforcer is None:
         raise RuntimeError("Casbin enforcer is not initialized")
 
-    act_mapping = {
-        "write": ["write", "admin"],
-        "read": ["read", "write", "admin"],
-        "admin": ["admin"],
-    }
-
-    for act in act_mapping[action]:
-        if casbin_enforcer.enforcer.enforce(f"user:{user_id}", f"api:{api}", act) is True:
-            return True
-
-    return False
+    return casbin_enforcer.has_access(f"user:{user_id}", f"api:{api}", action)
 
 
 async def user_apis_permissions(user: UserDTO | None) -> dict[str, str]:
@@ -153,16 +134,47 @@ async def user_entity_permissions(user: UserDTO | None, entity_id: str | UUID, e
     if casbin_enforcer.enforcer is None:
         raise RuntimeError("Casbin enforcer is not initialized")
 
-    if casbin_enforcer.enforcer.enforce(f"user:{user_id}", f"{entity_name}:{entity_id}", "admin") is True:
-        return ["read", "write", "admin"]
+    return _permissions_for_action(casbin_enforcer.get_highest_action(f"user:{user_id}", f"{entity_name}:{entity_id}"))
 
-    if casbin_enforcer.enforcer.enforce(f"user:{user_id}", f"{entity_name}:{entity_id}", "write") is True:
-        return ["read", "write"]
 
-    if casbin_enforcer.enforcer.enforce(f"user:{user_id}", f"{entity_name}:{entity_id}", "read") is True:
-        return ["read"]
+async def user_entities_permissions(
+    user: UserDTO | None, entities: Sequence[tuple[str, str | UUID]]
+) -> list[list[str]]:
+    """Batch version of user_entity_permissions for a list of (entity_name, entity_id) pairs."""
+    if user is None:
+        raise ValueError("User must not be None and must have an ID")
+
+    user_id = user.id
+    if user.primary_account:
+        user_id = user.primary_account[0].id if user.primary_account else user.id
+    if user.deactivated is True:
+        raise AccessDenied("User account is deactivated")
+    if user.primary_account:
+        if user.primary_account[0].deactivated is True:
+            raise AccessDenied("Primary account is deactivated")
+
+    casbin_enforcer = CasbinEnforcer()
+    if casbin_enforcer.enforcer is None:
+        _ = await casbin_enforcer.get_enforcer()
+    if casbin_enforcer.enforcer is None:
+        raise RuntimeError("Casbin enforcer is not initialized")
 
-    return []
+    highest_actions = await casbin_enforcer.get_highest_actions(
+        f"user:{user_id}", [f"{entity_name}:{entity_id}" for entity_name, entity_id in entities]
+    )
+    return [_permissions_for_action(action) for action in highest_actions]
+
+
+def _permissions_for_action(action: str | None) -> list[str]:
+    match action:
+        case "admin":
+            return ["read", "write", "admin"]
+        case "write":
+            return ["read", "write"]
+        case "read":
+            return ["read"]
+        case _:
+            return []
 
 
 async def user_is_super_admin(user: UserDTO | None) -> bool:
@@ -8,6 +8,7 @@ from core.database import FieldSpec
 from core.errors import EntityNotFound
 from core.models.encrypted_secret import EncryptedSecretStr
 from core.users.functions import get_user_actions, user_entity_permissions
+from core.utils.event_sender import EventSender
 from core.utils.model_tools import model_db_dump
 from core.utils.password_manager import hash_new_password
 from .crud import UserCRUD
@@ -28,9 +29,18 @@ class UserService:
         self,
         crud: UserCRUD,
         audit_log_handler: AuditLogHandler | None = None,
+        event_sender: EventSender | None = None,
     ):
         self.crud: UserCRUD = crud
         self.audit_log_handler: AuditLogHandler | None = audit_log_handler
+        self.event_sender: EventSender | None = event_sender
+
+    async def _reload_personal_access_tokens(self, *user_ids: UUID | str) -> None:
+        # Every process drops the cached users of these personal access tokens, see core.sso.token_cache
+        if self.event_sender is None:
+            return
+        for user_id in user_ids:
+            await self.event_sender.send_reload_event("reload_personal_access_tokens", {"user_id": str(user_id)})
 
     async def get_dto_by_id(self, user_id: str | UUID) -> UserDTO | None:
         user = await self.crud.get_by_id(user_id)
@@ -140,6 +150,7 @@ class UserService:
             body = model_db_dump(user, exclude_fields={"password"}, exclude_defaults=True, exclude_none=True)
 
         await self.crud.update(existing_user, body)
+        await self._reload_personal_access_tokens(existing_user.id)
 
         if self.audit_log_handler:
             await self.audit_log_handler.create_log(existing_user.id, requester.id, ModelActions.UPDATE)
@@ -224,6 +235,7 @@ class UserService:
         }
         await self.crud.update(primary_user, body)
         await self.crud.refresh(primary_user)
+        await self._reload_personal_access_tokens(primary_user.id, secondary_user.id)
 
         if self.audit_log_handler:
             await self.audit_log_handler.create_log(primary_user.id, requester.id, "link_accounts")
@@ -272,6 +284,7 @@ class UserService:
 
         await self.crud.update(primary_user, body_primary)
         await self.crud.update(secondary_user, body_secondary)
+        await self._reload_personal_access_tokens(primary_user.id, secondary_user.id)
 
         await self.crud.refresh(secondary_user)
         await self.crud.refresh(primary_user)
@@ -1,6 +1,7 @@
 import json
 import logging
 from contextvars import ContextVar
+from typing import Any
 
 from aio_pika import ExchangeType
 from pydantic import BaseModel
@@ -10,6 +11,14 @@ from core.base_models import MessageModel
 from core.rabbitmq import RabbitMQConnection
 from core.users.model import UserDTO
 from core.utils.json_encoder import JsonEncoder
+from core.utils.task_lanes import (
+    TASK_LANE_PRIORITIES,
+    TASKS_EXCHANGE,
+    TaskLane,
+    get_task_lane,
+    get_task_priority,
+    task_routing_key,
+)
 from core.scheduler.model import JobType
 
 logger = logging.getLogger(__name__)
@@ -18,6 +27,11 @@ logger = logging.getLogger(__name__)
 _pending_senders: ContextVar[list["EventSender"] | None] = ContextVar("_pending_senders", default=None)
 
 
+def _requires_confirm(message: MessageModel) -> bool:
+    """Only task messages are confirmed, events and scheduler jobs are not."""
+    return message.exchange == TASKS_EXCHANGE and message.message_type != "scheduler_job"
+
+
 async def flush_all_pending_senders():
     """Flush all EventSender instances that have buffered messages.
     Call this after session.commit() to guarantee consumers see committed data."""
@@ -65,7 +79,11 @@ class EventSender:
         message.metadata["audit_log_id"] = str(audit_log_id) if audit_log_id else None
         if extra_metadata:
             message.metadata.update(extra_metadata)
-        message.routing_key = "ik_tasks"
+        entity_controller = message.metadata["entity_controller"]
+        lane = get_task_lane(entity_controller, action, message.metadata)
+        message.exchange = TASKS_EXCHANGE
+        message.routing_key = task_routing_key(lane, entity_controller)
+        message.priority = get_task_priority(entity_controller, action, message.metadata)
         message.exchange_type = ExchangeType.DIRECT
         self._buffer.append(message)
         self._register_pending()
@@ -74,20 +92,23 @@ class EventSender:
         event_message = MessageModel()
         event_message.message_type = "event"
         event_message.metadata["event"] = event
+        event_message.metadata["entity"] = self.entity_name
         event_message.exchange = "ik_event_messages"
         event_message.exchange_type = ExchangeType.FANOUT
         event_message.body = json.loads(json.dumps(entity_instance.model_dump(), cls=JsonEncoder))
         self._buffer.append(event_message)
         self._register_pending()
 
-    async def send_reload_event(self, event: str):
+    async def send_reload_event(self, event: str, metadata: dict[str, Any] | None = None):
         """Broadcast a bodyless reload signal on the FANOUT event exchange.
 
         Used to tell other processes to reload some state (e.g. the scheduler
-        re-reading its jobs from the DB). Buffered and flushed after commit.
+        re-reading its jobs from the DB). What to reload can be narrowed with
+        ``metadata``, sent as ``_metadata``. Buffered and flushed after commit.
         """
         event_message = MessageModel()
         event_message.message_type = "event"
+        event_message.metadata.update(metadata or {})
         event_message.metadata["event"] = event
         event_message.exchange = "ik_event_messages"
         event_message.exchange_type = ExchangeType.FANOUT
@@ -96,7 +117,9 @@ class EventSender:
 
     async def send_scheduler_job(self, job_id: UUID, job_type: JobType, job_script: str):
         message = MessageModel()
-        message.routing_key = "ik_tasks"
+        message.exchange = TASKS_EXCHANGE
+        message.routing_key = task_routing_key(TaskLane.SCHEDULER)
+        message.priority = TASK_LANE_PRIORITIES[TaskLane.SCHEDULER]
         message.message_type = "scheduler_job"
         message.exchange_type = ExchangeType.DIRECT
 
@@ -116,6 +139,4 @@ class EventSender:
         see committed data."""
         messages = self._buffer.copy()
         self._buffer.clear()
-        for message in messages:
-            confirm = message.routing_key == "ik_tasks" and message.message_type != "scheduler_job"
-            await RabbitMQConnection.send_message(message, confirm=confirm)
+        await RabbitMQConnection.publish_many(messages, confirm=_requires_confirm)
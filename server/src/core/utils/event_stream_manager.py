@@ -4,9 +4,11 @@ import logging
 from typing import Any
 import aio_pika
 
+from core.caches.response_cache import invalidate_response_cache
 from core.casbin.enforcer import CasbinEnforcer
 from core.feature_flags.feature_flag_manager import reload_feature_flags_configs
 from core.rabbitmq import RabbitMQConnection
+from core.sso.token_cache import invalidate_personal_access_token
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,8 @@ async def rabbitmq_consumer():
         async with message.process(ignore_processed=True):
             msg = message.body.decode()
             decoded_json_message: dict[str, Any] = json.loads(msg)
+            invalidate_response_cache(decoded_json_message)
+            invalidate_personal_access_token(decoded_json_message)
 
             if decoded_json_message.get("_metadata", {}).get("event") == "reload_feature_flags_configs":
                 logger.debug('Got "reload all Feature Flag configs" event')
@@ -23,10 +27,10 @@ async def rabbitmq_consumer():
 
             if decoded_json_message.get("_metadata", {}).get("event") == "reload_policies":
                 logger.debug("Got event to reload policies")
-                enforcer = CasbinEnforcer().enforcer
-                if not enforcer:
+                casbin_enforcer = CasbinEnforcer()
+                if not casbin_enforcer.enforcer:
                     raise ValueError("Enforcer is not initialized")
-                await enforcer.load_policy()
+                await casbin_enforcer.apply_policy_event(decoded_json_message)
             else:
                 logger.debug(f"Sending message to eventstream: {msg}")
 
@@ -50,12 +54,17 @@ async def rabbitmq_consumer():
         )
         _ = await events_exchange.bind(raw_messages_exchange, routing_key="events.*.*")
 
-        # Declaring a queue
-        queue = await channel.declare_queue(name="event_messages_consumer", auto_delete=False)
+        # Every process needs its own copy of the events to keep its enforcer in sync
+        queue = await channel.declare_queue(exclusive=True, auto_delete=True)
 
         # Binding the queue to the exchange
         _ = await queue.bind(events_exchange)
 
+        casbin_enforcer = CasbinEnforcer()
+        if casbin_enforcer.enforcer:
+            # Policy changes published before the queue was bound were not received
+            await casbin_enforcer.reload_policies()
+
         consumer_tag = await queue.consume(callback)
         logger.info("Subscribed RabbitMQ ik_event_messages")
 
@@ -12,6 +12,7 @@ class MessageHandler:
         self.raw_body = message.body
         self.routing_key = message.routing_key
         self.delivery_mode = message.delivery_mode
+        self.priority = message.priority
 
         if self.content_type == "json":
             self.body = json.loads(message.body.decode())
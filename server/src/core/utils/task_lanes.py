@@ -0,0 +1,112 @@
+from enum import StrEnum
+from fnmatch import fnmatchcase
+from typing import Any
+
+# Exchange every task and scheduler job is published to
+TASKS_EXCHANGE = "ik_tasks"
+# Routing key and queue used before lanes were introduced. Workers that
+# subscribe to every lane keep draining it so in-flight messages are not lost.
+LEGACY_TASKS_ROUTING_KEY = "ik_tasks"
+LEGACY_TASKS_QUEUE = "task_worker"
+
+TASK_ENTITY_CONTROLLERS = (
+    "source_code",
+    "source_code_version",
+    "storage",
+    "resource",
+    "workspace",
+    "executor",
+    "workflow",
+)
+
+MAX_TASK_PRIORITY = 10
+
+
+class TaskLane(StrEnum):
+    INTERACTIVE = "interactive"  # dry-runs and workflow step callbacks, someone is waiting for them
+    PROVISION = "provision"  # long running apply/destroy style actions
+    SYNC = "sync"  # bulk synchronisation of source codes, versions, workspaces
+    SCHEDULER = "scheduler"  # scheduler jobs
+
+
+TASK_LANE_PRIORITIES: dict[TaskLane, int] = {
+    TaskLane.INTERACTIVE: 8,
+    TaskLane.PROVISION: 5,
+    TaskLane.SCHEDULER: 3,
+    TaskLane.SYNC: 1,
+}
+
+# Workflow step callbacks unblock a running pipeline, so they go first
+WORKFLOW_CALLBACK_PRIORITY = MAX_TASK_PRIORITY
+
+INTERACTIVE_ACTIONS = {"dryrun", "dryrun_with_temp_state"}
+SYNC_ACTIONS = {"sync"}
+
+
+def is_workflow_callback(entity_controller: str, metadata: dict[str, Any]) -> bool:
+    return entity_controller == "workflow" and bool(metadata.get("step_id") or metadata.get("resource_id"))
+
+
+def get_task_lane(entity_controller: str, action: str, metadata: dict[str, Any] | None = None) -> TaskLane:
+    """Pick the lane of an entity task based on its action class."""
+    if is_workflow_callback(entity_controller, metadata or {}):
+        return TaskLane.INTERACTIVE
+    if action in INTERACTIVE_ACTIONS:
+        return TaskLane.INTERACTIVE
+    if action in SYNC_ACTIONS:
+        return TaskLane.SYNC
+    return TaskLane.PROVISION
+
+
+def get_task_priority(entity_controller: str, action: str, metadata: dict[str, Any] | None = None) -> int:
+    if is_workflow_callback(entity_controller, metadata or {}):
+        return WORKFLOW_CALLBACK_PRIORITY
+    return TASK_LANE_PRIORITIES[get_task_lane(entity_controller, action, metadata)]
+
+
+def task_routing_key(lane: TaskLane, entity_controller: str | None = None) -> str:
+    """Routing key (and queue name) of a lane, e.g. ``ik_tasks.interactive.resource``."""
+    if lane == TaskLane.SCHEDULER:
+        return f"{TASKS_EXCHANGE}.{lane}"
+    return f"{TASKS_EXCHANGE}.{lane}.{entity_controller}"
+
+
+def all_task_routing_keys() -> list[str]:
+    keys = [
+        task_routing_key(lane, entity_controller)
+        for lane in TaskLane
+        if lane != TaskLane.SCHEDULER
+        for entity_controller in TASK_ENTITY_CONTROLLERS
+    ]
+    keys.append(task_routing_key(TaskLane.SCHEDULER))
+    return keys
+
+
+def parse_lane_patterns(value: str | None) -> list[str]:
+    """Split a comma separated lane setting such as ``"interactive.*, provision.resource"``."""
+    if not value:
+        return []
+    return [pattern.strip() for pattern in value.split(",") if pattern.strip()]
+
+
+def _lane_matches(lane_name: str, pattern: str) -> bool:
+    # A bare lane name such as "interactive" selects all of its entity controllers
+    return fnmatchcase(lane_name, pattern) or fnmatchcase(lane_name, f"{pattern}.*")
+
+
+def resolve_task_routing_keys(patterns: list[str] | None = None) -> list[str]:
+    """Return the lane routing keys matching the given patterns.
+
+    Patterns are matched against the routing key without the exchange prefix,
+    so ``interactive`` or ``interactive.*`` selects every interactive lane and
+    ``scheduler`` selects scheduler jobs. No patterns means every lane.
+    """
+    keys = all_task_routing_keys()
+    if not patterns:
+        return keys
+
+    prefix = f"{TASKS_EXCHANGE}."
+    selected = [key for key in keys if any(_lane_matches(key.removeprefix(prefix), p) for p in patterns)]
+    if not selected:
+        raise ValueError(f"Task lanes {patterns} do not match any lane")
+    return selected
@@ -23,6 +23,8 @@ class Worker(Base):
     host_metadata: Mapped[dict[str, str]] = mapped_column(JSON, default={})
     status: Mapped[str] = mapped_column()
     current_task: Mapped[dict[str, str] | None] = mapped_column(JSON, nullable=True, default=None)
+    current_tasks: Mapped[list[dict[str, str]]] = mapped_column(JSON, default=[])
+    concurrency: Mapped[int] = mapped_column(default=1)
     tasks_completed: Mapped[int | None] = mapped_column(default=0, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), onupdate=func.now(), default=func.now())
@@ -34,7 +36,9 @@ class WorkerDTO(BaseModel):
     host: str = Field(..., title="Worker host")
     host_metadata: dict[str, str] = Field(default={}, title="Worker metadata")
     status: Literal["free", "busy"] = Field(default="free", title="Worker status")
-    current_task: dict[str, str] | None = Field(default=None, title="Currently running task")
+    current_task: dict[str, str] | None = Field(default=None, title="Last started task")
+    current_tasks: list[dict[str, str]] = Field(default_factory=list, title="Currently running tasks")
+    concurrency: int = Field(default=1, title="Maximum number of tasks running at once")
     tasks_completed: int | None = Field(default=0, title="Total tasks completed")
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), frozen=True)
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
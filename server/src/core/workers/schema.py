@@ -11,7 +11,9 @@ class WorkerResponse(BaseModel):
     host: str = Field(..., title="Worker host")
     host_metadata: dict[str, str] = Field(default={}, title="Worker metadata")
     status: Literal["free", "busy"] = Field(default="free", title="Worker status")
-    current_task: dict[str, str] | None = Field(default=None, title="Currently running task")
+    current_task: dict[str, str] | None = Field(default=None, title="Last started task")
+    current_tasks: list[dict[str, str]] = Field(default_factory=list, title="Currently running tasks")
+    concurrency: int = Field(default=1, title="Maximum number of tasks running at once")
     tasks_completed: int | None = Field(default=0, title="Total tasks completed")
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), frozen=True)
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
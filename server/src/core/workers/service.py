@@ -64,30 +64,21 @@ class WorkerService:
 
         return WorkerDTO.model_validate(response)
 
-    async def change_worker_status(self, worker_id: str | UUID, status: Literal["free", "busy"]) -> None:
-        worker = await self.crud.get_by_id(str(worker_id))
-        if not worker:
-            logger.warning(f"Worker with id {worker_id} not found")
-            return
-        worker.status = status
-        await self.crud.commit()
-
-    async def set_current_task(self, worker_id: str | UUID | None, task_info: dict[str, str] | None) -> None:
-        if worker_id is None:
-            return
-        worker = await self.crud.get_by_id(worker_id)
-        if not worker:
-            logger.warning(f"Worker with id {worker_id} not found")
-            return
-        worker.current_task = task_info
-        await self.crud.commit()
-
-    async def increment_tasks_completed(self, worker_id: str | UUID | None) -> None:
-        if worker_id is None:
-            return
+    async def update_task_state(
+        self,
+        worker_id: str | UUID,
+        status: Literal["free", "busy"],
+        current_tasks: list[dict[str, str]],
+        current_task: dict[str, str] | None = None,
+        tasks_completed: int | None = None,
+    ) -> None:
         worker = await self.crud.get_by_id(worker_id)
         if not worker:
             logger.warning(f"Worker with id {worker_id} not found")
             return
-        worker.tasks_completed = (worker.tasks_completed or 0) + 1
+        worker.status = status
+        worker.current_tasks = current_tasks
+        worker.current_task = current_task
+        if tasks_completed is not None:
+            worker.tasks_completed = tasks_completed
         await self.crud.commit()
@@ -1,12 +1,13 @@
 import asyncio
 import logging
+from collections.abc import Callable
 from typing import Any
 
 from fastapi import Depends, Request
 from starlette.requests import HTTPConnection
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.dependencies import get_db_session
+from core.dependencies import get_db_session, get_db_session_factory
 from core.sso.dependencies import get_sso_service
 from core.sso.functions import get_user_from_token
 from core.sso.service import SSOService
@@ -19,6 +20,7 @@ logger = logging.getLogger(__name__)
 async def get_context(
     connection: HTTPConnection,
     session: AsyncSession = Depends(get_db_session),
+    session_factory: Callable[[], AsyncSession] = Depends(get_db_session_factory),
     service: SSOService = Depends(get_sso_service),
 ) -> dict[str, Any]:
     user = None
@@ -34,7 +36,8 @@ async def get_context(
             connection.state.user = user
 
     # Wrap the session so concurrent GraphQL resolvers serialise their
-    # execute() calls through an asyncio.Lock.
+    # execute() calls through an asyncio.Lock. Query operations move their
+    # reads to a session pool, see ConcurrentReadSessionExtension.
     session_lock = asyncio.Lock()
     if hasattr(connection, "state"):
         connection.state.graphql_session_lock = session_lock
@@ -42,8 +45,9 @@ async def get_context(
 
     return {
         "session": locked,
+        "session_factory": session_factory,
         "user": user,
         "request": connection,
         "sso_service": service,
-        "loaders": create_entity_loaders(locked),
+        "loaders": create_entity_loaders(locked, user),
     }
@@ -2,14 +2,18 @@ from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from strawberry.dataloader import DataLoader
+from core.users.model import UserDTO
 from graphql_api.dataloaders.count_loaders import count_loaders
 from graphql_api.dataloaders.entity_loaders import entity_loaders
 from graphql_api.dataloaders.golden_state_loaders import golden_state_loaders
+from graphql_api.dataloaders.permission_loaders import permission_loaders
 
 
-def create_entity_loaders(session: AsyncSession | Any) -> dict[str, DataLoader[str, Any]]:
+def create_entity_loaders(session: AsyncSession | Any, user: UserDTO | None = None) -> dict[str, DataLoader[str, Any]]:
     loaders: dict[str, DataLoader[str, Any]] = {}
     loaders.update(entity_loaders(session))
     loaders.update(count_loaders(session))
     loaders.update(golden_state_loaders(session))
+    if user is not None:
+        loaders.update(permission_loaders(user))
     return loaders
@@ -0,0 +1,29 @@
+from strawberry.dataloader import DataLoader
+from strawberry.types import Info
+
+from core.users.functions import user_entities_permissions
+from core.users.model import UserDTO
+
+
+async def _load_entity_permissions(keys: list[str], user: UserDTO) -> list[list[str]]:
+    entities: list[tuple[str, str]] = []
+    for key in keys:
+        entity_name, _, entity_id = key.partition(":")
+        entities.append((entity_name, entity_id))
+    return await user_entities_permissions(user, entities)
+
+
+def get_entity_permissions_loader(info: Info) -> DataLoader[str, list[str]]:
+    """Get or create the requester's permissions loader, keys are ``<entity_name>:<entity_id>``."""
+    loaders = info.context["loaders"]
+    if "entity_permissions" not in loaders:
+        loaders.update(permission_loaders(info.context["request"].state.user))
+    return loaders["entity_permissions"]
+
+
+def permission_loaders(user: UserDTO) -> dict[str, DataLoader[str, list[str]]]:
+    return {
+        "entity_permissions": DataLoader[str, list[str]](
+            load_fn=lambda keys: _load_entity_permissions(list(keys), user)
+        ),
+    }
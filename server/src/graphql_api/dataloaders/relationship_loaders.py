@@ -0,0 +1,154 @@
+"""Batched loading of ORM relationships for GraphQL resolvers.
+
+Eager loading options run once per parent query, so the same relationship
+selected under sibling root fields or nested types is loaded several times.
+``load_relationship`` instead loads it through a DataLoader shared by every
+resolver of the request asking for the same relationship and selection, one
+query per relationship whatever the number of parents. Many-to-one,
+one-to-many and association table relationships are supported, as long as
+they join on a single column.
+"""
+
+import json
+from collections import defaultdict
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from sqlalchemy import ColumnElement, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, RelationshipProperty
+from sqlalchemy.orm.base import NO_VALUE
+from strawberry.dataloader import DataLoader
+from strawberry.types import Info
+from strawberry.types.nodes import SelectedField
+
+from core.database import FieldSpec, build_load_only
+from graphql_api.helpers import build_field_spec
+
+# Loading options of the related entity for a FieldSpec, e.g. build_template_query_options
+type QueryOptionsBuilder = Callable[[FieldSpec | None], list[Any]]
+
+
+def _relationship(attribute: InstrumentedAttribute[Any]) -> RelationshipProperty[Any]:
+    prop = attribute.property
+    if not isinstance(prop, RelationshipProperty):
+        raise TypeError(f"{attribute} is not a relationship")
+    return prop
+
+
+def _single_pair(
+    relationship: RelationshipProperty[Any], pairs: Sequence[tuple[ColumnElement[Any], ColumnElement[Any]]]
+) -> tuple[ColumnElement[Any], ColumnElement[Any]]:
+    if len(pairs) != 1:
+        raise ValueError(f"Relationship {relationship} does not join on a single column")
+    return pairs[0]
+
+
+def _join_columns(relationship: RelationshipProperty[Any]) -> tuple[ColumnElement[Any], ColumnElement[Any]]:
+    """The parent column holding the loader key and the column matching it in the loading query."""
+    if relationship.secondary is not None:
+        return _single_pair(relationship, relationship.synchronize_pairs)
+    return _single_pair(relationship, relationship.local_remote_pairs)
+
+
+async def _load_related(
+    keys: list[str],
+    session: AsyncSession,
+    relationship: RelationshipProperty[Any],
+    fields: FieldSpec | None,
+    query_options: QueryOptionsBuilder | None,
+) -> list[Any]:
+    _, key_column = _join_columns(relationship)
+    statement = select(key_column, relationship.mapper.class_)
+    if relationship.secondary is not None:
+        target_column, secondary_column = _single_pair(relationship, relationship.secondary_synchronize_pairs or [])
+        statement = statement.join(relationship.secondary, secondary_column == target_column)
+    statement = statement.where(key_column.in_(keys))
+    if relationship.order_by:
+        statement = statement.order_by(*relationship.order_by)
+    if query_options is not None:
+        options = query_options(fields)
+    else:
+        options = build_load_only(relationship.mapper.class_, set(fields)) if fields else []
+    if options:
+        statement = statement.options(*options)
+
+    result = await session.execute(statement)
+    if relationship.uselist:
+        grouped: dict[str, list[Any]] = defaultdict(list)
+        for key, item in result.unique():
+            grouped[str(key)].append(item)
+        return [grouped.get(key, []) for key in keys]
+
+    mapping = {str(key): item for key, item in result.unique()}
+    return [mapping.get(key) for key in keys]
+
+
+def get_relationship_loader(
+    info: Info,
+    relationship: InstrumentedAttribute[Any],
+    fields: FieldSpec | None = None,
+    query_options: QueryOptionsBuilder | None = None,
+) -> DataLoader[str, Any]:
+    """
+    Get or create the request's loader of a relationship, keyed by the parent's join column.
+    Without ``query_options`` only the requested columns are selected, see build_load_only.
+    """
+    prop = _relationship(relationship)
+    loaders = info.context["loaders"]
+    loader_key = f"relationship:{prop}:{json.dumps(fields, sort_keys=True)}"
+    if loader_key not in loaders:
+        session = info.context["session"]
+        loaders[loader_key] = DataLoader[str, Any](
+            load_fn=lambda keys: _load_related(list(keys), session, prop, fields, query_options)
+        )
+    return loaders[loader_key]
+
+
+async def load_relationship(
+    info: Info,
+    parent: Any,
+    relationship: InstrumentedAttribute[Any],
+    query_options: QueryOptionsBuilder | None = None,
+) -> Any:
+    """
+    Resolve a relationship of the parent for the current field.
+    A value loaded with the parent is returned as is, otherwise it is batched with the other parents.
+    Empty values are loaded again, the parent query may have skipped the relationship, see batched_field_spec.
+    """
+    prop = _relationship(relationship)
+    state = inspect(parent, raiseerr=False)
+    if state is None:
+        return getattr(parent, prop.key, None)
+
+    loaded = state.attrs[prop.key].loaded_value
+    if loaded is not NO_VALUE and loaded:
+        return loaded
+
+    local_column, _ = _join_columns(prop)
+    key = getattr(parent, state.mapper.get_property_by_column(local_column).key)
+    if key is None:
+        return [] if prop.uselist else None
+
+    selection = info.selected_fields[0] if info.selected_fields else None
+    fields = build_field_spec(selection) if isinstance(selection, SelectedField) else None
+    return await get_relationship_loader(info, relationship, fields, query_options).load(str(key))
+
+
+def batched_field_spec(fields: FieldSpec | None, *relationships: InstrumentedAttribute[Any]) -> FieldSpec | None:
+    """
+    Drop the relationships resolved by load_relationship from the FieldSpec of a parent query,
+    keeping the columns they are loaded by. A None spec loads everything and is returned as is.
+    """
+    if fields is None:
+        return None
+
+    batched = dict(fields)
+    for relationship in relationships:
+        prop = _relationship(relationship)
+        camel_key = "".join(part.capitalize() if index else part for index, part in enumerate(prop.key.split("_")))
+        if batched.pop(prop.key, NO_VALUE) is NO_VALUE and batched.pop(camel_key, NO_VALUE) is NO_VALUE:
+            continue
+        local_column, _ = _join_columns(prop)
+        batched[prop.parent.get_property_by_column(local_column).key] = None
+    return batched
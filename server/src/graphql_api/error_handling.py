@@ -20,6 +20,7 @@ from core.errors import (
     EntityWrongState,
 )
 from core.utils.json_encoder import JsonEncoder
+from graphql_api.persisted_queries import PERSISTED_QUERY_NOT_FOUND
 
 logger = logging.getLogger(__name__)
 
@@ -115,6 +116,10 @@ def classify_graphql_error(error: GraphQLError) -> tuple[str, str, dict[str, Any
         if isinstance(original, PermissionError):
             return "ACCESS_DENIED", _sanitize_message(str(original)), None
 
+    # Clients answer it by sending the query along with its hash
+    if error.message == PERSISTED_QUERY_NOT_FOUND:
+        return "PERSISTED_QUERY_NOT_FOUND", error.message, None
+
     # Strawberry permission errors are plain GraphQLError without original_error.
     if error.message.startswith("Not authenticated"):
         return "ACCESS_DENIED", _sanitize_message(error.message), None
@@ -1,4 +1,48 @@
+import inspect
+import json
+import logging
+import time
+from typing import Any
+
+from graphql import ExecutionResult as GraphQLExecutionResult
+from graphql import GraphQLError, get_operation_ast
+from prometheus_client import Counter, Histogram
+from starlette.responses import Response
 from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
+
+from core.caches.response_cache import get_response_cache
+from core.config import Settings
+from core.database import SessionLocal, count_statements
+from core.read_replica import read_sessionmaker, record_write
+from graphql_api.dataloaders import create_entity_loaders
+from graphql_api.helpers import mask_sensitive_values
+from graphql_api.persisted_queries import (
+    PERSISTED_QUERY_HASH_MISMATCH,
+    PERSISTED_QUERY_NOT_FOUND,
+    get_persisted_query_store,
+    query_hash,
+    requested_hash,
+)
+from graphql_api.query_cost import operation_cost
+from graphql_api.response_cache import cacheable_entities, permission_fingerprint, response_cache_key
+from graphql_api.session_pool import PooledSession, ReadSessionPool
+
+logger = logging.getLogger(__name__)
+
+graphql_operation_cost = Histogram(
+    "graphql_operation_cost",
+    "Static cost of GraphQL operations",
+    buckets=(10, 100, 500, 1_000, 5_000, 10_000, 25_000, 100_000),
+)
+graphql_rejected_operations = Counter("graphql_rejected_operations_total", "Operations over the cost budget")
+graphql_resolver_duration = Histogram("graphql_resolver_duration_seconds", "Async resolver wall time", ["field"])
+graphql_resolver_statements = Histogram(
+    "graphql_resolver_sql_statements",
+    "SQL statements executed by an async resolver",
+    ["field"],
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100),
+)
 
 
 class GraphQLFailureFlagExtension(SchemaExtension):
@@ -31,3 +75,219 @@ class GraphQLFailureFlagExtension(SchemaExtension):
 
         if request is not None:
             request.state.graphql_failed = True
+
+
+class PersistedQueryExtension(SchemaExtension):
+    """Serves validated documents by hash, see graphql_api.persisted_queries.
+
+    A known document is reused as is, parsing and validation are skipped.
+    Other documents are stored once they pass validation.
+    """
+
+    document_hash: str | None = None
+
+    def on_operation(self):
+        execution_context = self.execution_context
+        max_entries = Settings().GRAPHQL_PERSISTED_QUERIES_MAX_ENTRIES
+        sha256_hash = requested_hash(execution_context.operation_extensions)
+        if max_entries <= 0 or (execution_context.query is None and sha256_hash is None):
+            yield
+            return
+
+        store = get_persisted_query_store()
+        if execution_context.query is None:
+            # Without a query the request has a hash, checked above
+            assert sha256_hash is not None
+            document = store.get(sha256_hash)
+            if document is None:
+                raise GraphQLError(PERSISTED_QUERY_NOT_FOUND)
+            self.document_hash = sha256_hash
+        else:
+            self.document_hash = query_hash(execution_context.query)
+            if sha256_hash is not None and sha256_hash != self.document_hash:
+                raise GraphQLError(PERSISTED_QUERY_HASH_MISMATCH)
+            document = store.get(self.document_hash)
+
+        if document is not None:
+            execution_context.graphql_document = document
+            execution_context.validation_rules = ()
+            self.document_hash = None
+        yield
+
+    def on_validate(self):
+        yield
+
+        execution_context = self.execution_context
+        if (
+            self.document_hash is not None
+            and execution_context.graphql_document is not None
+            and not execution_context.pre_execution_errors
+        ):
+            get_persisted_query_store().set(self.document_hash, execution_context.graphql_document)
+
+
+class ResponseCacheExtension(SchemaExtension):
+    """Serves cacheable queries from the response cache, see graphql_api.response_cache.
+
+    Responses are kept for GRAPHQL_RESPONSE_CACHE_TTL seconds unless an event
+    of an entity they read is received first, see invalidate_response_cache.
+    Responses with errors are not cached.
+    """
+
+    async def on_execute(self):
+        execution_context = self.execution_context
+        ttl = Settings().GRAPHQL_RESPONSE_CACHE_TTL
+        document = execution_context.graphql_document
+        document_hash = (
+            query_hash(execution_context.query)
+            if execution_context.query
+            else requested_hash(execution_context.operation_extensions)
+        )
+        operation = get_operation_ast(document, execution_context.operation_name) if document else None
+        entities = cacheable_entities(operation) if operation is not None else None
+        context = execution_context.context
+        if ttl <= 0 or entities is None or document_hash is None or not isinstance(context, dict):
+            yield
+            return
+
+        fingerprint = await permission_fingerprint(context.get("user"))
+        key = response_cache_key(
+            document_hash, execution_context.operation_name, execution_context.variables, fingerprint
+        )
+        cache = get_response_cache()
+        data = cache.get(key)
+        if data is not None:
+            # Strawberry does not execute the operation when a result is already set
+            execution_context.result = GraphQLExecutionResult(data=data, errors=None)
+            yield
+            return
+
+        yield
+
+        result = execution_context.result
+        if isinstance(result, GraphQLExecutionResult) and not result.errors and result.data is not None:
+            cache.set(key, result.data, entities, ttl)
+
+
+class SecretMaskingExtension(SchemaExtension):
+    """Masks encrypted secret payloads in the result before it is encoded.
+
+    The result data is still made of Python objects here, so the response is
+    serialised once instead of being parsed and re-encoded by a middleware.
+    """
+
+    def on_operation(self):
+        yield
+
+        result = self.execution_context.result
+        if result is not None and result.data:
+            result.data = mask_sensitive_values(result.data)
+
+
+class ConcurrentReadSessionExtension(SchemaExtension):
+    """Runs the reads of query operations on a per-request pool of sessions.
+
+    Resolvers and data loaders of a query are resolved concurrently, with the
+    request's ``LockedSession`` they would wait for each other. The pool opens
+    its sessions from the context's ``session_factory`` and reads from the
+    replica when the factory is the default one and a replica is configured.
+    Contexts without a factory, mutations and subscriptions keep the single
+    session of the request.
+    """
+
+    async def on_execute(self):
+        context = self.execution_context.context
+        operation_type = self.execution_context.operation_type
+        session_factory = context.get("session_factory") if isinstance(context, dict) else None
+        max_sessions = Settings().GRAPHQL_READ_SESSIONS_PER_REQUEST
+        if (
+            max_sessions <= 0
+            or operation_type != OperationType.QUERY
+            or not isinstance(context, dict)
+            or "session" not in context
+            or session_factory is None
+        ):
+            yield
+            response = context.get("response") if isinstance(context, dict) else None
+            if operation_type == OperationType.MUTATION and isinstance(response, Response):
+                record_write(response)
+            return
+
+        # Only sessions of the default factory have a replica to read from
+        if session_factory is SessionLocal:
+            session_factory = read_sessionmaker(context.get("request"))
+        pool = ReadSessionPool(max_sessions, session_factory=session_factory)
+        session = PooledSession(pool, context["session"])
+        context["session"] = session
+        context["loaders"] = create_entity_loaders(session, context.get("user"))
+        try:
+            yield
+        finally:
+            await pool.close()
+
+
+class QueryCostExtension(SchemaExtension):
+    """Rejects operations over the cost budget and records resolver timings.
+
+    The static cost is computed before validation, operations above
+    GRAPHQL_MAX_QUERY_COST are not executed. Async resolvers, the ones doing
+    I/O, report their wall time and SQL statement count to Prometheus. Slow
+    or expensive operations are logged as JSON.
+    """
+
+    cost: int | None = None
+
+    def on_validate(self):
+        execution_context = self.execution_context
+        document = execution_context.graphql_document
+        operation = get_operation_ast(document, execution_context.operation_name) if document else None
+        if document is not None and operation is not None:
+            self.cost = operation_cost(
+                execution_context.schema._schema, document, operation, execution_context.variables
+            )
+            graphql_operation_cost.observe(self.cost)
+
+            max_cost = Settings().GRAPHQL_MAX_QUERY_COST
+            if 0 < max_cost < self.cost:
+                graphql_rejected_operations.inc()
+                self._log_operation("GraphQL operation rejected", None, None)
+                execution_context.pre_execution_errors = [
+                    GraphQLError(f"Query cost {self.cost} exceeds the maximum of {max_cost}")
+                ]
+        yield
+
+    def on_execute(self):
+        start = time.perf_counter()
+        with count_statements() as statements:
+            yield
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        settings = Settings()
+        if duration_ms >= settings.GRAPHQL_SLOW_OPERATION_MS or (self.cost or 0) >= settings.GRAPHQL_LOG_QUERY_COST:
+            self._log_operation("Slow or expensive GraphQL operation", duration_ms, statements[0])
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        result = _next(root, info, *args, **kwargs)
+        if not inspect.isawaitable(result):
+            return result
+        return self._timed(result, f"{info.parent_type.name}.{info.field_name}")
+
+    async def _timed(self, result: Any, field: str) -> Any:
+        start = time.perf_counter()
+        with count_statements() as statements:
+            try:
+                return await result
+            finally:
+                graphql_resolver_duration.labels(field).observe(time.perf_counter() - start)
+                graphql_resolver_statements.labels(field).observe(statements[0])
+
+    def _log_operation(self, message: str, duration_ms: float | None, statements: int | None) -> None:
+        execution_context = self.execution_context
+        details = {
+            "operation_name": execution_context.operation_name,
+            "operation_type": execution_context.operation_type.value,
+            "cost": self.cost,
+            "duration_ms": round(duration_ms, 1) if duration_ms is not None else None,
+            "sql_statements": statements,
+        }
+        logger.warning(f"{message}: {json.dumps(details)}")
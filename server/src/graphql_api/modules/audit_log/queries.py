@@ -15,6 +15,7 @@ from graphql_api.helpers import (
     parse_range,
     parse_sort,
 )
+from graphql_api.pagination import CountResult, Page
 from graphql_api.modules.audit_log.types import AuditLogType
 
 
@@ -52,6 +53,28 @@ class AuditLogQuery:
             fields=fields,
         )
 
+    @strawberry.field(permission_classes=[IsAuthenticated])
+    async def audit_logs_page(
+        self,
+        info: Info,
+        filter: JSON | None = None,
+        sort: list[str] | None = None,
+        after: str | None = None,
+        first: int = 100,
+    ) -> Page[AuditLogType]:
+        await check_api_permission(info, "audit_log", ["read"])
+        service = _build_service(info)
+        page_fields = get_entity_selection(info.selected_fields, "auditLogsPage")
+        fields = build_field_spec(get_entity_selection(page_fields, "items"))
+        items, next_cursor = await service.query_page(
+            filter=cast(dict[str, Any], cast(object, filter)) if filter else None,
+            sort=parse_sort(sort),
+            cursor=after,
+            limit=first,
+            fields=fields,
+        )
+        return Page[AuditLogType](items=items, next_cursor=next_cursor)
+
     @strawberry.field(permission_classes=[IsAuthenticated])
     async def audit_logs_count(
         self,
@@ -64,6 +87,21 @@ class AuditLogQuery:
             filter=cast(dict[str, Any], cast(object, filter)) if filter else None,
         )
 
+    @strawberry.field(permission_classes=[IsAuthenticated])
+    async def audit_logs_count_result(
+        self,
+        info: Info,
+        filter: JSON | None = None,
+        approximate: bool = False,
+    ) -> CountResult:
+        await check_api_permission(info, "audit_log", ["read"])
+        service = _build_service(info)
+        filter_body = cast(dict[str, Any], cast(object, filter)) if filter else None
+        if not approximate:
+            return CountResult(count=await service.count(filter=filter_body), exact=True)
+        count, exact = await service.approximate_count(filter=filter_body)
+        return CountResult(count=count, exact=exact)
+
     @strawberry.field(permission_classes=[IsAuthenticated])
     async def audit_log_actions(self, info: Info) -> list[str]:
         await check_api_permission(info, "audit_log", ["read"])
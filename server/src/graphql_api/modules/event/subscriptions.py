@@ -55,6 +55,9 @@ class EventSubscription:
                 async for message in queue_iter:
                     msg: dict[str, Any] = json.loads(message.body.decode())
                     metadata = msg.pop("_metadata", {})
+                    if metadata.get("event") == "reload_personal_access_tokens":
+                        # Authentication cache signal between processes, not an entity event
+                        continue
 
                     yield EventStreamMessage(
                         event=str(metadata.get("event", "")),
@@ -120,16 +120,18 @@ class LogSubscription:
                         msg: dict[str, Any] = json.loads(message.body.decode())
                         msg.pop("_metadata", None)
 
-                        yield LogStreamMessage(
-                            entity_id=str(msg.get("entity_id", entity_id)),
-                            entity=msg.get("entity", entity_name),
-                            level=msg.get("level", "info"),
-                            data=msg.get("data", ""),
-                            revision=msg.get("revision", 1),
-                            execution_start=msg.get("execution_start", 1),
-                            audit_log_id=str(v) if (v := msg.get("audit_log_id")) else None,
-                            created_at=str(v) if (v := msg.get("created_at")) else None,
-                            trace_id=str(v) if (v := msg.get("trace_id")) else None,
-                        )
+                        # EntityLogger merges consecutive lines into one message
+                        for line in msg.get("lines") or [msg.get("data", "")]:
+                            yield LogStreamMessage(
+                                entity_id=str(msg.get("entity_id", entity_id)),
+                                entity=msg.get("entity", entity_name),
+                                level=msg.get("level", "info"),
+                                data=line,
+                                revision=msg.get("revision", 1),
+                                execution_start=msg.get("execution_start", 1),
+                                audit_log_id=str(v) if (v := msg.get("audit_log_id")) else None,
+                                created_at=str(v) if (v := msg.get("created_at")) else None,
+                                trace_id=str(v) if (v := msg.get("trace_id")) else None,
+                            )
             finally:
                 logger.debug("GraphQL subscription: cleaned up log stream for %s", entity_id)
@@ -20,7 +20,10 @@ from graphql_api.helpers import (
     parse_range,
     parse_sort,
 )
+from graphql_api.dataloaders.relationship_loaders import batched_field_spec
+from graphql_api.pagination import Page
 from graphql_api.modules.resource.types import (
+    BATCHED_RELATIONSHIPS,
     ResourceDownloadType,
     ResourceType,
     ResourceVariableSchemaType,
@@ -51,7 +54,7 @@ class ResourceQuery:
         await check_api_permission(info, "resource", ["read"])
         service = _build_service(info)
         entity_fields = get_entity_selection(info.selected_fields, "resource")
-        fields = build_field_spec(entity_fields)
+        fields = batched_field_spec(build_field_spec(entity_fields), *BATCHED_RELATIONSHIPS)
         return await service.query_by_id(id, fields=fields)
 
     @strawberry.field(permission_classes=[IsAuthenticated])
@@ -61,28 +64,57 @@ class ResourceQuery:
         filter: JSON | None = None,
         sort: list[str] | None = None,
         range: list[int] | None = None,
+        accessible_only: bool = False,
     ) -> list[ResourceType]:
         await check_api_permission(info, "resource", ["read"])
         service = _build_service(info)
         entity_fields = get_entity_selection(info.selected_fields, "resources")
-        fields = build_field_spec(entity_fields)
+        fields = batched_field_spec(build_field_spec(entity_fields), *BATCHED_RELATIONSHIPS)
         return await service.query_all(
             filter=cast(dict[str, Any], cast(object, filter)) if filter else None,
             sort=parse_sort(sort),
             range=parse_range(range),
             fields=fields,
+            requester=info.context["request"].state.user if accessible_only else None,
         )
 
+    @strawberry.field(permission_classes=[IsAuthenticated])
+    async def resources_page(
+        self,
+        info: Info,
+        filter: JSON | None = None,
+        sort: list[str] | None = None,
+        after: str | None = None,
+        first: int = 100,
+        accessible_only: bool = False,
+    ) -> Page[ResourceType]:
+        await check_api_permission(info, "resource", ["read"])
+        service = _build_service(info)
+        page_fields = get_entity_selection(info.selected_fields, "resourcesPage")
+        item_fields = build_field_spec(get_entity_selection(page_fields, "items"))
+        fields = batched_field_spec(item_fields, *BATCHED_RELATIONSHIPS)
+        items, next_cursor = await service.query_page(
+            filter=cast(dict[str, Any], cast(object, filter)) if filter else None,
+            sort=parse_sort(sort),
+            cursor=after,
+            limit=first,
+            fields=fields,
+            requester=info.context["request"].state.user if accessible_only else None,
+        )
+        return Page[ResourceType](items=items, next_cursor=next_cursor)
+
     @strawberry.field(permission_classes=[IsAuthenticated])
     async def resources_count(
         self,
         info: Info,
         filter: JSON | None = None,
+        accessible_only: bool = False,
     ) -> int:
         await check_api_permission(info, "resource", ["read"])
         service = _build_service(info)
         return await service.count(
             filter=cast(dict[str, Any], cast(object, filter)) if filter else None,
+            requester=info.context["request"].state.user if accessible_only else None,
         )
 
     @strawberry.field(permission_classes=[IsAuthenticated])
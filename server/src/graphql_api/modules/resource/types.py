@@ -4,7 +4,10 @@ import strawberry
 from strawberry.types import Info
 from strawberry_sqlalchemy_mapper import StrawberrySQLAlchemyMapper
 
+from application.integrations.query_options import build_integration_query_options
+from application.projects.query_options import build_project_query_options
 from application.resources.model import Resource
+from application.templates.query_options import build_template_query_options
 from application.validation_rules.schema import ValidationRuleResponse
 
 from graphql_api.dataloaders.entity_loaders import (
@@ -12,6 +15,7 @@ from graphql_api.dataloaders.entity_loaders import (
     get_scheduled_action_loader,
     get_resource_temp_state_loader,
 )
+from graphql_api.dataloaders.relationship_loaders import load_relationship
 from graphql_api.modules.integration.types import IntegrationType
 from graphql_api.modules.resource_temp_state.types import ResourceTempStateType
 from graphql_api.modules.secret.types import SecretType
@@ -26,6 +30,9 @@ from graphql_api.modules.project.types import ProjectType
 
 resource_mapper = StrawberrySQLAlchemyMapper()
 
+# Relationships resolved through load_relationship, the resource queries do not eager load them
+BATCHED_RELATIONSHIPS = (Resource.template, Resource.project, Resource.integration_ids)
+
 
 @resource_mapper.type(Resource)
 class ResourceType:
@@ -46,12 +53,9 @@ class ResourceType:
     ]
 
     id: uuid.UUID = strawberry.UNSET
-    template: TemplateType | None = None
     storage: StorageType | None = None
     workspace: WorkspaceType | None = None
-    project: ProjectType | None = None
     source_code_version: SourceCodeVersionType | None = None
-    integration_ids: list[IntegrationType] | None = None
     secret_ids: list[SecretType] | None = None
     parents: list["ResourceType"] | None = None
     children: list["ResourceType"] | None = None
@@ -61,6 +65,18 @@ class ResourceType:
     def entity_name(self) -> str:
         return "resource"
 
+    @strawberry.field
+    async def template(self, info: Info) -> TemplateType | None:
+        return await load_relationship(info, self, Resource.template, build_template_query_options)
+
+    @strawberry.field
+    async def project(self, info: Info) -> ProjectType | None:
+        return await load_relationship(info, self, Resource.project, build_project_query_options)
+
+    @strawberry.field
+    async def integration_ids(self, info: Info) -> list[IntegrationType] | None:
+        return await load_relationship(info, self, Resource.integration_ids, build_integration_query_options)
+
     @strawberry.field
     async def is_favorite(self, info: Info) -> bool:
         user = info.context.get("user")
@@ -7,6 +7,7 @@ from strawberry.types import Info
 
 from core.users.dependencies import get_user_service
 from core.users.service import UserService
+from graphql_api.dataloaders.permission_loaders import get_entity_permissions_loader
 from graphql_api.helpers import (
     IsAuthenticated,
     build_field_spec,
@@ -82,6 +83,6 @@ class UserQuery:
 
     @strawberry.field(permission_classes=[IsAuthenticated])
     async def user_entity_permissions(self, info: Info, entity_id: uuid.UUID, entity_name: str) -> list[str]:
-        service = _build_service(info)
-        requester = info.context["request"].state.user
-        return await service.get_user_entity_permissions(requester, entity_id, entity_name)
+        # Batched with the other permission lookups of the same request
+        loader = get_entity_permissions_loader(info)
+        return await loader.load(f"{entity_name}:{entity_id}")
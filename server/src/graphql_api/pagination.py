@@ -0,0 +1,15 @@
+import strawberry
+
+
+@strawberry.type
+class Page[T]:
+    """One page of a keyset paginated list, pass ``next_cursor`` as ``after`` to fetch the next page."""
+
+    items: list[T]
+    next_cursor: str | None = None
+
+
+@strawberry.type
+class CountResult:
+    count: int
+    exact: bool
@@ -0,0 +1,73 @@
+"""Automatic persisted queries.
+
+Clients may send the sha256 of an operation in the ``persistedQuery``
+request extension instead of its text. The server answers
+``PersistedQueryNotFound`` for unknown hashes, the client then sends the
+query along with its hash once. Validated documents are kept by hash, so the
+polled operations are neither parsed nor validated again, whether they are
+sent by hash or in full.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any
+
+from graphql import DocumentNode
+from prometheus_client import Counter
+
+from core.config import Settings
+
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+PERSISTED_QUERY_HASH_MISMATCH = "provided sha does not match query"
+
+persisted_query_counter = Counter("graphql_persisted_queries_total", "Documents looked up by hash", ["result"])
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+def requested_hash(operation_extensions: dict[str, Any] | None) -> str | None:
+    """The hash of the ``persistedQuery`` request extension, if any."""
+    persisted_query = (operation_extensions or {}).get("persistedQuery")
+    if not isinstance(persisted_query, dict):
+        return None
+    sha256_hash = persisted_query.get("sha256Hash")
+    return sha256_hash if isinstance(sha256_hash, str) else None
+
+
+class PersistedQueryStore:
+    """LRU of validated documents by query hash."""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries: int = max_entries
+        self._documents: OrderedDict[str, DocumentNode] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def get(self, sha256_hash: str) -> DocumentNode | None:
+        document = self._documents.get(sha256_hash)
+        if document is None:
+            persisted_query_counter.labels("miss").inc()
+            return None
+
+        self._documents.move_to_end(sha256_hash)
+        persisted_query_counter.labels("hit").inc()
+        return document
+
+    def set(self, sha256_hash: str, document: DocumentNode) -> None:
+        self._documents[sha256_hash] = document
+        self._documents.move_to_end(sha256_hash)
+        while len(self._documents) > self.max_entries:
+            _ = self._documents.popitem(last=False)
+
+
+_store: PersistedQueryStore | None = None
+
+
+def get_persisted_query_store() -> PersistedQueryStore:
+    global _store
+    if _store is None:
+        _store = PersistedQueryStore(max_entries=Settings().GRAPHQL_PERSISTED_QUERIES_MAX_ENTRIES)
+    return _store
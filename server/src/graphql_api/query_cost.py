@@ -0,0 +1,161 @@
+"""Static cost of a GraphQL operation.
+
+Every object field costs its weight (1 by default) plus the cost of its
+selection, list fields multiply that by the number of items they may return.
+The size of a list comes from its ``first``/``limit``/``range`` argument,
+otherwise a default is assumed. The ``items`` list of a page takes the size
+of the paginated field, e.g. ``logsPage(first: 50) { items { id } }``.
+Scalars and introspection fields are free.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLField,
+    GraphQLList,
+    GraphQLNamedType,
+    GraphQLObjectType,
+    GraphQLSchema,
+    InlineFragmentNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    get_named_type,
+    get_nullable_type,
+    value_from_ast_untyped,
+)
+
+DEFAULT_FIELD_WEIGHT = 1
+# Root lists without a range return up to 100 items, see evaluate_sqlalchemy_pagination
+DEFAULT_ROOT_LIST_SIZE = 100
+DEFAULT_LIST_SIZE = 10
+
+# Fields doing notably more work than loading a row, keyed by "<Type>.<field>"
+FIELD_WEIGHTS: dict[str, int] = {
+    "Query.resourceTree": 100,
+    "Query.templateTree": 100,
+}
+
+
+def _size_argument(field: FieldNode, field_def: GraphQLField, variables: dict[str, Any]) -> int | None:
+    arguments = {
+        argument.name.value: value_from_ast_untyped(argument.value, variables) for argument in field.arguments or ()
+    }
+    for name in ("first", "limit"):
+        if name not in arguments and name in field_def.args:
+            arguments[name] = field_def.args[name].default_value
+        if isinstance(arguments.get(name), int):
+            return max(arguments[name], 0)
+    range_ = arguments.get("range")
+    if isinstance(range_, list) and len(range_) >= 2 and all(isinstance(i, int) for i in range_[:2]):
+        return max(range_[1] - range_[0], 0)
+    return None
+
+
+class _CostCalculator:
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        fragments: Mapping[str, FragmentDefinitionNode],
+        variables: dict[str, Any],
+    ) -> None:
+        self.schema: GraphQLSchema = schema
+        self.fragments: Mapping[str, FragmentDefinitionNode] = fragments
+        self.variables: dict[str, Any] = variables
+        # A fragment spread many times is costed once per position and page size
+        self._fragment_costs: dict[tuple[str, bool, int | None], int] = {}
+
+    def selection_cost(
+        self,
+        selection_set: SelectionSetNode | None,
+        parent_type: GraphQLNamedType | None,
+        is_root: bool = False,
+        visited_fragments: frozenset[str] = frozenset(),
+        page_size: int | None = None,
+    ) -> int:
+        if selection_set is None or parent_type is None:
+            return 0
+
+        cost = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                cost += self.field_cost(selection, parent_type, is_root, visited_fragments, page_size)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = (
+                    self.schema.get_type(selection.type_condition.name.value)
+                    if selection.type_condition
+                    else parent_type
+                )
+                cost += self.selection_cost(
+                    selection.selection_set, fragment_type, is_root, visited_fragments, page_size
+                )
+            elif isinstance(selection, FragmentSpreadNode):
+                cost += self.fragment_cost(selection.name.value, is_root, visited_fragments, page_size)
+        return cost
+
+    def fragment_cost(self, name: str, is_root: bool, visited_fragments: frozenset[str], page_size: int | None) -> int:
+        fragment = self.fragments.get(name)
+        if fragment is None or name in visited_fragments:
+            return 0
+        key = (name, is_root, page_size)
+        if key not in self._fragment_costs:
+            fragment_type = self.schema.get_type(fragment.type_condition.name.value)
+            self._fragment_costs[key] = self.selection_cost(
+                fragment.selection_set, fragment_type, is_root, visited_fragments | {name}, page_size
+            )
+        return self._fragment_costs[key]
+
+    def field_cost(
+        self,
+        field: FieldNode,
+        parent_type: GraphQLNamedType,
+        is_root: bool,
+        visited_fragments: frozenset[str],
+        page_size: int | None = None,
+    ) -> int:
+        name = field.name.value
+        if name.startswith("__") or not isinstance(parent_type, GraphQLObjectType):
+            return 0
+        field_def = parent_type.fields.get(name)
+        if field_def is None or field.selection_set is None:
+            return 0
+
+        field_type = get_nullable_type(field_def.type)
+        size = _size_argument(field, field_def, self.variables)
+        weight = FIELD_WEIGHTS.get(f"{parent_type.name}.{name}", DEFAULT_FIELD_WEIGHT)
+        if not isinstance(field_type, GraphQLList):
+            # A paginated field passes its size to the items of its page
+            return weight + self.selection_cost(
+                field.selection_set, get_named_type(field_type), visited_fragments=visited_fragments, page_size=size
+            )
+
+        if size is None and name == "items":
+            size = page_size
+        if size is None:
+            size = DEFAULT_ROOT_LIST_SIZE if is_root else DEFAULT_LIST_SIZE
+        cost = weight + self.selection_cost(
+            field.selection_set, get_named_type(field_type), visited_fragments=visited_fragments
+        )
+        return cost * size
+
+
+def operation_cost(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    operation: OperationDefinitionNode,
+    variables: Mapping[str, Any] | None = None,
+) -> int:
+    """Return the static cost of one operation of the document."""
+    fragments = {
+        definition.name.value: definition
+        for definition in document.definitions
+        if isinstance(definition, FragmentDefinitionNode)
+    }
+    root_type = schema.get_root_type(operation.operation)
+    return _CostCalculator(schema, fragments, dict(variables or {})).selection_cost(
+        operation.selection_set, root_type, is_root=True
+    )
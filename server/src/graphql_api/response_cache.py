@@ -0,0 +1,67 @@
+"""Cacheable GraphQL operations.
+
+A query is cacheable when every root field is listed in ``CACHEABLE_FIELDS``,
+with the entities whose events invalidate it. Its response is cached by
+document hash, variables and the permission fingerprint of the user, so users
+allowed the same things share entries and nobody sees data read with other
+permissions.
+"""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from typing import Any
+
+from graphql import FieldNode, OperationDefinitionNode, OperationType
+
+from core.caches.response_cache import ANY_ENTITY
+from core.casbin.enforcer import CasbinEnforcer
+from core.users.model import UserDTO
+from core.utils.json_encoder import JsonEncoder
+
+# Root fields the UI polls, keyed by "Query.<field>", with the entities they read
+CACHEABLE_FIELDS: dict[str, frozenset[str]] = {
+    "Query.enabledAuthProviders": frozenset({"auth_provider"}),
+    "Query.globalConfig": frozenset(),
+    "Query.entities": frozenset(),
+    # Labels are stored on every labelled entity
+    "Query.labels": frozenset({ANY_ENTITY}),
+    "Query.templates": frozenset({"template"}),
+    "Query.templatesCount": frozenset({"template"}),
+    "Query.templateTree": frozenset({"template"}),
+    "Query.goldenStateReport": frozenset({"resource", "project", "source_code_version"}),
+}
+
+
+def cacheable_entities(operation: OperationDefinitionNode) -> frozenset[str] | None:
+    """The entities read by a cacheable query, None when the operation is not cacheable."""
+    if operation.operation != OperationType.QUERY:
+        return None
+
+    entities: set[str] = set()
+    for selection in operation.selection_set.selections:
+        if not isinstance(selection, FieldNode):
+            return None
+        name = selection.name.value
+        if name == "__typename":
+            continue
+        field_entities = CACHEABLE_FIELDS.get(f"Query.{name}")
+        if field_entities is None:
+            return None
+        entities |= field_entities
+    return frozenset(entities)
+
+
+async def permission_fingerprint(user: UserDTO | None) -> str:
+    if user is None:
+        return "anonymous"
+    fingerprint = await CasbinEnforcer().get_permission_fingerprint(f"user:{user.id}")
+    # Deactivated users are refused by check_api_permission whatever their policies
+    return f"{fingerprint}:deactivated" if user.deactivated else fingerprint
+
+
+def response_cache_key(
+    document_hash: str, operation_name: str | None, variables: Mapping[str, Any] | None, fingerprint: str
+) -> str:
+    variables_json = json.dumps(variables or {}, sort_keys=True, cls=JsonEncoder)
+    return hashlib.sha256(f"{document_hash}:{operation_name}:{variables_json}:{fingerprint}".encode()).hexdigest()
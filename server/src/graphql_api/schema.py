@@ -1,5 +1,12 @@
 import strawberry
-from graphql_api.extensions import GraphQLFailureFlagExtension
+from graphql_api.extensions import (
+    ConcurrentReadSessionExtension,
+    GraphQLFailureFlagExtension,
+    PersistedQueryExtension,
+    QueryCostExtension,
+    ResponseCacheExtension,
+    SecretMaskingExtension,
+)
 
 from graphql_api.modules.config.queries import ConfigQuery
 from graphql_api.modules.cloud_resource.queries import CloudResourceQuery
@@ -157,5 +164,12 @@ schema = strawberry.Schema(
     query=Query,
     mutation=Mutation,
     subscription=Subscription,
-    extensions=[GraphQLFailureFlagExtension],
+    extensions=[
+        GraphQLFailureFlagExtension,
+        PersistedQueryExtension,
+        QueryCostExtension,
+        ResponseCacheExtension,
+        ConcurrentReadSessionExtension,
+        SecretMaskingExtension,
+    ],
 )
@@ -0,0 +1,93 @@
+"""Per-request pool of read sessions for GraphQL queries.
+
+``LockedSession`` serialises every resolver of a request behind one lock, so
+a query fanning out to several root fields pays the sum of their round trips.
+For query operations the resolvers and data loaders instead borrow one of a
+few short-lived sessions for each read, which lets independent reads run in
+parallel. The number of sessions per request is capped so one query cannot
+drain the engine pool.
+
+The pool opens its sessions from the factory of the request session, a
+request without one (e.g. a context built around an injected session) keeps
+its single session. Mutations keep the single transactional session.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager, suppress
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class ReadSessionPool:
+    """Lazily opens up to ``max_sessions`` sessions and hands them out one borrower at a time."""
+
+    def __init__(self, max_sessions: int, session_factory: Callable[[], AsyncSession]) -> None:
+        self.max_sessions: int = max(max_sessions, 1)
+        self._session_factory: Callable[[], AsyncSession] = session_factory
+        self._sessions: list[AsyncSession] = []
+        self._idle: asyncio.Queue[AsyncSession] = asyncio.Queue()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def _acquire(self) -> AsyncSession:
+        if not self._idle.empty():
+            return self._idle.get_nowait()
+        if len(self._sessions) < self.max_sessions:
+            session = self._session_factory()
+            self._sessions.append(session)
+            return session
+        return await self._idle.get()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        session = await self._acquire()
+        try:
+            yield session
+        except Exception:
+            # Do not hand out a session stuck in a failed transaction
+            with suppress(Exception):
+                await session.rollback()
+            raise
+        finally:
+            self._idle.put_nowait(session)
+
+    async def close(self) -> None:
+        """Close every session, loaded objects stay usable as they are not expired."""
+        for session in self._sessions:
+            with suppress(Exception):
+                await session.close()
+        self._sessions.clear()
+        self._idle = asyncio.Queue()
+
+
+class PooledSession:
+    """Session proxy running reads on the pool and everything else on the request's session."""
+
+    __slots__ = ("_pool", "_session")
+
+    def __init__(self, pool: ReadSessionPool, session: Any) -> None:
+        self._pool = pool
+        self._session = session
+
+    async def _run_pooled(self, method_name: str, *args: Any, **kwargs: Any) -> Any:
+        async with self._pool.session() as session:
+            method = getattr(session, method_name)
+            return await method(*args, **kwargs)
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run_pooled("execute", *args, **kwargs)
+
+    async def get(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run_pooled("get", *args, **kwargs)
+
+    async def scalar(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run_pooled("scalar", *args, **kwargs)
+
+    async def scalars(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run_pooled("scalars", *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
@@ -12,6 +12,8 @@ from apscheduler.triggers.interval import IntervalTrigger
 
 from application.logger import change_logger
 
+from core.caches.crud import CacheCRUD
+from core.caches.service import CacheService
 from core.constants.model import ModelStatus
 from core.dependencies import get_async_session
 from core.errors import EntityNotFound
@@ -27,9 +29,11 @@ change_logger()
 
 logger = logging.getLogger("scheduler")
 
-# Id of the internal polling job. Excluded when reconciling DB jobs so it is
-# never treated as a stale job and removed.
+# Ids of the internal jobs. Excluded when reconciling DB jobs so they are
+# never treated as stale jobs and removed.
 POLL_JOB_ID = "poll_new_jobs"
+CACHE_SWEEP_JOB_ID = "sweep_expired_caches"
+INTERNAL_JOB_IDS = {POLL_JOB_ID, CACHE_SWEEP_JOB_ID}
 ENTITY_ACTION_JOB_PREFIX = "entity_action:"
 
 # Serializes reconciliation so the event-driven reload and the periodic poll
@@ -132,7 +136,7 @@ async def schedule_jobs(scheduler: AsyncIOScheduler, event_sender: EventSender):
 
         # Remove jobs that were deleted from the DB (ignore internal jobs).
         for existing in scheduler.get_jobs():
-            if existing.id == POLL_JOB_ID:
+            if existing.id in INTERNAL_JOB_IDS:
                 continue
             if existing.id.startswith(ENTITY_ACTION_JOB_PREFIX):
                 continue
@@ -195,6 +199,32 @@ async def schedule_polling_job(scheduler: AsyncIOScheduler, event_sender: EventS
     )
 
 
+async def sweep_expired_caches():
+    """Delete expired rows of the caches table in bounded batches."""
+    async with get_async_session() as session:
+        cache_service = CacheService(crud=CacheCRUD(session=session))
+        deleted = await cache_service.delete_expired()
+
+    if deleted:
+        logger.info(f"Deleted {deleted} expired cache entries")
+
+
+async def schedule_cache_sweeper_job(scheduler: AsyncIOScheduler):
+    """
+    Schedules a job that periodically deletes expired cache entries
+    :param scheduler: AsyncIOScheduler
+    """
+    logger.info("Scheduling cache sweeper job")
+
+    interval_trigger = IntervalTrigger(minutes=5)
+    scheduler.add_job(
+        sweep_expired_caches,
+        trigger=interval_trigger,
+        id=CACHE_SWEEP_JOB_ID,
+        replace_existing=True,
+    )
+
+
 async def reload_consumer(scheduler: AsyncIOScheduler, event_sender: EventSender):
     """Subscribe to the FANOUT event exchange and re-sync jobs on demand.
 
@@ -259,6 +289,7 @@ async def start_scheduler():
 
     await schedule_jobs(scheduler=scheduler, event_sender=event_sender)
     await schedule_polling_job(scheduler=scheduler, event_sender=event_sender)
+    await schedule_cache_sweeper_job(scheduler=scheduler)
 
     scheduler.start()
     logger.info("Scheduler started")
@@ -9,10 +9,11 @@ from prometheus_async.aio import web
 sys.path.append(os.path.join(os.path.dirname(__file__), "."))
 
 from application.logger import change_logger
-from core.config import setup_service_environment
+from core.config import Settings, setup_service_environment
 from application.workers import TaskWorker
 from core import RabbitMQConnection
 from core.dependencies import get_async_session
+from core.utils.task_lanes import parse_lane_patterns
 
 change_logger()
 
@@ -20,13 +21,16 @@ logging.getLogger("aiormq").setLevel(logging.WARNING)
 logging.getLogger("aio_pika").setLevel(logging.WARNING)
 logger = logging.getLogger("worker")
 
-# Initialize the lock
-worker_lock = asyncio.Lock()
-
 
 async def run_task_worker(rabbitmq):
+    settings = Settings()
     async with get_async_session() as session:
-        task_worker = TaskWorker(session=session, name="task_worker", lock=worker_lock)
+        task_worker = TaskWorker(
+            session=session,
+            name="task_worker",
+            concurrency=settings.WORKER_CONCURRENCY,
+            lanes=parse_lane_patterns(settings.TASK_WORKER_LANES),
+        )
         await task_worker.run(rabbitmq, routing_key="ik_tasks")
 
 
@@ -0,0 +1,119 @@
+import csv
+import io
+import json
+from typing import cast
+from uuid import UUID
+
+import pytest
+from sqlalchemy import JSON, Column, Integer, String, Uuid, create_engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, declarative_base
+
+from application.exports import functions
+from application.exports.functions import ExportFormat, build_export_statement, stream_export
+
+Base = declarative_base()
+
+
+class MockExportEntity(Base):
+    __tablename__ = "mock_export_entity"
+    id = Column(Uuid, primary_key=True)
+    name = Column(String)
+    size = Column(Integer)
+    variables = Column(JSON)
+
+
+class _StreamedResult:
+    def __init__(self, result, size: int):
+        self.result = result
+        self.size = size
+
+    async def partitions(self):
+        for partition in self.result.partitions(self.size):
+            yield partition
+
+
+class _StreamingSession:
+    """Streams a synchronous session's results in partitions of two rows."""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.expunged = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def stream_scalars(self, statement):
+        return _StreamedResult(self.session.execute(statement).scalars(), 2)
+
+    def expunge_all(self):
+        self.expunged += 1
+        self.session.expunge_all()
+
+
+@pytest.fixture
+def session(monkeypatch):
+    monkeypatch.setitem(functions.EXPORT_MODELS, "logs", MockExportEntity)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(
+            [
+                MockExportEntity(
+                    id=UUID(int=i),
+                    name=f"entity-{i}",
+                    size=i,
+                    variables={"token": "EncryptedSecretStr:abc", "region": "eu"} if i == 1 else None,
+                )
+                for i in range(1, 6)
+            ]
+        )
+        session.commit()
+        yield session
+
+
+async def _export(session: Session, format: ExportFormat, **kwargs) -> tuple[str, _StreamingSession]:
+    streaming_session = _StreamingSession(session)
+
+    def session_factory() -> AsyncSession:
+        return cast(AsyncSession, cast(object, streaming_session))
+
+    statement = build_export_statement(MockExportEntity, **kwargs)
+    chunks = [chunk async for chunk in stream_export(session_factory, "logs", format, statement)]
+    return "".join(chunks), streaming_session
+
+
+class TestStreamExport:
+    async def test_ndjson_rows_are_ordered_and_masked(self, session):
+        output, streaming_session = await _export(session, "ndjson")
+
+        rows = [json.loads(line) for line in output.splitlines()]
+        assert [row["name"] for row in rows] == [f"entity-{i}" for i in range(1, 6)]
+        assert rows[0]["id"] == str(UUID(int=1))
+        assert rows[0]["variables"] == {"token": "********", "region": "eu"}
+        # One chunk and one flushed identity map per fetched batch
+        assert streaming_session.expunged == 3
+
+    async def test_csv_has_a_header_and_json_cells(self, session):
+        output, _ = await _export(session, "csv")
+
+        rows = list(csv.DictReader(io.StringIO(output)))
+        assert list(rows[0]) == ["id", "name", "size", "variables"]
+        assert len(rows) == 5
+        assert json.loads(rows[0]["variables"]) == {"token": "********", "region": "eu"}
+        assert rows[1]["variables"] == ""
+
+    async def test_filter_and_resume_after_id(self, session):
+        output, _ = await _export(session, "ndjson", filter={"size__in": [1, 3, 4, 5]}, after=UUID(int=3))
+
+        assert [json.loads(line)["size"] for line in output.splitlines()] == [4, 5]
+
+    def test_statement_streams_in_batches(self):
+        statement = build_export_statement(MockExportEntity)
+
+        assert statement.get_execution_options()["yield_per"] > 0
+        with pytest.raises(ValueError):
+            build_export_statement(MockExportEntity, filter={"unknown": 1})
@@ -0,0 +1,42 @@
+from typing import cast
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from fastapi import Request
+from sqlalchemy import false
+from sqlalchemy.dialects import postgresql
+
+from application.exports import router
+from application.resources import functions
+from core.users.model import UserDTO
+
+
+@pytest.fixture
+def exported(monkeypatch):
+    statements = []
+
+    def stream_export(session_factory, entity, format, statement):
+        statements.append(statement)
+        return iter(())
+
+    monkeypatch.setattr(router, "check_api_permission", AsyncMock())
+    monkeypatch.setattr(router, "read_sessionmaker", Mock())
+    monkeypatch.setattr(router, "stream_export", stream_export)
+    monkeypatch.setattr(functions, "user_is_super_admin", AsyncMock(return_value=False))
+    monkeypatch.setattr(functions, "build_access_filter", AsyncMock(return_value=false()))
+    return statements
+
+
+@pytest.mark.asyncio
+async def test_accessible_only_export_includes_owned_projects(exported):
+    owner = Mock(spec=UserDTO)
+    owner.id = "owner-1"
+    owner.primary_account = []
+
+    _ = await router.export_entities(
+        cast(Request, Mock(spec=Request)), "resources", accessible_only=True, user=cast(UserDTO, owner)
+    )
+
+    (statement,) = exported
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert "project_owners.user_id = 'owner-1'" in sql
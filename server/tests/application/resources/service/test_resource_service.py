@@ -27,8 +27,15 @@ async def send_message(message: MessageModel, confirm: bool = False):
     pass
 
 
-# Monkey patching the send_task method
-RabbitMQConnection.send_message = send_message  # type: ignore[method-assign]
+async def publish_many(messages: list[MessageModel], confirm: bool = False):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def mock_rabbitmq_publish(monkeypatch):
+    """The service's events are not published, only for the tests of this module."""
+    monkeypatch.setattr(RabbitMQConnection, "send_message", send_message)
+    monkeypatch.setattr(RabbitMQConnection, "publish_many", publish_many)
 
 
 class TestGetById:
@@ -1,14 +1,19 @@
 from decimal import Decimal
 from typing import Any
+from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 import pytest
+from sqlalchemy import false, select
+from sqlalchemy.dialects import postgresql
 
+from application.resources import functions
 from application.resources.functions import (
     check_required_variables,
     check_unique_variables,
     check_variable_type,
     get_merged_dependency_config_with_project,
     get_merged_tags_with_project,
+    resource_access_filter,
     validate_resource_variables_on_create,
     update_resource_variables_on_patch,
 )
@@ -21,9 +26,35 @@ from application.resources.schema import (
     Variables,
 )
 from application.validation_rules.model import ValidationRuleTargetType
+from application.resources.model import Resource
 from application.validation_rules.schema import ValidationRuleResponse
 
 
+@pytest.mark.asyncio
+async def test_resource_access_filter_includes_owned_projects(monkeypatch):
+    monkeypatch.setattr(functions, "user_is_super_admin", AsyncMock(return_value=False))
+    monkeypatch.setattr(functions, "build_access_filter", AsyncMock(return_value=false()))
+    owner = Mock(id="owner-1", primary_account=[])
+
+    access_filter = await resource_access_filter(owner)
+
+    assert access_filter is not None
+    sql = str(
+        select(Resource.id)
+        .where(access_filter)
+        .compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    )
+    assert "project_owners.user_id = 'owner-1'" in sql
+
+
+@pytest.mark.asyncio
+async def test_resource_access_filter_does_not_filter_super_admins(monkeypatch):
+    monkeypatch.setattr(functions, "user_is_super_admin", AsyncMock(return_value=True))
+
+    assert await resource_access_filter(Mock(id="admin", primary_account=[])) is None
+    assert await resource_access_filter(None) is None
+
+
 def test_get_merged_tags_with_project_uses_project_as_default(many_resource_response):
     merged_tags = get_merged_tags_with_project(
         [many_resource_response[0], many_resource_response[1]],
@@ -1,9 +1,69 @@
+import os
+import subprocess
+from unittest.mock import patch
+
 import pytest
 
+from core.tools.git_client import GitClient
+
+
+def _git(*args: str, cwd: str) -> None:
+    _ = subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
 
 class TestSourceCodeTask:
     @pytest.mark.asyncio
-    async def test_start_pipeline_success(self, mocked_source_code_task, mock_stream_subprocess, mock_source_code_crud):
+    async def test_start_pipeline_success(
+        self, mocked_source_code_task, mock_stream_subprocess, mock_source_code_crud, mock_git_mirror_cache
+    ):
         await mocked_source_code_task.start_pipeline()
-        assert mock_stream_subprocess.call_count == 5
+        # Clone from the mirror and point origin back to the remote, then read the tags and branches
+        assert mock_stream_subprocess.call_count == 6
+        mock_git_mirror_cache.mirror.assert_called_once()
+        assert mock_git_mirror_cache.mirror.call_args.args[0] == mocked_source_code_task.git_client.git_url
         assert mock_source_code_crud.refresh.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_git_folders_map_reads_refs_without_checkout(self, mocked_source_code_task, tmp_path, monkeypatch):
+        monkeypatch.setenv("GIT_MIRROR_CACHE_MAX_BYTES", "0")
+        remote = str(tmp_path / "remote")
+        os.makedirs(os.path.join(remote, "modules", "vpc"))
+        os.makedirs(os.path.join(remote, ".github"))
+        _git("init", "-q", "-b", "main", cwd=remote)
+        _git("config", "user.email", "test@example.com", cwd=remote)
+        _git("config", "user.name", "test", cwd=remote)
+        for path in ("main.tf", "modules/vpc/main.tf", ".github/ci.yml"):
+            with open(os.path.join(remote, path), "w") as f:
+                _ = f.write("")
+        _git("add", ".", cwd=remote)
+        _git("commit", "-q", "-m", "Add modules", cwd=remote)
+        _git("tag", "v1.0.0", cwd=remote)
+        _git("checkout", "-q", "-b", "feature", cwd=remote)
+        os.makedirs(os.path.join(remote, "examples"))
+        with open(os.path.join(remote, "examples", "main.tf"), "w") as f:
+            _ = f.write("")
+        _git("add", ".", cwd=remote)
+        _git("commit", "-q", "-m", "Add examples", cwd=remote)
+
+        git_client = GitClient(
+            git_url=f"file://{remote}", workspace_path=str(tmp_path), repo_name="repo", environment_variables={}
+        )
+        await git_client.clone(no_checkout=True)
+        mocked_source_code_task.git_client = git_client
+        mocked_source_code_task.source_code_instance.git_folders_map = []
+
+        refs = ["v1.0.0", "origin/main", "origin/feature", "origin/missing"]
+        git_folders_map = await mocked_source_code_task.get_git_folders_map(refs)
+
+        assert not os.path.exists(os.path.join(git_client.destination_dir, "main.tf"))
+        assert {ref_folders["ref"]: ref_folders["folders"] for ref_folders in git_folders_map} == {
+            "v1.0.0": ["/", "modules/", "modules/vpc/"],
+            "origin/main": ["/", "modules/", "modules/vpc/"],
+            "origin/feature": ["/", "examples/", "modules/", "modules/vpc/"],
+        }
+
+        # Unchanged trees keep the folders of the previous sync and are not listed again
+        mocked_source_code_task.source_code_instance.git_folders_map = git_folders_map
+        with patch.object(git_client, "list_tree_directories", wraps=git_client.list_tree_directories) as listed:
+            assert await mocked_source_code_task.get_git_folders_map(refs[:3]) == git_folders_map
+        assert listed.call_count == 0
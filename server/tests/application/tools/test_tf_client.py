@@ -2,12 +2,16 @@ import json
 import os
 import shutil
 import tempfile
+from contextlib import asynccontextmanager
 from typing import Any
 
 import aiofiles
 import pytest
 
+from application.tools import tf_client
 from application.tools.tf_client import OtfClient
+from core.tools.shell_client import ShellScriptClient
+from core.tools.tf_cache import plugin_cache_environment, warm_workspaces_dir
 
 
 class TestOtfClient(OtfClient):
@@ -104,3 +108,163 @@ async def test_tf_client(mock_entity_logger):
     assert output["network_id"]["value"] == "123456789"
 
     shutil.rmtree(workspace, ignore_errors=True)
+
+
+class RecordingOtfClient(OtfClient):
+    """Records the tofu commands and creates the data directory like init does."""
+
+    __test__ = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.commands: list[str | list[str]] = []
+
+    async def _run_command(self, command_args: str | list[str]) -> str:
+        self.commands.append(command_args)
+        os.makedirs(os.path.join(self.workspace_path, ".terraform", "providers"), exist_ok=True)
+        os.makedirs(os.path.join(self.workspace_path, ".terraform", "modules"), exist_ok=True)
+        async with aiofiles.open(os.path.join(self.workspace_path, ".terraform", "terraform.tfstate"), "w") as f:
+            _ = await f.write("{}")
+        return ""
+
+
+COLD_INIT = [
+    "get",
+    "init -backend=false -get=false",
+    "init -force-copy -reconfigure -backend-config=backend.tfvars -get=false",
+]
+
+
+@pytest.fixture
+def otf_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("OTF_CACHE_DIR", str(tmp_path / "tofu-cache"))
+    return tmp_path / "tofu-cache"
+
+
+def _workspace(root, name: str, lock_file: bool = True) -> str:
+    workspace_path = os.path.join(root, name)
+    os.makedirs(workspace_path)
+    with open(os.path.join(workspace_path, "main.tf"), "w") as f:
+        _ = f.write('provider "aws" {}\n')
+    if lock_file:
+        with open(os.path.join(workspace_path, ".terraform.lock.hcl"), "w") as f:
+            _ = f.write('provider "registry.opentofu.org/hashicorp/aws" {}\n')
+    return workspace_path
+
+
+@pytest.mark.asyncio
+async def test_tf_client_reuses_warm_workspace(otf_cache, tmp_path, mock_entity_logger):
+    clients = [
+        RecordingOtfClient(
+            _workspace(tmp_path, name),
+            environment_variables={},
+            variables={},
+            backend_storage_config='bucket = "state"',
+            logger=mock_entity_logger,
+        )
+        for name in ("dry-run", "apply")
+    ]
+
+    for client in clients:
+        await client.init()
+
+    assert clients[0].commands == COLD_INIT
+    assert clients[1].commands == ["get"]
+    assert os.path.isfile(os.path.join(clients[1].workspace_path, ".terraform", "terraform.tfstate"))
+
+
+@pytest.mark.asyncio
+async def test_tf_client_does_not_keep_modules_warm(otf_cache, tmp_path, mock_entity_logger):
+    client = RecordingOtfClient(
+        _workspace(tmp_path, "workspace"),
+        environment_variables={},
+        variables={},
+        backend_storage_config='bucket = "state"',
+        logger=mock_entity_logger,
+    )
+
+    await client.init()
+
+    (warm_workspace,) = os.listdir(warm_workspaces_dir())
+    data_dir = os.path.join(warm_workspaces_dir(), warm_workspace, ".terraform")
+    assert os.path.isdir(os.path.join(data_dir, "providers"))
+    assert not os.path.exists(os.path.join(data_dir, "modules"))
+
+
+@pytest.mark.asyncio
+async def test_tf_client_runs_init_without_lock_file_or_on_changes(otf_cache, tmp_path, mock_entity_logger):
+    unpinned = RecordingOtfClient(
+        _workspace(tmp_path, "unpinned", lock_file=False),
+        environment_variables={},
+        variables={},
+        backend_storage_config='bucket = "state"',
+        logger=mock_entity_logger,
+    )
+    first = RecordingOtfClient(
+        _workspace(tmp_path, "first"),
+        environment_variables={},
+        variables={},
+        backend_storage_config='bucket = "state"',
+        logger=mock_entity_logger,
+    )
+    other_backend = RecordingOtfClient(
+        _workspace(tmp_path, "other-backend"),
+        environment_variables={},
+        variables={},
+        backend_storage_config='bucket = "other-state"',
+        logger=mock_entity_logger,
+    )
+
+    for client in (unpinned, unpinned, first, other_backend):
+        await client.init()
+
+    assert unpinned.commands == COLD_INIT * 2
+    assert first.commands == COLD_INIT
+    assert other_backend.commands == COLD_INIT
+
+
+@pytest.mark.asyncio
+async def test_tf_client_only_installs_providers_under_the_cache_lock(
+    otf_cache, tmp_path, mock_entity_logger, monkeypatch
+):
+    client = RecordingOtfClient(
+        _workspace(tmp_path, "workspace"),
+        environment_variables={},
+        variables={},
+        backend_storage_config='bucket = "state"',
+        logger=mock_entity_logger,
+    )
+
+    @asynccontextmanager
+    async def plugin_cache_lock():
+        client.commands.append("lock")
+        yield
+        client.commands.append("unlock")
+
+    monkeypatch.setattr(tf_client, "plugin_cache_lock", plugin_cache_lock)
+
+    await client.init()
+
+    assert client.commands == [
+        "get",
+        "lock",
+        "init -backend=false -get=false",
+        "unlock",
+        "init -force-copy -reconfigure -backend-config=backend.tfvars -get=false",
+    ]
+
+
+def test_tf_commands_use_the_plugin_cache(otf_cache):
+    environment = plugin_cache_environment()
+
+    assert environment["TF_PLUGIN_CACHE_DIR"] == str(otf_cache / "plugins")
+    assert os.path.isdir(environment["TF_PLUGIN_CACHE_DIR"])
+    assert "TF_PLUGIN_CACHE_MAY_BREAK_DEPENDENCY_LOCK_FILE" not in environment
+
+
+def test_tofu_shell_commands_use_the_plugin_cache(otf_cache):
+    tofu = ShellScriptClient("tofu", "version")
+    git = ShellScriptClient("git", "status")
+
+    assert tofu._default_env()["TF_PLUGIN_CACHE_DIR"] == str(otf_cache / "plugins")
+    assert "TF_PLUGIN_CACHE_DIR" not in git._default_env()
@@ -1,9 +1,13 @@
 import os
-from unittest.mock import patch, AsyncMock
+import re
+import subprocess
+from unittest.mock import call, patch, AsyncMock
 
 import pytest
+from lark.exceptions import UnexpectedInput
 
-from application.tools.tf_parser import OtfProvider
+from application.tools.tf_parser import HclParseCache, OtfProvider, parse_hcl
+from core.tools.git_client import GitClient
 
 test_tf_data = """
 resource "iam_user" "my-iam-user" {
@@ -109,6 +113,54 @@ async def test_variables_configurations():
     assert variables_dict["policy_access"]["original_type"] == "list(string)"
 
 
+class TestHclParseCache:
+    def test_cached_parse_returns_copies(self):
+        cache = HclParseCache(max_entries=10, processes=0)
+
+        first = cache.parse(test_tf_data)
+        first.data["variable"][0]["account"]["type"] = "number"
+        second = cache.parse(test_tf_data)
+
+        assert second.data["variable"][0]["account"]["type"] == "string"
+        assert second.variable_types["parameters"] == "object({\n  parameters = optional(list(any), [])\n})"
+        assert len(cache._entries) == 1
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = HclParseCache(max_entries=2, processes=0)
+        files = [f'variable "v{i}" {{\n  type = string\n}}\n' for i in range(3)]
+
+        for tf_data in files:
+            _ = cache.parse(tf_data)
+
+        assert list(cache._entries) == [cache.content_key(tf_data) for tf_data in files[1:]]
+
+    @pytest.mark.asyncio
+    async def test_directory_parse_matches_concatenated_parse(self):
+        tf = OtfProvider("tests/application/tools/fixtures/tf_fixtures")
+
+        result = await tf.parse_tf_directory_to_json()
+        concatenated = tf.merge_tf_json([parse_hcl(tf.tf_string_data)])
+
+        # Only the comments differ, the concatenation has the file dividers
+        assert len(tf.tf_files) > 1
+        assert result.pop("__comments__") == [
+            comment for comment in concatenated.pop("__comments__") if "FILE:" not in comment["value"]
+        ]
+        assert result == concatenated
+
+    @pytest.mark.asyncio
+    async def test_large_cold_sets_are_parsed_in_processes(self, monkeypatch):
+        cache = HclParseCache(max_entries=10, processes=1)
+        monkeypatch.setattr(HclParseCache, "PROCESS_POOL_MIN_BYTES", 0)
+
+        await cache.warm([test_tf_data, "variable {"])
+
+        assert list(cache._entries) == [cache.content_key(test_tf_data)]
+        with pytest.raises(UnexpectedInput):
+            _ = cache.parse("variable {")
+        cache._get_pool().shutdown()
+
+
 class TestTraverseDirectories:
     @pytest.mark.asyncio
     async def test_travers_directories_with_depth_1(self, mock_resource_service):
@@ -169,6 +221,80 @@ class TestLocalModuleResolution:
         assert sorted(ref.source for ref in refs) == ["../modules/network", "./naming"]
 
 
+class TestPinnedModuleResolution:
+    REPO_URL = "https://example.com/org/modules.git"
+
+    @staticmethod
+    def _git(*args: str, cwd) -> None:
+        _ = subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+    def _commit(self, repo, files: dict[str, str], tag: str | None = None) -> None:
+        for name, content in files.items():
+            os.makedirs(os.path.dirname(repo / name), exist_ok=True)
+            (repo / name).write_text(content)
+        self._git("add", ".", cwd=repo)
+        self._git("commit", "-q", "-m", "Update modules", cwd=repo)
+        if tag:
+            self._git("tag", tag, cwd=repo)
+
+    @pytest.mark.asyncio
+    async def test_pinned_modules_are_fetched_together_in_queue_order(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GIT_MIRROR_CACHE_MAX_BYTES", "0")
+        remote = tmp_path / "remote"
+        remote.mkdir()
+        self._git("init", "-q", "-b", "main", cwd=remote)
+        self._git("config", "user.email", "test@example.com", cwd=remote)
+        self._git("config", "user.name", "test", cwd=remote)
+        self._commit(
+            remote,
+            {
+                "modules/vpc/main.tf": 'resource "null_resource" "vpc" {\n  cidr = var.cidr   \n}\n',
+                "modules/vpc/variables.tf": 'variable "cidr" {}\n',
+                "modules/dns/main.tf": 'module "zone" {\n  source = "../zone"\n}\n',
+                "modules/zone/main.tf": 'resource "null_resource" "zone" {}\n',
+            },
+            tag="v1.0.0",
+        )
+        self._commit(remote, {"modules/iam/main.tf": 'resource "null_resource" "iam" {}\n'}, tag="v2.0.0")
+        self._commit(
+            remote,
+            {
+                "stacks/prod/main.tf": "\n".join(
+                    f'module "{name}" {{\n  source = "git::{self.REPO_URL}//modules/{name}?ref={ref}"\n}}'
+                    for name, ref in (("vpc", "v1.0.0"), ("dns", "v1.0.0"), ("iam", "v2.0.0"))
+                )
+            },
+        )
+
+        git_client = GitClient(
+            git_url=f"file://{remote}", workspace_path=str(tmp_path), repo_name="repo", environment_variables={}
+        )
+        await git_client.clone_branch("main")
+        tf = OtfProvider(
+            os.path.join(git_client.destination_dir, "stacks/prod"),
+            repo_root=git_client.destination_dir,
+            repo_url=self.REPO_URL,
+            source_code_ref="main",
+            git_client=git_client,
+            follow_modules=True,
+        )
+
+        with patch.object(git_client, "fetch_refs", wraps=git_client.fetch_refs) as fetch_refs:
+            await tf.read_files_to_string()
+
+        assert fetch_refs.call_args_list == [call(["v1.0.0", "v2.0.0"]), call(["v1.0.0"])]
+        assert re.findall(r"FILE: (\S+)", tf.tf_string_data) == [
+            "stacks/prod/main.tf@main",
+            "modules/vpc/main.tf@v1.0.0",
+            "modules/vpc/variables.tf@v1.0.0",
+            "modules/dns/main.tf@v1.0.0",
+            "modules/iam/main.tf@v2.0.0",
+            "modules/zone/main.tf@v1.0.0",
+        ]
+        # File contents are the text `git show` gave, without trailing whitespace
+        assert "  cidr = var.cidr\n}\n" in tf.tf_string_data
+
+
 class AsyncMockFile:
     def __init__(self):
         self.write = AsyncMock()
@@ -1,4 +1,3 @@
-import asyncio
 import json
 
 import pytest
@@ -40,7 +39,7 @@ class TestTaskWorker:
         mock_executor.execute = AsyncMock()
         monkeypatch.setattr(tw_mod, "SchedulerExecutor", lambda session: mock_executor)
 
-        task_worker = TaskWorker(session=mock_session, name="task_worker", lock=asyncio.Lock())
+        task_worker = TaskWorker(session=mock_session, name="task_worker")
 
         await task_worker.process_message(message=message)
 
@@ -55,7 +54,7 @@ class TestTaskWorker:
         message = Mock(spec=tw_mod.MessageHandler)
         message.raw_body = json_str.encode("utf-8")
 
-        task_worker = TaskWorker(session=mock_session, name="task_worker", lock=asyncio.Lock())
+        task_worker = TaskWorker(session=mock_session, name="task_worker")
 
         with pytest.raises(CannotProceed) as e:
             await task_worker.process_message(message=message)
@@ -77,7 +76,7 @@ class TestTaskWorker:
         message = Mock(spec=tw_mod.MessageHandler)
         message.raw_body = json_str.encode("utf-8")
 
-        task_worker = TaskWorker(session=mock_session, name="task_worker", lock=asyncio.Lock())
+        task_worker = TaskWorker(session=mock_session, name="task_worker")
 
         with pytest.raises(CannotProceed) as e:
             await task_worker.process_message(message=message)
@@ -94,7 +93,7 @@ class TestTaskWorker:
         message = Mock(spec=tw_mod.MessageHandler)
         message.raw_body = json_str.encode("utf-8")
 
-        task_worker = TaskWorker(session=mock_session, name="task_worker", lock=asyncio.Lock())
+        task_worker = TaskWorker(session=mock_session, name="task_worker")
 
         with pytest.raises(CannotProceed) as e:
             await task_worker.process_message(message=message)
@@ -109,7 +108,7 @@ class TestTaskWorker:
         message = Mock(spec=tw_mod.MessageHandler)
         message.raw_body = json_str.encode("utf-8")
 
-        task_worker = TaskWorker(session=mock_session, name="task_worker", lock=asyncio.Lock())
+        task_worker = TaskWorker(session=mock_session, name="task_worker")
 
         with pytest.raises(CannotProceed) as e:
             await task_worker.process_message(message=message)
@@ -131,7 +130,7 @@ class TestTaskWorker:
         message = Mock(spec=tw_mod.MessageHandler)
         message.raw_body = json_str.encode("utf-8")
 
-        task_worker = TaskWorker(session=mock_session, name="task_worker", lock=asyncio.Lock())
+        task_worker = TaskWorker(session=mock_session, name="task_worker")
 
         with pytest.raises(CannotProceed) as e:
             await task_worker.process_message(message=message)
@@ -153,7 +152,7 @@ class TestTaskWorker:
         message = Mock(spec=tw_mod.MessageHandler)
         message.raw_body = json_str.encode("utf-8")
 
-        task_worker = TaskWorker(session=mock_session, name="task_worker", lock=asyncio.Lock())
+        task_worker = TaskWorker(session=mock_session, name="task_worker")
 
         with pytest.raises(CannotProceed) as e:
             await task_worker.process_message(message=message)
@@ -175,7 +174,7 @@ class TestTaskWorker:
         message = Mock(spec=tw_mod.MessageHandler)
         message.raw_body = json_str.encode("utf-8")
 
-        task_worker = TaskWorker(session=mock_session, name="task_worker", lock=asyncio.Lock())
+        task_worker = TaskWorker(session=mock_session, name="task_worker")
 
         with pytest.raises(CannotProceed) as e:
             await task_worker.process_message(message=message)
@@ -183,6 +182,27 @@ class TestTaskWorker:
         assert e.type is CannotProceed
         assert e.value.args[0] == "Scheduler job_script is not defined in message"
 
+    def test_concurrency_must_be_positive(self, mock_session):
+        with pytest.raises(ValueError):
+            TaskWorker(session=mock_session, name="task_worker", concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_track_tasks_with_concurrency(self, mock_session):
+        task_worker = TaskWorker(session=mock_session, name="task_worker", concurrency=2)
+
+        await task_worker.track_task_started("first", {"entity": "resource", "action": "dryrun"})
+        assert task_worker.worker.status == "free"
+        assert len(task_worker.worker.current_tasks) == 1
+
+        await task_worker.track_task_started("second", {"entity": "resource", "action": "execute"})
+        assert task_worker.worker.status == "busy"
+        assert task_worker.worker.current_task == {"entity": "resource", "action": "execute"}
+
+        await task_worker.track_task_finished("first")
+        assert task_worker.worker.status == "free"
+        assert [t["task_id"] for t in task_worker.worker.current_tasks] == ["second"]
+        assert task_worker.worker.tasks_completed == 1
+
     @pytest.mark.asyncio
     async def test_send_task_notification_success(self, mock_session, mock_task_controller, monkeypatch):
         mock_task_controller.logger.entity_id = "test_entity_123"
@@ -191,7 +211,7 @@ class TestTaskWorker:
         mock_publish = AsyncMock()
         monkeypatch.setattr(tw_mod, "publish_notification_event", mock_publish)
 
-        task_worker = TaskWorker(session=mock_session, name="task_worker", lock=asyncio.Lock())
+        task_worker = TaskWorker(session=mock_session, name="task_worker")
 
         test_message = "Test notification message"
         await task_worker.send_task_notification(mock_task_controller, test_message)
@@ -215,7 +235,7 @@ class TestTaskWorker:
         mock_publish = AsyncMock()
         monkeypatch.setattr(tw_mod, "publish_notification_event", mock_publish)
 
-        task_worker = TaskWorker(session=mock_session, name="task_worker", lock=asyncio.Lock())
+        task_worker = TaskWorker(session=mock_session, name="task_worker")
 
         action = "deploy"
         await task_worker._send_success_notification(mock_task_controller, action)
@@ -240,7 +260,7 @@ class TestTaskWorker:
         mock_publish = AsyncMock()
         monkeypatch.setattr(tw_mod, "publish_notification_event", mock_publish)
 
-        task_worker = TaskWorker(session=mock_session, name="task_worker", lock=asyncio.Lock())
+        task_worker = TaskWorker(session=mock_session, name="task_worker")
 
         test_exception = CannotProceed("Test error message")
 
@@ -274,7 +294,7 @@ class TestTaskWorker:
         mock_publish = AsyncMock()
         monkeypatch.setattr(tw_mod, "publish_notification_event", mock_publish)
 
-        task_worker = TaskWorker(session=mock_session, name="task_worker", lock=asyncio.Lock())
+        task_worker = TaskWorker(session=mock_session, name="task_worker")
 
         from core.errors import ParentIsNotReady
 
@@ -303,7 +323,7 @@ class TestTaskWorker:
         mock_publish = AsyncMock()
         monkeypatch.setattr(tw_mod, "publish_notification_event", mock_publish)
 
-        task_worker = TaskWorker(session=mock_session, name="task_worker", lock=asyncio.Lock())
+        task_worker = TaskWorker(session=mock_session, name="task_worker")
 
         from core.errors import ExitWithoutSave
 
@@ -332,7 +352,7 @@ class TestTaskWorker:
         mock_publish = AsyncMock()
         monkeypatch.setattr(tw_mod, "publish_notification_event", mock_publish)
 
-        task_worker = TaskWorker(session=mock_session, name="task_worker", lock=asyncio.Lock())
+        task_worker = TaskWorker(session=mock_session, name="task_worker")
 
         test_exception = RuntimeError("Unexpected runtime error")
 
@@ -358,7 +378,7 @@ class TestTaskWorker:
         mock_publish = AsyncMock()
         monkeypatch.setattr(tw_mod, "publish_notification_event", mock_publish)
 
-        task_worker = TaskWorker(session=mock_session, name="task_worker", lock=asyncio.Lock())
+        task_worker = TaskWorker(session=mock_session, name="task_worker")
 
         test_cases = [
             ("storage_entity_123", "my_storage"),
@@ -146,7 +146,7 @@ from .fixtures.test_user_fixtures import (
     mocked_user_response,
 )
 from .fixtures.test_workspace_fixtures import mock_workspace_crud, mock_workspace_service, workspace_response, workspace
-from .fixtures.test_tools_fixtures import mock_stream_subprocess
+from .fixtures.test_tools_fixtures import mock_git_mirror_cache, mock_stream_subprocess
 
 __all__ = [
     "mock_template_crud",
@@ -244,6 +244,7 @@ __all__ = [
     "mock_task_controller",
     "mock_task_controller_factory",
     "mock_stream_subprocess",
+    "mock_git_mirror_cache",
     "mock_batch_operation_crud",
     "mock_batch_operation_service",
     "batch_operation_response",
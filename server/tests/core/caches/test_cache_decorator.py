@@ -0,0 +1,144 @@
+import asyncio
+import time
+
+import pytest
+
+from core.caches.backends import (
+    MemoryCacheBackend,
+    TieredCacheBackend,
+    create_cache_backend,
+    set_cache_backend,
+)
+from core.caches.functions import cache_decorator, make_cache_key
+
+
+@pytest.fixture
+def shared_backend():
+    # Local stand-in for the shared cache
+    return MemoryCacheBackend(max_entries=100)
+
+
+@pytest.fixture
+def tiered_backend(shared_backend):
+    backend = TieredCacheBackend(MemoryCacheBackend(max_entries=10), shared_backend)
+    set_cache_backend(backend)
+    yield backend
+    set_cache_backend(None)
+
+
+class TestMemoryCacheBackend:
+    @pytest.mark.asyncio
+    async def test_least_recently_used_is_evicted(self):
+        backend = MemoryCacheBackend(max_entries=2)
+        await backend.set("module", "a", b"a", ttl=60)
+        await backend.set("module", "b", b"b", ttl=60)
+        assert await backend.get("module", "a") is not None
+
+        await backend.set("module", "c", b"c", ttl=60)
+
+        assert await backend.get("module", "b") is None
+        assert await backend.get("module", "a") is not None
+        assert len(backend) == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_a_miss(self):
+        backend = MemoryCacheBackend()
+        await backend.set("module", "a", b"a", ttl=-1)
+
+        assert await backend.get("module", "a") is None
+        assert len(backend) == 0
+
+
+class TestTieredCacheBackend:
+    @pytest.mark.asyncio
+    async def test_shared_hit_populates_local(self, shared_backend):
+        local = MemoryCacheBackend()
+        backend = TieredCacheBackend(local, shared_backend)
+        await shared_backend.set("module", "a", b"a", ttl=30)
+
+        entry = await backend.get("module", "a")
+
+        assert entry is not None and entry.value == b"a"
+        local_entry = await local.get("module", "a")
+        assert local_entry is not None
+        assert local_entry.expire_at <= time.time() + 30
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            _ = create_cache_backend("redis")
+
+
+class TestCacheDecorator:
+    @pytest.mark.asyncio
+    async def test_result_is_cached(self, tiered_backend, shared_backend):
+        calls = []
+
+        @cache_decorator(ttl=60)
+        async def fetch(name: str) -> dict[str, str]:
+            calls.append(name)
+            return {"name": name}
+
+        assert await fetch("a") == {"name": "a"}
+        assert await fetch("a") == {"name": "a"}
+        assert await fetch("b") == {"name": "b"}
+
+        assert calls == ["a", "b"]
+        assert len(shared_backend) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_are_coalesced(self, tiered_backend):
+        calls = 0
+
+        @cache_decorator(ttl=60)
+        async def fetch() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(fetch() for _ in range(5)))
+
+        assert results == ["value"] * 5
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_callers_during_the_cache_write_are_coalesced(self, tiered_backend, monkeypatch):
+        calls = 0
+        stored = asyncio.Event()
+        set_value = tiered_backend.set
+
+        async def slow_set(*args):
+            await stored.wait()
+            await set_value(*args)
+
+        monkeypatch.setattr(tiered_backend, "set", slow_set)
+
+        @cache_decorator(ttl=60)
+        async def fetch() -> str:
+            nonlocal calls
+            calls += 1
+            return "value"
+
+        first = asyncio.ensure_future(fetch())
+        while calls == 0:
+            await asyncio.sleep(0)
+        late = asyncio.ensure_future(fetch())
+        await asyncio.sleep(0)
+        stored.set()
+
+        assert await asyncio.gather(first, late) == ["value", "value"]
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, tiered_backend):
+        @cache_decorator(ttl=60)
+        async def fetch() -> str:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            _ = await fetch()
+        with pytest.raises(RuntimeError):
+            _ = await fetch()
+
+    def test_key_has_fixed_length(self):
+        assert len(make_cache_key("fetch", "", "{}")) == len(make_cache_key("fetch", repr(["x"] * 1000), "{}")) == 64
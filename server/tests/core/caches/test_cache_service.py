@@ -0,0 +1,61 @@
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from core.caches.crud import CacheCRUD
+from core.caches.model import Cache
+from core.caches.schema import CacheCreate
+from core.caches.service import CacheService
+
+
+@pytest.fixture
+def mock_cache_crud():
+    crud = Mock(spec=CacheCRUD)
+    crud.upsert = AsyncMock()
+    crud.delete_expired = AsyncMock()
+    crud.commit = AsyncMock()
+    return crud
+
+
+@pytest.fixture
+def mock_cache_service(mock_cache_crud):
+    return CacheService(crud=mock_cache_crud)
+
+
+class TestSetCache:
+    @pytest.mark.asyncio
+    async def test_set_cache_upserts(self, mock_cache_service, mock_cache_crud):
+        mock_cache_crud.upsert.return_value = Cache(
+            id=uuid4(), module="module", key="key", value=b"value", expire_at=datetime.now(UTC)
+        )
+
+        result = await mock_cache_service.set_cache(CacheCreate(module="module", key="key", value=b"value"), ttl=60)
+
+        body = mock_cache_crud.upsert.await_args.args[0]
+        assert body["module"] == "module" and body["key"] == "key"
+        assert body["expire_at"] > datetime.now(UTC) + timedelta(seconds=50)
+        mock_cache_crud.commit.assert_awaited_once()
+        assert result.value == b"value"
+
+
+class TestDeleteExpired:
+    @pytest.mark.asyncio
+    async def test_deletes_in_batches_until_drained(self, mock_cache_service, mock_cache_crud):
+        mock_cache_crud.delete_expired.side_effect = [10, 10, 3]
+
+        deleted = await mock_cache_service.delete_expired(batch_size=10)
+
+        assert deleted == 23
+        assert mock_cache_crud.delete_expired.await_count == 3
+        assert mock_cache_crud.commit.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_stops_after_max_batches(self, mock_cache_service, mock_cache_crud):
+        mock_cache_crud.delete_expired.return_value = 10
+
+        deleted = await mock_cache_service.delete_expired(batch_size=10, max_batches=2)
+
+        assert deleted == 20
+        assert mock_cache_crud.delete_expired.await_count == 2
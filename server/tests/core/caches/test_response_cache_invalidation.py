@@ -0,0 +1,43 @@
+import pytest
+
+import core.caches.response_cache as response_cache
+from core.caches.response_cache import ANY_ENTITY, ResponseCache, invalidate_response_cache
+
+
+@pytest.fixture
+def cache(monkeypatch) -> ResponseCache:
+    cache = ResponseCache(max_entries=10)
+    cache.set("templates", {"templates": []}, frozenset({"template"}), ttl=60)
+    cache.set("labels", {"labels": []}, frozenset({ANY_ENTITY}), ttl=60)
+    cache.set("config", {"globalConfig": {}}, frozenset(), ttl=60)
+    monkeypatch.setattr(response_cache, "_response_cache", cache)
+    return cache
+
+
+def test_expired_entry_is_a_miss() -> None:
+    cache = ResponseCache()
+    cache.set("key", {"a": 1}, frozenset(), ttl=-1)
+
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_entity_event_drops_the_entries_reading_it(cache) -> None:
+    invalidate_response_cache({"_metadata": {"event": "update", "entity": "template"}})
+
+    assert cache.get("templates") is None
+    assert cache.get("labels") is None
+    assert cache.get("config") is not None
+
+
+def test_entity_is_read_from_the_routing_key(cache) -> None:
+    invalidate_response_cache({"_metadata": {"_routing_key": "events.resource.1"}})
+
+    assert cache.get("templates") is not None
+    assert cache.get("labels") is None
+
+
+def test_event_without_entity_clears_everything(cache) -> None:
+    invalidate_response_cache({"_metadata": {"event": "reload_policies", "_routing_key": ""}})
+
+    assert len(cache) == 0
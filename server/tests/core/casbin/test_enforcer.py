@@ -1,8 +1,13 @@
 from unittest.mock import AsyncMock, MagicMock
+import os
 import uuid
+
+import casbin
 import pytest
 
-from core.casbin.enforcer import CasbinEnforcer
+import core.casbin.enforcer as enforcer_module
+from core.casbin.enforcer import CasbinEnforcer, record_policy_change, start_enforce_calls_count
+from core.permissions.model import Permission
 
 
 class TestCasbinEnforcer:
@@ -34,6 +39,9 @@ class TestCasbinEnforcer:
             async def load_policy(self):
                 return await fake_enforcer.load_policy()
 
+            def enable_auto_save(self, auto_save):
+                fake_enforcer.enable_auto_save(auto_save)
+
             def get_policy(self):
                 return fake_enforcer.get_policy()
 
@@ -44,6 +52,7 @@ class TestCasbinEnforcer:
         await self.enforcer.init_enforcer()
 
         fake_enforcer.load_policy.assert_awaited_once()
+        fake_enforcer.enable_auto_save.assert_called_once_with(False)
         assert self.enforcer.enforcer is not None, "Enforcer should be initialized"
         assert self.enforcer.enforcer.get_policy() == [["alice", "data", "read"]], "Policy should match expected value"
         assert await self.enforcer.get_enforcer() is self.enforcer.enforcer, (
@@ -86,3 +95,182 @@ class TestGetUserRoles:
         invalid_user_id = "not-a-uuid"
         with pytest.raises(ValueError, match=r"User ID must be a valid UUID"):
             await self.enforcer.get_user_roles(invalid_user_id)
+
+
+class TestDecisionCache:
+    mock_adapter: MagicMock = MagicMock()
+    enforcer: CasbinEnforcer  # pyright: ignore[reportUninitializedInstanceVariable]
+    casbin_enforcer: MagicMock  # pyright: ignore[reportUninitializedInstanceVariable]
+
+    def setup_method(self):
+        self.mock_adapter = MagicMock()
+
+        CasbinEnforcer._instances.clear()
+        self.enforcer = CasbinEnforcer(adapter=self.mock_adapter, rabbitmq=MagicMock())
+        # Kept typed as a mock, the enforcer's own attribute is an Optional AsyncEnforcer
+        self.casbin_enforcer = MagicMock()
+        self.casbin_enforcer.load_policy = AsyncMock()
+        self.casbin_enforcer.enforce.side_effect = lambda sub, obj, act: act == "write"
+        self.enforcer.enforcer = self.casbin_enforcer
+
+    def test_decisions_are_cached(self):
+        assert self.enforcer.enforce("user:1", "api:resource", "write") is True
+        assert self.enforcer.enforce("user:1", "api:resource", "write") is True
+        assert self.enforcer.enforce("user:1", "api:resource", "admin") is False
+
+        assert self.casbin_enforcer.enforce.call_count == 2
+
+    def test_highest_action(self):
+        assert self.enforcer.get_highest_action("user:1", "resource:1") == "write"
+        assert self.enforcer.has_access("user:1", "resource:1", "read") is True
+        assert self.enforcer.has_access("user:1", "resource:1", "write") is True
+        assert self.enforcer.has_access("user:1", "resource:1", "admin") is False
+
+        # admin and write evaluated once, the rest is served from the cache
+        assert self.casbin_enforcer.enforce.call_count == 2
+
+    def test_no_access(self):
+        self.casbin_enforcer.enforce.side_effect = None
+        self.casbin_enforcer.enforce.return_value = False
+
+        assert self.enforcer.get_highest_action("user:1", "resource:1") is None
+        assert self.enforcer.has_access("user:1", "resource:1", "read") is False
+
+    @pytest.mark.asyncio
+    async def test_reload_clears_cache(self):
+        _ = self.enforcer.get_highest_action("user:1", "resource:1")
+        self.casbin_enforcer.enforce.side_effect = lambda sub, obj, act: act == "admin"
+
+        await self.enforcer.reload_policies()
+
+        self.casbin_enforcer.load_policy.assert_awaited_once()
+        assert self.enforcer.get_highest_action("user:1", "resource:1") == "admin"
+
+    def test_enforce_calls_are_counted(self):
+        calls = start_enforce_calls_count()
+
+        _ = self.enforcer.has_access("user:1", "resource:1", "read")
+        _ = self.enforcer.has_access("user:1", "resource:1", "write")
+
+        assert calls == [2]
+
+
+class TestPolicyChangeEvents:
+    enforcer: CasbinEnforcer  # pyright: ignore[reportUninitializedInstanceVariable]
+    casbin_enforcer: MagicMock  # pyright: ignore[reportUninitializedInstanceVariable]
+
+    def setup_method(self):
+        CasbinEnforcer._instances.clear()
+        self.enforcer = CasbinEnforcer(adapter=MagicMock(), rabbitmq=MagicMock())
+        self.casbin_enforcer = MagicMock()
+        self.casbin_enforcer.has_named_policy.return_value = False
+        self.casbin_enforcer.has_named_grouping_policy.return_value = True
+        self.enforcer.enforcer = self.casbin_enforcer
+        for method in (
+            "load_policy",
+            "add_named_policies",
+            "remove_named_policies",
+            "add_named_grouping_policies",
+            "remove_named_grouping_policies",
+        ):
+            setattr(self.casbin_enforcer, method, AsyncMock())
+
+    @pytest.mark.asyncio
+    async def test_send_reload_event_carries_changed_rules(self, monkeypatch):
+        sent = []
+
+        async def send_message(_, message):
+            sent.append(message)
+
+        monkeypatch.setattr(enforcer_module.EventSender, "send_message", send_message)
+        record_policy_change(Permission(ptype="p", v0="infra", v1="api:resource", v2="write"))
+
+        await self.enforcer.send_reload_event()
+        await self.enforcer.send_reload_event()
+
+        assert sent[0].body["rules"] == [["p", "infra", "api:resource", "write"]]
+        assert sent[0].body["version"] + 1 == sent[1].body["version"]
+        # nothing recorded since the previous event, receivers do a full reload
+        assert "rules" not in sent[1].body
+
+    @pytest.mark.asyncio
+    async def test_apply_changes_against_database(self, monkeypatch):
+        stored = {("p", "infra", "api:resource", "write")}
+        monkeypatch.setattr(self.enforcer, "_get_stored_rules", AsyncMock(return_value=stored))
+
+        await self.enforcer.apply_policy_event(
+            {
+                "origin": "pod",
+                "version": 1,
+                "rules": [["p", "infra", "api:resource", "write"], ["g", "user:1", "infra"]],
+            }
+        )
+
+        self.casbin_enforcer.add_named_policies.assert_awaited_once_with("p", [["infra", "api:resource", "write"]])
+        self.casbin_enforcer.remove_named_grouping_policies.assert_awaited_once_with("g", [["user:1", "infra"]])
+        self.casbin_enforcer.load_policy.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_missed_event_triggers_full_reload(self, monkeypatch):
+        monkeypatch.setattr(self.enforcer, "_get_stored_rules", AsyncMock(return_value=set()))
+        rules = [["p", "infra", "api:resource", "write"]]
+
+        await self.enforcer.apply_policy_event({"origin": "pod", "version": 1, "rules": rules})
+        await self.enforcer.apply_policy_event({"origin": "pod", "version": 3, "rules": rules})
+
+        self.casbin_enforcer.load_policy.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_event_without_rules_triggers_full_reload(self):
+        await self.enforcer.apply_policy_event({})
+
+        self.casbin_enforcer.load_policy.assert_awaited_once()
+
+
+class TestBatchHighestActions:
+    enforcer: CasbinEnforcer  # pyright: ignore[reportUninitializedInstanceVariable]
+
+    @pytest.fixture(autouse=True)
+    async def setup_enforcer(self):
+        CasbinEnforcer._instances.clear()
+        self.enforcer = CasbinEnforcer(adapter=MagicMock(), rabbitmq=MagicMock())
+        self.enforcer.enforcer = casbin.AsyncEnforcer(
+            os.path.join(os.path.dirname(enforcer_module.__file__), "model.conf")
+        )
+        _ = await self.enforcer.enforcer.add_policies(
+            [
+                ["infra", "resource:*", "read"],
+                ["infra", "resource:1", "write"],
+                ["user:2", "resource:2", "admin"],
+                ["super", "*", "admin"],
+            ]
+        )
+        _ = await self.enforcer.enforcer.add_grouping_policies([["user:1", "infra"], ["user:2", "infra"]])
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single_decisions(self):
+        objs = ["resource:1", "resource:2", "resource:3", "project:1"]
+
+        for user in ("user:1", "user:2", "user:3"):
+            batch = await self.enforcer.get_highest_actions(user, objs)
+            self.enforcer.clear_decision_cache()
+            single = [self.enforcer.get_highest_action(user, obj) for obj in objs]
+            self.enforcer.clear_decision_cache()
+            assert batch == single
+
+        assert await self.enforcer.get_highest_actions("user:1", objs) == ["write", "read", "read", None]
+
+    @pytest.mark.asyncio
+    async def test_permission_fingerprint_is_shared_by_equal_permissions(self):
+        assert self.enforcer.enforcer is not None
+        _ = await self.enforcer.enforcer.add_grouping_policy("user:4", "infra")
+
+        fingerprint = await self.enforcer.get_permission_fingerprint("user:1")
+
+        assert await self.enforcer.get_permission_fingerprint("user:4") == fingerprint
+        assert await self.enforcer.get_permission_fingerprint("user:2") != fingerprint
+
+        _ = await self.enforcer.enforcer.add_policy("user:4", "resource:4", "write")
+        self.enforcer.clear_decision_cache()
+
+        assert await self.enforcer.get_permission_fingerprint("user:4") != fingerprint
@@ -0,0 +1,60 @@
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.orm import declarative_base
+
+from core.database import approximate_count
+
+Base = declarative_base()
+
+
+class MockLog(Base):
+    __tablename__ = "mock_logs"
+    id = Column(Integer, primary_key=True)
+    entity = Column(String)
+
+
+def _explain(rows: int) -> str:
+    return json.dumps([{"Plan": {"Node Type": "Seq Scan", "Plan Rows": rows}}])
+
+
+def _sql(session: AsyncMock, call: int) -> str:
+    return str(session.scalar.await_args_list[call].args[0])
+
+
+class TestApproximateCount:
+    @pytest.mark.asyncio
+    async def test_table_statistics_without_filter(self):
+        session = AsyncMock()
+        session.scalar.return_value = 25_000_000
+
+        assert await approximate_count(session, MockLog) == (25_000_000, False)
+        assert "pg_class" in _sql(session, 0)
+        assert session.scalar.await_args_list[0].args[1] == {"table": "mock_logs"}
+
+    @pytest.mark.asyncio
+    async def test_planner_estimate_with_filter(self):
+        session = AsyncMock()
+        session.scalar.return_value = _explain(120_000)
+
+        assert await approximate_count(session, MockLog, {"entity": "resource"}) == (120_000, False)
+        assert _sql(session, 0).startswith("EXPLAIN (FORMAT JSON) SELECT 1")
+        assert "mock_logs.entity = :entity_1" in _sql(session, 0)
+        assert session.scalar.await_args_list[0].args[0].compile().params == {"entity_1": "resource"}
+
+    @pytest.mark.asyncio
+    async def test_small_estimate_is_counted_exactly(self):
+        session = AsyncMock()
+        session.scalar.side_effect = [_explain(12), 9]
+
+        assert await approximate_count(session, MockLog, {"entity": "resource"}) == (9, True)
+        assert "count(*)" in _sql(session, 1)
+
+    @pytest.mark.asyncio
+    async def test_never_analyzed_table_is_counted_exactly(self):
+        session = AsyncMock()
+        session.scalar.side_effect = [-1, 42]
+
+        assert await approximate_count(session, MockLog) == (42, True)
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, create_engine, select
+from sqlalchemy.orm import Session, declarative_base, relationship
+
+from core.database import (
+    KEYSET_MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    evaluate_sqlalchemy_keyset_pagination,
+    keyset_page,
+)
+
+Base = declarative_base()
+START = datetime(2024, 1, 1)
+
+
+class MockTemplate(Base):
+    __tablename__ = "mock_template"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+class MockEntity(Base):
+    __tablename__ = "mock_entity"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    created_at = Column(DateTime)
+    template_id = Column(Integer, ForeignKey("mock_template.id"))
+    template = relationship(MockTemplate)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([MockTemplate(id=1, name="b"), MockTemplate(id=2, name="a")])
+        session.add_all(
+            [
+                # Duplicated names and timestamps make sure ties are broken by the id
+                MockEntity(
+                    id=i, name=f"entity-{i // 2}", created_at=START + timedelta(hours=i // 3), template_id=i % 2 + 1
+                )
+                for i in range(1, 11)
+            ]
+        )
+        session.commit()
+        yield session
+
+
+def _all_pages(session: Session, sort: tuple[str, str] | None, limit: int) -> list[list[int]]:
+    pages: list[list[int]] = []
+    cursor = None
+    while True:
+        statement = evaluate_sqlalchemy_keyset_pagination(MockEntity, select(MockEntity), sort, cursor, limit)
+        entities, cursor = keyset_page(session.execute(statement).all(), sort, limit)
+        pages.append([entity.id for entity in entities])
+        if cursor is None:
+            return pages
+
+
+class TestKeysetPagination:
+    def test_default_order_is_primary_key(self, session):
+        assert _all_pages(session, None, 4) == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10]]
+
+    @pytest.mark.parametrize(
+        "sort",
+        [("name", "asc"), ("name", "desc"), ("createdAt", "asc"), ("created_at", "desc"), ("template.name", "asc")],
+    )
+    def test_pages_match_offset_order(self, session, sort):
+        field, direction = sort
+        expected = session.execute(select(MockEntity)).scalars().all()
+        key = {
+            "name": lambda e: e.name,
+            "createdAt": lambda e: e.created_at,
+            "created_at": lambda e: e.created_at,
+            "template.name": lambda e: e.template.name,
+        }[field]
+        expected = sorted(expected, key=lambda e: (key(e), e.id), reverse=direction == "desc")
+
+        pages = _all_pages(session, sort, 3)
+
+        assert [entity_id for page in pages for entity_id in page] == [e.id for e in expected]
+        assert all(len(page) == 3 for page in pages[:-1])
+
+    def test_last_full_page_has_no_cursor(self, session):
+        assert _all_pages(session, None, 5) == [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10]]
+
+    @pytest.mark.parametrize("limit", [0, -1])
+    def test_non_positive_limit_is_rejected(self, limit):
+        with pytest.raises(ValueError, match="Page size"):
+            _ = evaluate_sqlalchemy_keyset_pagination(MockEntity, select(MockEntity), None, None, limit)
+
+    def test_limit_is_clamped(self, session):
+        statement = evaluate_sqlalchemy_keyset_pagination(MockEntity, select(MockEntity), None, None, 10**9)
+
+        assert statement.compile().params["param_1"] == KEYSET_MAX_PAGE_SIZE + 1
+        assert len(_all_pages(session, None, 10**9)) == 1
+
+    def test_cursor_of_other_sort_is_rejected(self):
+        cursor = encode_cursor(["name", "entity-1", 2])
+
+        with pytest.raises(ValueError, match="sort field"):
+            _ = evaluate_sqlalchemy_keyset_pagination(MockEntity, select(MockEntity), ("created_at", "asc"), cursor)
+
+    def test_invalid_cursor(self):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            _ = decode_cursor("not a cursor")
+
+    def test_null_values_follow_postgres_ordering(self):
+        cursor = encode_cursor(["name", None, 3])
+
+        statement = evaluate_sqlalchemy_keyset_pagination(MockEntity, select(MockEntity), ("name", "desc"), cursor)
+
+        sql = str(statement.compile(compile_kwargs={"literal_binds": True}))
+        assert "mock_entity.name IS NULL AND mock_entity.id < 3 OR mock_entity.name IS NOT NULL" in sql
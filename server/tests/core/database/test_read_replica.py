@@ -0,0 +1,86 @@
+import time
+from http.cookies import SimpleCookie
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from starlette.requests import Request
+from starlette.responses import Response
+
+from core import read_replica
+from core.config import Settings
+from core.database import SessionLocal
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    replica_sessionmaker = MagicMock()
+    monkeypatch.setattr(read_replica, "ReplicaSessionLocal", replica_sessionmaker)
+    monkeypatch.setattr(read_replica, "_replica_lag", 0.5)
+    return replica_sessionmaker
+
+
+class TestReadSessionmaker:
+    def test_primary_without_replica(self, monkeypatch):
+        monkeypatch.setattr(read_replica, "ReplicaSessionLocal", None)
+
+        assert read_replica.read_sessionmaker() is SessionLocal
+
+    def test_replica(self, replica):
+        assert read_replica.read_sessionmaker() is replica
+
+    def test_primary_when_replica_lags(self, replica, monkeypatch):
+        monkeypatch.setattr(read_replica, "_replica_lag", Settings().REPLICA_MAX_LAG_SECONDS + 1)
+
+        assert read_replica.read_sessionmaker() is SessionLocal
+
+    def test_primary_before_lag_is_known(self, replica, monkeypatch):
+        monkeypatch.setattr(read_replica, "_replica_lag", None)
+
+        assert read_replica.read_sessionmaker() is SessionLocal
+
+    def test_read_your_writes(self, replica, monkeypatch):
+        monkeypatch.setenv("READ_YOUR_WRITES_SECONDS", "5")
+        response = Response()
+
+        read_replica.record_write(response)
+
+        cookie = SimpleCookie(response.headers["set-cookie"])[read_replica.READ_YOUR_WRITES_COOKIE]
+        assert cookie["max-age"] == "5"
+        writer = Request({"type": "http", "headers": [(b"cookie", f"{cookie.key}={cookie.value}".encode())]})
+        assert read_replica.read_sessionmaker(writer) is SessionLocal
+        assert read_replica.read_sessionmaker(Request({"type": "http", "headers": []})) is replica
+        assert read_replica.read_sessionmaker(None) is replica
+
+    def test_read_your_writes_expired(self, replica, monkeypatch):
+        monkeypatch.setenv("READ_YOUR_WRITES_SECONDS", "5")
+        written_at = time.time() - 10
+        writer = Request(
+            {"type": "http", "headers": [(b"cookie", f"{read_replica.READ_YOUR_WRITES_COOKIE}={written_at}".encode())]}
+        )
+
+        assert read_replica.read_sessionmaker(writer) is replica
+
+    def test_read_your_writes_disabled(self, replica, monkeypatch):
+        monkeypatch.setenv("READ_YOUR_WRITES_SECONDS", "0")
+        response = Response()
+
+        read_replica.record_write(response)
+
+        assert "set-cookie" not in response.headers
+
+
+class TestMeasureReplicaLag:
+    @pytest.mark.asyncio
+    async def test_lag_is_stored(self, replica):
+        session = replica.return_value.__aenter__.return_value
+        session.scalar = AsyncMock(return_value=2.5)
+
+        assert await read_replica.measure_replica_lag() == 2.5
+        assert read_replica._replica_lag == 2.5
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_routes_to_primary(self, replica):
+        replica.return_value.__aenter__.side_effect = OSError("connection refused")
+
+        assert await read_replica.measure_replica_lag() is None
+        assert read_replica.read_sessionmaker() is SessionLocal
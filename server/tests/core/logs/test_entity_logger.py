@@ -0,0 +1,99 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+import core.custom_entity_log_controller as entity_log_module
+from core.custom_entity_log_controller import EntityLogger
+
+
+@pytest.fixture
+def mock_session(monkeypatch):
+    session = Mock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+
+    @asynccontextmanager
+    async def get_async_session():
+        yield session
+
+    monkeypatch.setattr(entity_log_module, "get_async_session", get_async_session)
+    return session
+
+
+@pytest.fixture
+def mock_publish_many(monkeypatch):
+    publish_many = AsyncMock()
+    monkeypatch.setattr(entity_log_module.RabbitMQConnection, "publish_many", publish_many)
+    return publish_many
+
+
+def make_logger(**kwargs) -> EntityLogger:
+    return EntityLogger(entity_name="resource", entity_id=uuid.uuid4(), revision_number=1, **kwargs)
+
+
+class TestEntityLogger:
+    @pytest.mark.asyncio
+    async def test_save_log_inserts_rows_in_one_statement(self, mock_session, mock_publish_many):
+        logger = make_logger()
+        logger.add_log_header("header")
+        logger.info("first")
+        logger.error("second")
+
+        await logger.save_log()
+
+        mock_session.execute.assert_awaited_once()
+        rows = mock_session.execute.await_args.args[1]
+        assert [row["data"] for row in rows] == ["header", "first", "second"]
+        assert [row["level"] for row in rows] == ["header", "info", "error"]
+        assert len(logger.bulk_logs_operations) == 0
+
+    @pytest.mark.asyncio
+    async def test_consecutive_lines_are_merged(self, mock_session, mock_publish_many):
+        logger = make_logger()
+        logger.info("one")
+        logger.info("two")
+        logger.error("three")
+        logger.info("four")
+
+        await logger.save_log()
+
+        messages = mock_publish_many.await_args.args[0]
+        assert [message.body["lines"] for message in messages] == [["one", "two"], ["three"], ["four"]]
+        assert messages[0].body["data"] == "one\ntwo"
+        assert messages[0].routing_key == f"logs.resource.{logger.entity_id}"
+
+    @pytest.mark.asyncio
+    async def test_flush_when_line_limit_reached(self, mock_session, mock_publish_many):
+        logger = make_logger(flush_lines=3, flush_interval_ms=60_000)
+        logger.info("one")
+        logger.info("two")
+        await asyncio.sleep(0)
+        mock_session.execute.assert_not_awaited()
+
+        logger.info("three")
+        assert logger._flush_task is not None
+        await logger._flush_task
+
+        mock_session.execute.assert_awaited_once()
+        assert len(mock_session.execute.await_args.args[1]) == 3
+
+    @pytest.mark.asyncio
+    async def test_flush_after_interval(self, mock_session, mock_publish_many):
+        logger = make_logger(flush_lines=100, flush_interval_ms=10)
+        logger.info("one")
+
+        await asyncio.sleep(0.05)
+
+        mock_session.execute.assert_awaited_once()
+        mock_publish_many.assert_awaited()
+
+    def test_buffer_drops_oldest_lines(self):
+        logger = make_logger(buffer_size=2)
+        logger.info("one")
+        logger.info("two")
+        logger.info("three")
+
+        assert [row["data"] for row in logger.bulk_logs_operations] == ["two", "three"]
@@ -61,10 +61,10 @@ class TestRouteNotificationEvent:
             created_messages.append(body)
             return body
 
-        mock_send_message = AsyncMock()
+        mock_send_messages = AsyncMock()
         mock_dispatch_notification = AsyncMock()
         monkeypatch.setattr(notification_manager_module, "create_in_app_message", mock_create_message)
-        monkeypatch.setattr(notification_manager_module, "send_message", mock_send_message)
+        monkeypatch.setattr(notification_manager_module, "send_messages", mock_send_messages)
         monkeypatch.setattr(notification_manager_module, "_dispatch_notification", mock_dispatch_notification)
 
         event = NotificationEvent(
@@ -116,10 +116,10 @@ class TestRouteNotificationEvent:
             "channel": "U123",
         }
 
-        # Both channels go through _dispatch_notification
-        assert mock_dispatch_notification.await_count == 2
-        mock_dispatch_notification.assert_any_await(in_app_body)
-        mock_dispatch_notification.assert_any_await(slack_body)
+        # In-app messages are published in one batch, external providers go through _dispatch_notification
+        assert created_messages == [in_app_body]
+        mock_send_messages.assert_awaited_once_with([in_app_body])
+        mock_dispatch_notification.assert_awaited_once_with(slack_body)
 
     @pytest.mark.asyncio
     async def test_route_notification_no_subscriptions_sends_nothing(
@@ -151,9 +151,9 @@ class TestRouteNotificationEvent:
             lambda session: mock_notification_preference_service,
         )
 
-        mock_send_message = AsyncMock()
+        mock_send_messages = AsyncMock()
         mock_dispatch_notification = AsyncMock()
-        monkeypatch.setattr(notification_manager_module, "send_message", mock_send_message)
+        monkeypatch.setattr(notification_manager_module, "send_messages", mock_send_messages)
         monkeypatch.setattr(notification_manager_module, "_dispatch_notification", mock_dispatch_notification)
 
         event = NotificationEvent(
@@ -167,7 +167,7 @@ class TestRouteNotificationEvent:
 
         await _route_notification_event(event, mock_session)
 
-        mock_send_message.assert_not_awaited()
+        mock_send_messages.assert_not_awaited()
         mock_dispatch_notification.assert_not_awaited()
 
     @pytest.mark.asyncio
@@ -204,9 +204,9 @@ class TestRouteNotificationEvent:
             lambda session: mock_notification_preference_service,
         )
 
-        mock_send_message = AsyncMock()
+        mock_send_messages = AsyncMock()
         mock_dispatch_notification = AsyncMock()
-        monkeypatch.setattr(notification_manager_module, "send_message", mock_send_message)
+        monkeypatch.setattr(notification_manager_module, "send_messages", mock_send_messages)
         monkeypatch.setattr(notification_manager_module, "_dispatch_notification", mock_dispatch_notification)
 
         event = NotificationEvent(
@@ -220,7 +220,7 @@ class TestRouteNotificationEvent:
 
         await _route_notification_event(event, mock_session)
 
-        mock_send_message.assert_not_awaited()
+        mock_send_messages.assert_not_awaited()
         mock_dispatch_notification.assert_not_awaited()
 
     @pytest.mark.asyncio
@@ -260,9 +260,9 @@ class TestRouteNotificationEvent:
             lambda session: mock_notification_preference_service,
         )
 
-        mock_send_message = AsyncMock()
+        mock_send_messages = AsyncMock()
         mock_dispatch_notification = AsyncMock()
-        monkeypatch.setattr(notification_manager_module, "send_message", mock_send_message)
+        monkeypatch.setattr(notification_manager_module, "send_messages", mock_send_messages)
         monkeypatch.setattr(notification_manager_module, "_dispatch_notification", mock_dispatch_notification)
 
         event = NotificationEvent(
@@ -276,5 +276,5 @@ class TestRouteNotificationEvent:
 
         await _route_notification_event(event, mock_session)
 
-        mock_send_message.assert_not_awaited()
+        mock_send_messages.assert_not_awaited()
         mock_dispatch_notification.assert_not_awaited()
@@ -0,0 +1,63 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy import column, select, table
+from sqlalchemy.dialects import postgresql
+
+from core.errors import AccessDenied
+from core.permissions import functions
+from core.permissions.functions import build_access_filter
+
+resources = table("resources", column("id"), column("project_id"))
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+@pytest.fixture
+def enforcer(monkeypatch):
+    enforcer = Mock()
+    enforcer.get_implicit_roles_for_user = AsyncMock(return_value=["team:platform"])
+    casbin_enforcer = Mock()
+    casbin_enforcer.get_enforcer = AsyncMock(return_value=enforcer)
+    monkeypatch.setattr(functions, "CasbinEnforcer", Mock(return_value=casbin_enforcer))
+    return enforcer
+
+
+def _user(**kwargs):
+    return Mock(id="u1", primary_account=[], deactivated=False, **kwargs)
+
+
+class TestBuildAccessFilter:
+    @pytest.mark.asyncio
+    async def test_filters_by_subjects_actions_and_objects(self, enforcer):
+        access_filter = await build_access_filter(_user(), "resource", resources.c.id, resources.c.project_id)
+
+        sql = _compile(select(resources.c.id).where(access_filter))
+
+        assert "EXISTS" in sql
+        assert "'user:u1', 'team:platform'" in sql
+        assert "'read', 'write', 'admin'" in sql
+        assert "'resource:' || CAST(resources.id AS VARCHAR)" in sql
+        assert "'project:' || CAST(resources.project_id AS VARCHAR)" in sql
+        assert "split_part(casbin_rules.v1, '*', 1)" in sql
+        enforcer.get_implicit_roles_for_user.assert_awaited_once_with("user:u1")
+
+    @pytest.mark.asyncio
+    async def test_uses_primary_account(self, enforcer):
+        user = Mock(id="u1", primary_account=[Mock(id="p1", deactivated=False)], deactivated=False)
+
+        access_filter = await build_access_filter(user, "resource", resources.c.id, action="admin")
+
+        sql = _compile(select(resources.c.id).where(access_filter))
+        assert "'user:p1'" in sql
+        assert "casbin_rules.v2 IN ('admin')" in sql
+        assert "project:" not in sql
+
+    @pytest.mark.asyncio
+    async def test_deactivated_user(self, enforcer):
+        user = Mock(id="u1", primary_account=[], deactivated=True)
+
+        with pytest.raises(AccessDenied):
+            _ = await build_access_filter(user, "resource", resources.c.id)
@@ -0,0 +1,132 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from aio_pika import ExchangeType
+from pamqp.commands import Basic
+
+import core.rabbitmq as rabbitmq_module
+from core.base_models import MessageModel
+from core.rabbitmq import RabbitMQConnection
+
+
+@pytest.fixture
+def mock_exchange():
+    exchange = Mock()
+    exchange.name = "ik_raw_messages"
+    exchange.publish = AsyncMock(return_value=Basic.Ack())
+    return exchange
+
+
+@pytest.fixture
+def mock_connection(mock_exchange, monkeypatch):
+    channel = Mock()
+    channel.is_closed = False
+    channel.declare_exchange = AsyncMock(return_value=mock_exchange)
+
+    connection = Mock()
+    connection.channel = AsyncMock(return_value=channel)
+
+    rabbitmq = RabbitMQConnection()
+    monkeypatch.setattr(rabbitmq, "connection", connection)
+    monkeypatch.setattr(rabbitmq, "publisher_channels", {})
+    monkeypatch.setattr(rabbitmq, "_exchanges", {})
+    monkeypatch.setattr(rabbitmq, "_next_publisher_channel", 0)
+    return connection
+
+
+def make_message(routing_key: str) -> MessageModel:
+    return MessageModel(
+        body={"data": routing_key},
+        message_type="log",
+        exchange="ik_raw_messages",
+        routing_key=routing_key,
+        exchange_type=ExchangeType.TOPIC,
+    )
+
+
+class TestPublishMany:
+    @pytest.mark.asyncio
+    async def test_publishes_all_messages_in_order(self, mock_connection, mock_exchange):
+        await RabbitMQConnection.publish_many([make_message(f"logs.resource.{i}") for i in range(3)])
+
+        routing_keys = [call.kwargs["routing_key"] for call in mock_exchange.publish.await_args_list]
+        assert routing_keys == ["logs.resource.0", "logs.resource.1", "logs.resource.2"]
+
+    @pytest.mark.asyncio
+    async def test_exchange_is_declared_once_per_channel(self, mock_connection, monkeypatch):
+        monkeypatch.setattr(rabbitmq_module, "PUBLISHER_CHANNELS", 1)
+
+        await RabbitMQConnection.publish_many([make_message("a"), make_message("b")])
+        await RabbitMQConnection.send_message(make_message("c"))
+
+        channel = mock_connection.channel.return_value
+        channel.declare_exchange.assert_awaited_once()
+        mock_connection.channel.assert_awaited_with(publisher_confirms=True)
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_does_not_connect(self, mock_connection):
+        await RabbitMQConnection.publish_many([])
+
+        mock_connection.channel.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_exchange_is_required(self, mock_connection):
+        message = make_message("a")
+        message.exchange = ""
+
+        with pytest.raises(ValueError):
+            await RabbitMQConnection.publish_many([message])
+
+    @pytest.mark.asyncio
+    async def test_confirm_is_decided_per_message(self, mock_connection, monkeypatch):
+        publish = AsyncMock()
+        monkeypatch.setattr(RabbitMQConnection, "publish_and_handle_confirm", publish)
+
+        await RabbitMQConnection.publish_many(
+            [make_message("a"), make_message("b")], confirm=lambda message: message.routing_key == "b"
+        )
+
+        assert [call.kwargs["confirm"] for call in publish.await_args_list] == [False, True]
+
+
+class TestPublisherChannels:
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_open_one_channel_per_slot(self, mock_connection):
+        async def open_channel(**kwargs):
+            await asyncio.sleep(0)
+            channel = Mock()
+            channel.is_closed = False
+            return channel
+
+        mock_connection.channel = AsyncMock(side_effect=open_channel)
+        rabbitmq = RabbitMQConnection()
+
+        channels = await asyncio.gather(
+            *(rabbitmq.get_publisher_channel() for _ in range(rabbitmq_module.PUBLISHER_CHANNELS * 3))
+        )
+
+        assert mock_connection.channel.await_count == rabbitmq_module.PUBLISHER_CHANNELS
+        assert len(rabbitmq.publisher_channels) == rabbitmq_module.PUBLISHER_CHANNELS
+        assert channels[: rabbitmq_module.PUBLISHER_CHANNELS] == [
+            rabbitmq.publisher_channels[index] for index in range(rabbitmq_module.PUBLISHER_CHANNELS)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_replaced_channel_keeps_declaring_exchanges(self, mock_connection, monkeypatch):
+        monkeypatch.setattr(rabbitmq_module, "PUBLISHER_CHANNELS", 1)
+        rabbitmq = RabbitMQConnection()
+        closed_channel = mock_connection.channel.return_value
+        assert await rabbitmq.get_publisher_channel() is closed_channel
+        closed_channel.is_closed = True
+
+        replacement = Mock()
+        replacement.is_closed = False
+        replacement.declare_exchange = AsyncMock()
+        mock_connection.channel.return_value = replacement
+
+        assert await rabbitmq.get_publisher_channel() is replacement
+        _ = await rabbitmq.get_exchange(closed_channel, "ik_raw_messages", ExchangeType.TOPIC)
+        _ = await rabbitmq.get_exchange(replacement, "ik_raw_messages", ExchangeType.TOPIC)
+
+        replacement.declare_exchange.assert_awaited_once()
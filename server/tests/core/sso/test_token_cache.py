@@ -0,0 +1,135 @@
+import json
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+from jwt.algorithms import ECAlgorithm
+
+from core.errors import AccessUnauthorized
+from core.sso.functions import get_user_from_personal_access_token
+from core.sso.token_cache import (
+    JwksCache,
+    PersonalAccessTokenCache,
+    invalidate_personal_access_token,
+    personal_access_token_cache,
+)
+from core.users.model import UserDTO
+from core.users.schema import UserShort
+
+
+def make_jwk(kid: str) -> dict[str, Any]:
+    jwk = json.loads(ECAlgorithm.to_jwk(ec.generate_private_key(ec.SECP256R1()).public_key()))
+    jwk["kid"] = kid
+    return jwk
+
+
+def make_user() -> UserDTO:
+    return UserDTO(id=uuid.uuid4(), identifier="user", provider="ik_service_account")
+
+
+class TestJwksCache:
+    @pytest.mark.asyncio
+    async def test_keys_are_fetched_once(self):
+        fetch = AsyncMock(return_value=[make_jwk("a"), make_jwk("b")])
+        cache = JwksCache(fetch)
+
+        assert await cache.get_key("https://jwks", "a") is not None
+        assert await cache.get_key("https://jwks", "b") is not None
+
+        fetch.assert_awaited_once_with("https://jwks")
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_refresh_is_rate_limited(self, monkeypatch):
+        monkeypatch.setenv("JWKS_MIN_REFRESH_SECONDS", "60")
+        fetch = AsyncMock(return_value=[make_jwk("a")])
+        cache = JwksCache(fetch)
+        _ = await cache.get_key("https://jwks", "a")
+
+        assert await cache.get_key("https://jwks", "unknown") is None
+        assert fetch.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_refreshes_the_keys(self, monkeypatch):
+        monkeypatch.setenv("JWKS_MIN_REFRESH_SECONDS", "0")
+        fetch = AsyncMock(side_effect=[[make_jwk("a")], [make_jwk("a"), make_jwk("rotated")]])
+        cache = JwksCache(fetch)
+        _ = await cache.get_key("https://jwks", "a")
+
+        assert await cache.get_key("https://jwks", "rotated") is not None
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_the_known_keys(self, monkeypatch):
+        monkeypatch.setenv("JWKS_CACHE_TTL", "0")
+        fetch = AsyncMock(side_effect=[[make_jwk("a")], []])
+        cache = JwksCache(fetch)
+        _ = await cache.get_key("https://jwks", "a")
+
+        assert await cache.get_key("https://jwks", "a") is not None
+
+
+class TestPersonalAccessTokenCache:
+    def test_expired_token_is_not_cached(self):
+        cache = PersonalAccessTokenCache()
+        cache.set("ik_token", uuid.uuid4(), make_user(), expires_at=datetime.now(UTC) - timedelta(seconds=1))
+
+        assert cache.get("ik_token") is None
+
+    def test_token_event_drops_the_entry(self):
+        token_id = uuid.uuid4()
+        personal_access_token_cache.set("ik_token", token_id, make_user())
+
+        invalidate_personal_access_token({"id": str(token_id), "_metadata": {"entity": "personal_access_token"}})
+        assert personal_access_token_cache.get("ik_token") is not None
+
+        invalidate_personal_access_token(
+            {"_metadata": {"event": "reload_personal_access_tokens", "token_id": str(token_id)}}
+        )
+        assert personal_access_token_cache.get("ik_token") is None
+
+    def test_user_event_drops_the_user_tokens(self):
+        user = make_user()
+        secondary = make_user()
+        secondary.primary_account = [UserShort(id=user.id, identifier="user", provider="ik_service_account")]
+        personal_access_token_cache.set("ik_user", uuid.uuid4(), user)
+        personal_access_token_cache.set("ik_secondary", uuid.uuid4(), secondary)
+        personal_access_token_cache.set("ik_other", uuid.uuid4(), make_user())
+
+        invalidate_personal_access_token(
+            {"_metadata": {"event": "reload_personal_access_tokens", "user_id": str(user.id)}}
+        )
+
+        assert personal_access_token_cache.get("ik_user") is None
+        assert personal_access_token_cache.get("ik_secondary") is None
+        assert personal_access_token_cache.get("ik_other") is not None
+
+    @pytest.mark.asyncio
+    async def test_user_lookup_is_cached(self):
+        personal_access_token_cache.clear()
+        user = make_user()
+        service = MagicMock()
+        service.personal_access_token_service.get_valid_token = AsyncMock(
+            return_value=MagicMock(id=uuid.uuid4(), user_id=user.id, expires_at=None)
+        )
+        service.user_service.get_dto_by_id = AsyncMock(return_value=user)
+
+        assert await get_user_from_personal_access_token(service, "ik_token") == user
+        assert await get_user_from_personal_access_token(service, "ik_token") == user
+
+        service.personal_access_token_service.get_valid_token.assert_awaited_once()
+        service.user_service.get_dto_by_id.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_is_not_cached(self):
+        personal_access_token_cache.clear()
+        service = MagicMock()
+        service.personal_access_token_service.get_valid_token = AsyncMock(return_value=None)
+
+        for _ in range(2):
+            with pytest.raises(AccessUnauthorized):
+                _ = await get_user_from_personal_access_token(service, "ik_invalid")
+
+        assert service.personal_access_token_service.get_valid_token.await_count == 2
@@ -0,0 +1,111 @@
+import os
+import subprocess
+
+import pytest
+
+from core.tools import git_mirror_cache
+from core.tools.git_client import GitClient
+from core.tools.git_mirror_cache import GitMirrorCache, normalize_repo_id
+
+
+def _git(*args: str, cwd: str) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def _make_repo(path: str, default_branch: str = "main") -> str:
+    os.makedirs(path)
+    _git("init", "-q", "-b", default_branch, cwd=path)
+    _git("config", "user.email", "test@example.com", cwd=path)
+    _git("config", "user.name", "test", cwd=path)
+    _commit(path, "main.tf", 'variable "name" {}\n')
+    _git("tag", "v1.0.0", cwd=path)
+    return path
+
+
+def _commit(repo: str, name: str, content: str) -> None:
+    with open(os.path.join(repo, name), "w") as f:
+        _ = f.write(content)
+    _git("add", name, cwd=repo)
+    _git("commit", "-q", "-m", f"Add {name}", cwd=repo)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = GitMirrorCache(root=str(tmp_path / "mirrors"), max_bytes=1024**3)
+    monkeypatch.setattr(git_mirror_cache, "_git_mirror_cache", cache)
+    return cache
+
+
+def _client(git_url: str, workspace) -> GitClient:
+    os.makedirs(workspace, exist_ok=True)
+    return GitClient(git_url=git_url, workspace_path=str(workspace), repo_name="repo", environment_variables={})
+
+
+class TestGitMirrorCache:
+    def test_repo_urls_share_a_mirror(self, cache):
+        assert normalize_repo_id("git@github.com:Org/modules.git") == "github.com/Org/modules"
+        assert cache.mirror_path("https://token@github.com/Org/modules.git") == cache.mirror_path(
+            "git@github.com:Org/modules"
+        )
+        assert cache.mirror_path("file:///tmp/a") != cache.mirror_path("file:///tmp/b")
+
+    async def test_clones_are_served_from_the_updated_mirror(self, cache, tmp_path):
+        remote = _make_repo(str(tmp_path / "remote"))
+        hits = git_mirror_cache.git_mirror_counter.labels("hit")
+        misses = git_mirror_cache.git_mirror_counter.labels("miss")
+        hits_before, misses_before = hits._value.get(), misses._value.get()
+
+        first = _client(f"file://{remote}", tmp_path / "task-1")
+        await first.clone_branch("main")
+        _commit(remote, "outputs.tf", 'output "name" {}\n')
+        second = _client(f"file://{remote}", tmp_path / "task-2")
+        await second.clone_branch("origin/main")
+
+        assert (misses._value.get() - misses_before, hits._value.get() - hits_before) == (1, 1)
+        assert os.path.exists(os.path.join(second.destination_dir, "outputs.tf"))
+        assert _git("remote", "get-url", "origin", cwd=second.destination_dir) == f"file://{remote}"
+        assert _git("rev-parse", "HEAD", cwd=second.destination_dir) == _git("rev-parse", "HEAD", cwd=remote)
+
+    async def test_full_clone_has_tags(self, cache, tmp_path):
+        remote = _make_repo(str(tmp_path / "remote"))
+
+        client = _client(f"file://{remote}", tmp_path / "task")
+        await client.clone()
+
+        assert await client.get_repo_tags() == ["v1.0.0"]
+
+    async def test_clone_checks_out_the_remote_default_branch(self, cache, tmp_path):
+        # Neither the "master" nor the "main" a bare `git init` of the mirror may default to
+        remote = _make_repo(str(tmp_path / "remote"), default_branch="trunk")
+
+        client = _client(f"file://{remote}", tmp_path / "task")
+        await client.clone()
+        await client.checkout_to_new_branch("infrakitchen/update", "trunk")
+
+        assert _git("symbolic-ref", "HEAD", cwd=cache.mirror_path(f"file://{remote}")) == "refs/heads/trunk"
+        assert _git("branch", "--show-current", cwd=client.destination_dir) == "infrakitchen/update"
+        assert _git("rev-parse", "HEAD", cwd=client.destination_dir) == _git("rev-parse", "trunk", cwd=remote)
+
+    async def test_falls_back_to_the_remote(self, tmp_path, monkeypatch):
+        remote = _make_repo(str(tmp_path / "remote"))
+        (tmp_path / "not-a-directory").write_text("")
+        broken = GitMirrorCache(root=str(tmp_path / "not-a-directory" / "mirrors"), max_bytes=1024**3)
+        monkeypatch.setattr(git_mirror_cache, "_git_mirror_cache", broken)
+
+        client = _client(f"file://{remote}", tmp_path / "task")
+        await client.clone_branch("v1.0.0")
+
+        assert os.path.exists(os.path.join(client.destination_dir, "main.tf"))
+
+    async def test_least_recently_used_mirrors_are_evicted(self, cache, tmp_path):
+        old_remote = _make_repo(str(tmp_path / "old"))
+        new_remote = _make_repo(str(tmp_path / "new"))
+        await _client(f"file://{old_remote}", tmp_path / "task-1").clone()
+        old_mirror = cache.mirror_path(f"file://{old_remote}")
+        os.utime(old_mirror, (0, 0))
+        cache.max_bytes = git_mirror_cache._directory_size(old_mirror) * 3 // 2
+
+        await _client(f"file://{new_remote}", tmp_path / "task-2").clone()
+
+        assert not os.path.exists(old_mirror)
+        assert os.path.isdir(cache.mirror_path(f"file://{new_remote}"))
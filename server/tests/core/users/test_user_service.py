@@ -245,6 +245,23 @@ class TestUpdate:
 
         assert result.id == updated_user.id
 
+    @pytest.mark.asyncio
+    async def test_update_reloads_personal_access_tokens(
+        self, mock_user_crud, mock_audit_log_handler, mock_event_sender, mocked_user
+    ):
+        service = UserService(
+            crud=mock_user_crud, audit_log_handler=mock_audit_log_handler, event_sender=mock_event_sender
+        )
+        mock_user_crud.get_by_id.return_value = mocked_user
+        requester = Mock(spec=UserDTO)
+        requester.id = uuid4()
+
+        _ = await service.update_user(user_id=USER_ID, user=UserUpdate(deactivated=True), requester=requester)
+
+        mock_event_sender.send_reload_event.assert_awaited_once_with(
+            "reload_personal_access_tokens", {"user_id": str(mocked_user.id)}
+        )
+
     @pytest.mark.asyncio
     async def test_update_user_does_not_exist(self, mock_user_service, mock_user_crud):
         user_update = Mock(spec=UserUpdate)
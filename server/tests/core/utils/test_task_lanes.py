@@ -0,0 +1,56 @@
+import pytest
+
+from core.utils.task_lanes import (
+    TASK_ENTITY_CONTROLLERS,
+    TaskLane,
+    all_task_routing_keys,
+    get_task_lane,
+    get_task_priority,
+    parse_lane_patterns,
+    resolve_task_routing_keys,
+    task_routing_key,
+)
+
+
+class TestTaskLanes:
+    def test_dryrun_goes_to_interactive_lane(self):
+        assert get_task_lane("resource", "dryrun") == TaskLane.INTERACTIVE
+        assert get_task_lane("resource", "dryrun_with_temp_state") == TaskLane.INTERACTIVE
+
+    def test_sync_and_provision_lanes(self):
+        assert get_task_lane("source_code", "sync") == TaskLane.SYNC
+        assert get_task_lane("resource", "destroy") == TaskLane.PROVISION
+
+    def test_workflow_callback_preempts_everything(self):
+        callback_metadata = {"step_id": "123"}
+
+        assert get_task_lane("workflow", "execute", callback_metadata) == TaskLane.INTERACTIVE
+        assert get_task_lane("workflow", "execute") == TaskLane.PROVISION
+        assert get_task_priority("workflow", "execute", callback_metadata) > get_task_priority("resource", "dryrun")
+        assert get_task_priority("resource", "dryrun") > get_task_priority("source_code", "sync")
+
+    def test_routing_keys(self):
+        assert task_routing_key(TaskLane.INTERACTIVE, "resource") == "ik_tasks.interactive.resource"
+        assert task_routing_key(TaskLane.SCHEDULER) == "ik_tasks.scheduler"
+        assert len(all_task_routing_keys()) == 3 * len(TASK_ENTITY_CONTROLLERS) + 1
+
+    def test_resolve_all_lanes_by_default(self):
+        assert resolve_task_routing_keys() == all_task_routing_keys()
+        assert resolve_task_routing_keys([]) == all_task_routing_keys()
+
+    def test_resolve_lane_subset(self):
+        keys = resolve_task_routing_keys(["interactive", "provision.resource", "scheduler"])
+
+        assert "ik_tasks.interactive.workflow" in keys
+        assert "ik_tasks.provision.resource" in keys
+        assert "ik_tasks.provision.storage" not in keys
+        assert "ik_tasks.sync.source_code" not in keys
+        assert "ik_tasks.scheduler" in keys
+
+    def test_resolve_unknown_lane(self):
+        with pytest.raises(ValueError):
+            resolve_task_routing_keys(["bulk"])
+
+    def test_parse_lane_patterns(self):
+        assert parse_lane_patterns("") == []
+        assert parse_lane_patterns(" interactive.*, scheduler ,") == ["interactive.*", "scheduler"]
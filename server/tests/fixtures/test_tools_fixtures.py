@@ -1,5 +1,8 @@
 import pytest
-from unittest.mock import AsyncMock
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+from core.tools.git_mirror_cache import GitMirrorCache
 
 
 @pytest.fixture
@@ -15,3 +18,21 @@ def mock_stream_subprocess(monkeypatch) -> AsyncMock:
     mock.return_value = (100, 0)  # Default success: (pid, return_code)
 
     return mock
+
+
+@pytest.fixture
+def mock_git_mirror_cache(monkeypatch, tmp_path) -> MagicMock:
+    """
+    Replaces the worker's git mirror cache, GitClient clones from the mirror path it yields.
+    The mirror itself is not fetched, `mirror` records the URLs clones asked for.
+    """
+    mirror_cache = MagicMock(spec=GitMirrorCache)
+
+    @asynccontextmanager
+    async def mirror(git_url, run_git):
+        yield str(tmp_path / "mirror.git")
+
+    mirror_cache.mirror = MagicMock(side_effect=mirror)
+    monkeypatch.setattr("core.tools.git_client.get_git_mirror_cache", lambda: mirror_cache)
+
+    return mirror_cache
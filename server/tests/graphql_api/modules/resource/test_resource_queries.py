@@ -46,6 +46,20 @@ RESOURCE_DOWNLOAD_QUERY = """
     }
 """
 
+RESOURCES_PAGE_QUERY = """
+    query ResourcesPage {
+        resourcesPage(first: 10) {
+            items {
+                id
+                name
+                template { id name }
+                project { id }
+            }
+            nextCursor
+        }
+    }
+"""
+
 
 def make_context(user):
     request = Mock()
@@ -140,6 +154,30 @@ class TestResourceQueries:
         assert any("Not authenticated" in error.message for error in result.errors)
         mock_resource_service.get_tree.assert_not_awaited()
 
+    @pytest.mark.asyncio
+    @patch("graphql_api.modules.resource.queries.check_api_permission", new_callable=AsyncMock)
+    @patch("graphql_api.modules.resource.queries.get_resource_service")
+    async def test_resources_page_loads_relationships_in_batches(
+        self,
+        mock_get_service,
+        mock_check_api_permission,
+        mock_resource_service,
+        mocked_user,
+    ):
+        mock_resource_service.query_page = AsyncMock(return_value=([], None))
+        mock_get_service.return_value = mock_resource_service
+
+        result = await schema.execute(RESOURCES_PAGE_QUERY, context_value=make_context(mocked_user))
+
+        assert result.errors is None
+        assert result.data == {"resourcesPage": {"items": [], "nextCursor": None}}
+        assert mock_resource_service.query_page.call_args.kwargs["fields"] == {
+            "id": None,
+            "name": None,
+            "template_id": None,
+            "project_id": None,
+        }
+
     @pytest.mark.asyncio
     @patch("graphql_api.modules.resource.queries.get_resource_service")
     async def test_resource_metadata_returns_json(
@@ -0,0 +1,84 @@
+import pytest
+import strawberry
+from graphql import parse
+
+from graphql_api.extensions import PersistedQueryExtension
+import graphql_api.persisted_queries as persisted_queries
+from graphql_api.persisted_queries import PersistedQueryStore, query_hash
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def hello(self, name: str = "world") -> str:
+        return f"hello {name}"
+
+
+schema = strawberry.Schema(query=Query, extensions=[PersistedQueryExtension])
+
+QUERY = "query Hello($name: String!) { hello(name: $name) }"
+
+
+def persisted_query(query: str) -> dict[str, dict[str, object]]:
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash(query)}}
+
+
+@pytest.fixture
+def store(monkeypatch) -> PersistedQueryStore:
+    store = PersistedQueryStore(max_entries=10)
+    monkeypatch.setattr(persisted_queries, "_store", store)
+    return store
+
+
+async def test_unknown_hash_is_not_found(store) -> None:
+    result = await schema.execute(None, operation_extensions=persisted_query(QUERY))
+
+    assert result.errors is not None
+    assert result.errors[0].message == "PersistedQueryNotFound"
+
+
+async def test_query_is_served_by_hash_once_registered(store) -> None:
+    first = await schema.execute(QUERY, {"name": "a"}, operation_extensions=persisted_query(QUERY))
+    second = await schema.execute(None, {"name": "b"}, operation_extensions=persisted_query(QUERY))
+
+    assert first.errors is None and first.data == {"hello": "hello a"}
+    assert second.errors is None and second.data == {"hello": "hello b"}
+    assert len(store) == 1
+
+
+async def test_hash_must_match_query(store) -> None:
+    result = await schema.execute(QUERY, {"name": "a"}, operation_extensions=persisted_query("{ hello }"))
+
+    assert result.errors is not None
+    assert result.errors[0].message == "provided sha does not match query"
+    assert len(store) == 0
+
+
+async def test_invalid_documents_are_not_stored(store) -> None:
+    result = await schema.execute("{ missing }")
+
+    assert result.errors is not None
+    assert len(store) == 0
+
+
+async def test_plain_queries_reuse_the_validated_document(store) -> None:
+    _ = await schema.execute(QUERY, {"name": "a"})
+    document = store.get(query_hash(QUERY))
+
+    result = await schema.execute(QUERY, {"name": "b"})
+
+    assert result.data == {"hello": "hello b"}
+    assert store.get(query_hash(QUERY)) is document
+
+
+def test_store_evicts_least_recently_used() -> None:
+    store = PersistedQueryStore(max_entries=2)
+    store.set("a", parse("{ a }"))
+    store.set("b", parse("{ b }"))
+    assert store.get("a") is not None
+
+    store.set("c", parse("{ c }"))
+
+    assert store.get("b") is None
+    assert store.get("a") is not None
+    assert len(store) == 2
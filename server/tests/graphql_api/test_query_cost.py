@@ -0,0 +1,99 @@
+from typing import Any
+
+import strawberry
+from graphql import get_operation_ast, parse
+
+from graphql_api.pagination import Page
+from graphql_api.query_cost import DEFAULT_LIST_SIZE, DEFAULT_ROOT_LIST_SIZE, operation_cost
+
+
+@strawberry.type
+class Node:
+    id: int
+    name: str
+
+    @strawberry.field
+    def children(self) -> list["Node"]:
+        return []
+
+    @strawberry.field
+    def parent(self) -> "Node | None":
+        return None
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def nodes(self, range: list[int] | None = None, first: int | None = None) -> list[Node]:
+        return []
+
+    @strawberry.field
+    def nodes_page(self, first: int = 100) -> Page[Node]:
+        return Page[Node](items=[])
+
+    @strawberry.field
+    def node(self) -> Node | None:
+        return None
+
+    @strawberry.field
+    def resource_tree(self) -> Node | None:
+        return None
+
+
+schema = strawberry.Schema(query=Query)
+
+
+def _cost(query: str, variables: dict[str, Any] | None = None) -> int:
+    document = parse(query)
+    operation = get_operation_ast(document)
+    assert operation is not None
+    return operation_cost(schema._schema, document, operation, variables)
+
+
+class TestOperationCost:
+    def test_scalars_are_free(self):
+        assert _cost("{ node { id name } }") == 1
+
+    def test_root_list_uses_default_size(self):
+        assert _cost("{ nodes { id } }") == DEFAULT_ROOT_LIST_SIZE
+
+    def test_list_size_from_arguments(self):
+        assert _cost("{ nodes(range: [0, 10]) { id } }") == 10
+        assert _cost("{ nodes(first: 5) { id } }") == 5
+        assert _cost("query ($range: [Int!]) { nodes(range: $range) { id } }", {"range": [20, 45]}) == 25
+
+    def test_nested_lists_multiply(self):
+        cost = _cost("{ nodes(first: 10) { children { children { id } } } }")
+
+        assert cost == 10 * (1 + DEFAULT_LIST_SIZE * (1 + DEFAULT_LIST_SIZE))
+
+    def test_fragments_and_weights(self):
+        query = """
+        query { node { ...Parent } resourceTree { id } }
+        fragment Parent on Node { parent { ... on Node { id } } }
+        """
+
+        assert _cost(query) == 1 + 1 + 100
+
+    def test_page_items_use_the_page_size(self):
+        assert _cost("{ nodesPage(first: 50) { items { id } nextCursor } }") == 1 + 50
+        assert _cost("{ nodesPage { items { children { id } } } }") == 1 + 100 * (1 + DEFAULT_LIST_SIZE)
+
+    def test_fragment_spread_in_page(self):
+        query = """
+        query { nodesPage(first: 20) { ...Items } }
+        fragment Items on NodePage { items { id } }
+        """
+
+        assert _cost(query) == 1 + 20
+
+    def test_repeated_fragment_is_costed_each_time(self):
+        query = """
+        query { a: node { ...Children } b: node { ...Children } }
+        fragment Children on Node { children { id } }
+        """
+
+        assert _cost(query) == 2 * (1 + DEFAULT_LIST_SIZE)
+
+    def test_introspection_is_free(self):
+        assert _cost("{ __schema { types { name } } }") == 0
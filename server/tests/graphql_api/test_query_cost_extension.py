@@ -0,0 +1,37 @@
+import strawberry
+
+from graphql_api.extensions import QueryCostExtension
+
+
+@strawberry.type
+class Item:
+    id: int
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def items(self, first: int = 10) -> list[Item]:
+        return [Item(id=i) for i in range(first)]
+
+
+schema = strawberry.Schema(query=Query, extensions=[QueryCostExtension])
+
+
+async def test_operation_within_budget(monkeypatch) -> None:
+    monkeypatch.setenv("GRAPHQL_MAX_QUERY_COST", "100")
+
+    result = await schema.execute("{ items(first: 3) { id } }")
+
+    assert result.errors is None
+    assert result.data == {"items": [{"id": 0}, {"id": 1}, {"id": 2}]}
+
+
+async def test_operation_over_budget_is_rejected(monkeypatch) -> None:
+    monkeypatch.setenv("GRAPHQL_MAX_QUERY_COST", "100")
+
+    result = await schema.execute("{ items(first: 500) { id } }")
+
+    assert result.data is None
+    assert result.errors is not None
+    assert result.errors[0].message == "Query cost 500 exceeds the maximum of 100"
@@ -0,0 +1,171 @@
+from typing import cast
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, String, Table, create_engine, event, inspect
+from sqlalchemy.orm import Session, declarative_base, relationship
+from strawberry.types import Info
+
+from core.database import FieldSpec, build_load_only
+from graphql_api.dataloaders.relationship_loaders import batched_field_spec, get_relationship_loader, load_relationship
+
+Base = declarative_base()
+
+mock_entity_tags = Table(
+    "mock_entity_tags",
+    Base.metadata,
+    Column("entity_id", ForeignKey("mock_entity.id"), primary_key=True),
+    Column("tag_id", ForeignKey("mock_tag.id"), primary_key=True),
+)
+
+
+class MockTemplate(Base):
+    __tablename__ = "mock_template"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    entities = relationship("MockEntity", back_populates="template", order_by="MockEntity.id")
+
+
+class MockTag(Base):
+    __tablename__ = "mock_tag"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+class MockEntity(Base):
+    __tablename__ = "mock_entity"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    description = Column(String)
+    template_id = Column(Integer, ForeignKey("mock_template.id"))
+    template = relationship(MockTemplate, back_populates="entities")
+    tags = relationship(MockTag, secondary=mock_entity_tags, order_by=MockTag.id)
+
+
+class _AsyncSession:
+    """Runs the loaders' queries on a synchronous session, counting them."""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.statements: list[str] = []
+        event.listen(session.get_bind(), "before_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    async def execute(self, statement):
+        return self.session.execute(statement)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        tags = [MockTag(id=1, name="a"), MockTag(id=2, name="b")]
+        session.add_all([MockTemplate(id=1, name="t1"), MockTemplate(id=2, name="t2"), MockTemplate(id=3, name="t3")])
+        session.add_all(
+            [
+                MockEntity(id=1, name="e1", template_id=1, tags=tags),
+                MockEntity(id=2, name="e2", template_id=2, tags=tags[1:]),
+                MockEntity(id=3, name="e3", template_id=1),
+                MockEntity(id=4, name="e4", template_id=None),
+            ]
+        )
+        session.commit()
+        session.expunge_all()
+        yield session
+
+
+def _info(session: _AsyncSession, selected_fields=()) -> Info:
+    info = Mock(spec=Info)
+    info.context = {"session": session, "loaders": {}}
+    info.selected_fields = list(selected_fields)
+    return cast(Info, info)
+
+
+def _parents(session: Session) -> list[MockEntity]:
+    entities = session.query(MockEntity).options(*build_load_only(MockEntity, {"name", "template"})).all()
+    session.expunge_all()
+    return entities
+
+
+class TestRelationshipLoader:
+    async def test_many_to_one_is_loaded_in_one_query(self, session):
+        async_session = _AsyncSession(session)
+        info = _info(async_session)
+        loader = get_relationship_loader(info, MockEntity.template)
+
+        templates = await loader.load_many(["1", "2", "1", "9"])
+
+        assert [template.name if template else None for template in templates] == ["t1", "t2", "t1", None]
+        assert len(async_session.statements) == 1
+
+    async def test_one_to_many_groups_by_parent(self, session):
+        async_session = _AsyncSession(session)
+        loader = get_relationship_loader(_info(async_session), MockTemplate.entities)
+
+        entities = await loader.load_many(["1", "2", "3"])
+
+        assert [[entity.name for entity in group] for group in entities] == [["e1", "e3"], ["e2"], []]
+        assert len(async_session.statements) == 1
+
+    async def test_association_table(self, session):
+        async_session = _AsyncSession(session)
+        loader = get_relationship_loader(_info(async_session), MockEntity.tags)
+
+        tags = await loader.load_many(["1", "2", "3"])
+
+        assert [[tag.name for tag in group] for group in tags] == [["a", "b"], ["b"], []]
+        assert len(async_session.statements) == 1
+
+    async def test_loaders_are_shared_by_relationship_and_fields(self, session):
+        info = _info(_AsyncSession(session))
+
+        loader = get_relationship_loader(info, MockEntity.template, {"name": None})
+
+        assert get_relationship_loader(info, MockEntity.template, {"name": None}) is loader
+        assert get_relationship_loader(info, MockEntity.template, {"id": None}) is not loader
+        assert get_relationship_loader(info, MockEntity.tags, {"name": None}) is not loader
+
+    async def test_load_relationship_batches_parents(self, session):
+        parents = _parents(session)
+        async_session = _AsyncSession(session)
+        info = _info(async_session)
+
+        templates = [await load_relationship(info, parent, MockEntity.template) for parent in parents[:1]]
+        templates += [await load_relationship(info, parent, MockEntity.template) for parent in parents[1:]]
+
+        assert [template.name if template else None for template in templates] == ["t1", "t2", "t1", None]
+        # The template of the first parent is cached by the loader, the null key is not looked up
+        assert len(async_session.statements) == 2
+
+    async def test_load_relationship_returns_loaded_value(self, session):
+        parent = session.get(MockEntity, 1)
+        assert parent.template.name == "t1"
+        async_session = _AsyncSession(session)
+
+        template = await load_relationship(_info(async_session), parent, MockEntity.template)
+
+        assert template.name == "t1"
+        assert async_session.statements == []
+
+
+class TestFieldSpec:
+    def test_build_load_only_loads_relationship_keys(self, session):
+        parent = _parents(session)[0]
+
+        assert "description" in inspect(parent).unloaded
+        assert "template_id" not in inspect(parent).unloaded
+
+    def test_batched_field_spec_replaces_relationships_by_keys(self):
+        fields: FieldSpec = {"name": None, "template": {"name": None}, "tags": {"name": None}}
+
+        assert batched_field_spec(fields, MockEntity.template) == {
+            "name": None,
+            "template_id": None,
+            "tags": {"name": None},
+        }
+        assert batched_field_spec(fields, MockEntity.tags) == {"name": None, "template": {"name": None}, "id": None}
+        assert batched_field_spec({"name": None}, MockEntity.template) == {"name": None}
+        assert batched_field_spec(None, MockEntity.template) is None
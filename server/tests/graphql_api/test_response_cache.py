@@ -0,0 +1,81 @@
+import pytest
+import strawberry
+
+import core.caches.response_cache as response_cache
+from core.caches.response_cache import ResponseCache
+from graphql_api.extensions import ResponseCacheExtension
+
+calls: list[str] = []
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def labels(self, entity: str | None = None) -> list[str]:
+        calls.append("labels")
+        return [entity or "all"]
+
+    @strawberry.field
+    def templates_count(self) -> int:
+        calls.append("templates_count")
+        return len(calls)
+
+    @strawberry.field
+    def resources_count(self) -> int:
+        calls.append("resources_count")
+        return len(calls)
+
+
+schema = strawberry.Schema(query=Query, extensions=[ResponseCacheExtension])
+CONTEXT = {"user": None}
+
+
+@pytest.fixture
+def cache(monkeypatch) -> ResponseCache:
+    calls.clear()
+    cache = ResponseCache(max_entries=10)
+    monkeypatch.setattr(response_cache, "_response_cache", cache)
+    return cache
+
+
+async def test_cacheable_query_is_executed_once(cache) -> None:
+    first = await schema.execute("{ templatesCount }", context_value=CONTEXT)
+    second = await schema.execute("{ templatesCount }", context_value=CONTEXT)
+
+    assert first.data == second.data == {"templatesCount": 1}
+    assert calls == ["templates_count"]
+
+
+async def test_variables_are_part_of_the_key(cache) -> None:
+    query = "query Labels($entity: String) { labels(entity: $entity) }"
+    first = await schema.execute(query, {"entity": "resource"}, context_value=CONTEXT)
+    second = await schema.execute(query, {"entity": "template"}, context_value=CONTEXT)
+
+    assert first.data == {"labels": ["resource"]}
+    assert second.data == {"labels": ["template"]}
+    assert len(cache) == 2
+
+
+async def test_query_with_a_field_not_cacheable_is_executed(cache) -> None:
+    _ = await schema.execute("{ templatesCount resourcesCount }", context_value=CONTEXT)
+    _ = await schema.execute("{ templatesCount resourcesCount }", context_value=CONTEXT)
+
+    assert len(calls) == 4
+    assert len(cache) == 0
+
+
+async def test_entity_event_invalidates_the_response(cache) -> None:
+    _ = await schema.execute("{ templatesCount }", context_value=CONTEXT)
+    response_cache.invalidate_response_cache({"_metadata": {"event": "update", "entity": "template"}})
+    result = await schema.execute("{ templatesCount }", context_value=CONTEXT)
+
+    assert result.data == {"templatesCount": 2}
+
+
+async def test_disabled_cache(cache, monkeypatch) -> None:
+    monkeypatch.setenv("GRAPHQL_RESPONSE_CACHE_TTL", "0")
+
+    _ = await schema.execute("{ templatesCount }", context_value=CONTEXT)
+    _ = await schema.execute("{ templatesCount }", context_value=CONTEXT)
+
+    assert len(calls) == 2
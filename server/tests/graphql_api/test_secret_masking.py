@@ -0,0 +1,42 @@
+import strawberry
+from strawberry.scalars import JSON
+
+from graphql_api.extensions import SecretMaskingExtension
+from graphql_api.helpers import ENCRYPTED_SECRET_PREFIX, MASKED_SECRET
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def configuration(self) -> JSON:
+        return JSON(
+            {
+                "token": f"{ENCRYPTED_SECRET_PREFIX}abc",
+                "region": "us-east-1",
+                "keys": [f"{ENCRYPTED_SECRET_PREFIX}x"],
+            }
+        )
+
+    @strawberry.field
+    def value(self) -> str:
+        return f"{ENCRYPTED_SECRET_PREFIX}abc"
+
+
+schema = strawberry.Schema(query=Query, extensions=[SecretMaskingExtension])
+
+
+async def test_secrets_are_masked_in_result() -> None:
+    result = await schema.execute("{ configuration value }")
+
+    assert result.errors is None
+    assert result.data == {
+        "configuration": {"token": MASKED_SECRET, "region": "us-east-1", "keys": [MASKED_SECRET]},
+        "value": MASKED_SECRET,
+    }
+
+
+async def test_errors_are_kept() -> None:
+    result = await schema.execute("{ missing }")
+
+    assert result.errors
+    assert result.data is None
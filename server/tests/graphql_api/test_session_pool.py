@@ -0,0 +1,96 @@
+import asyncio
+from typing import cast
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from graphql_api.session_pool import PooledSession, ReadSessionPool
+
+
+class FakeSession:
+    active = 0
+    max_active = 0
+    created: list["FakeSession"] = []
+
+    def __init__(self):
+        self.closed = False
+        self.rollback = AsyncMock()
+        FakeSession.created.append(self)
+
+    async def execute(self, statement):
+        FakeSession.active += 1
+        FakeSession.max_active = max(FakeSession.max_active, FakeSession.active)
+        await asyncio.sleep(0.01)
+        FakeSession.active -= 1
+        if statement == "fail":
+            raise RuntimeError("boom")
+        return statement
+
+    async def close(self):
+        self.closed = True
+
+
+def fake_session_factory() -> AsyncSession:
+    return cast(AsyncSession, cast(object, FakeSession()))
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    FakeSession.active = 0
+    FakeSession.max_active = 0
+    FakeSession.created = []
+
+
+class TestReadSessionPool:
+    @pytest.mark.asyncio
+    async def test_reads_run_in_parallel_up_to_the_limit(self):
+        pool = ReadSessionPool(3, session_factory=fake_session_factory)
+        session = PooledSession(pool, Mock())
+
+        results = await asyncio.gather(*(session.execute(i) for i in range(10)))
+
+        assert results == list(range(10))
+        assert FakeSession.max_active == 3
+        assert len(pool) == 3
+
+    @pytest.mark.asyncio
+    async def test_sessions_are_reused(self):
+        pool = ReadSessionPool(3, session_factory=fake_session_factory)
+        session = PooledSession(pool, Mock())
+
+        for i in range(5):
+            assert await session.execute(i) == i
+
+        assert len(pool) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_read_rolls_back(self):
+        pool = ReadSessionPool(1, session_factory=fake_session_factory)
+        session = PooledSession(pool, Mock())
+
+        with pytest.raises(RuntimeError):
+            _ = await session.execute("fail")
+
+        borrowed = FakeSession.created[0]
+        borrowed.rollback.assert_awaited_once()
+        assert await session.execute("ok") == "ok"
+
+    @pytest.mark.asyncio
+    async def test_close(self):
+        pool = ReadSessionPool(2, session_factory=fake_session_factory)
+        _ = await asyncio.gather(PooledSession(pool, Mock()).execute(1), PooledSession(pool, Mock()).execute(2))
+        sessions = list(FakeSession.created)
+
+        await pool.close()
+
+        assert all(session.closed for session in sessions)
+        assert len(pool) == 0
+
+    def test_writes_use_request_session(self):
+        request_session = Mock()
+        session = PooledSession(ReadSessionPool(2, session_factory=fake_session_factory), request_session)
+
+        session.add("entity")
+
+        request_session.add.assert_called_once_with("entity")